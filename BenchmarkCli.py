@@ -0,0 +1,643 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from datetime import datetime
+from BenchmarkRunner import BenchmarkRunner
+from History import BenchmarkHistory, DEFAULT_PATH, sparkline
+from Measurement import Harness
+from Report import build_report
+from Workloads import available_workloads, skipped_workloads
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_ERROR = 2
+
+
+def iter_scores(report):
+    for name, runs in report.get('workloads', {}).items():
+        for kind in ('single', 'multi'):
+            if kind in runs:
+                yield f"{name}.{kind}", runs[kind]['score']
+    for kind, score in report.get('composite', {}).items():
+        yield f"composite.{kind}", score
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    baseline_scores = dict(iter_scores(baseline))
+    current_scores = dict(iter_scores(report))
+    comparisons = []
+    for key, score in current_scores.items():
+        reference = baseline_scores.get(key)
+        if not reference:
+            continue
+        change = (score - reference) / reference
+        comparisons.append({
+            'metric': key,
+            'baseline': reference,
+            'current': score,
+            'change': round(change, 4),
+            'regression': change < -tolerance,
+        })
+    # A workload that stopped running (dependency gone, renamed) must not pass the gate by omission
+    for key, reference in baseline_scores.items():
+        if key not in current_scores:
+            comparisons.append({'metric': key, 'baseline': reference, 'current': None, 'change': None,
+                                'missing': True, 'regression': True})
+    return comparisons
+
+
+def parse_time(value):
+    # Accepts epoch seconds, ISO dates ("2024-05-01", "2024-05-01T12:00") or relative ages ("12h", "7d")
+    if value is None:
+        return None
+    units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    if value[-1:] in units and value[:-1].replace('.', '', 1).isdigit():
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _at_least(minimum):
+    def parse(value):
+        number = int(value)
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}")
+        return number
+    return parse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cpu_monitor", description="Universal CPU Benchmark & Monitor")
+    sub = parser.add_subparsers(dest="command")
+    gui = sub.add_parser("gui", help="Start the Tk monitor (default)")
+    gui.add_argument("--chart-renderer", choices=("blit", "full", "tk"), default="blit",
+                     help="blit: cached matplotlib background, full: redraw every tick, tk: native Tk canvas")
+    gui.add_argument("--debug-render", action="store_true", help="Show per-frame chart render time")
+    gui.add_argument("--profile-startup", action="store_true",
+                     help="Print a per-phase import/construct timing breakdown once the window is shown")
+    gui.add_argument("--metrics-port", type=int,
+                     help="Also serve OpenMetrics on this port while the window is open")
+    gui.add_argument("--heatmap-threshold", type=int, default=32,
+                     help="Show the per-CPU heatmap instead of bars above this many logical CPUs")
+    gui.add_argument("--record", metavar="PATH", help="Record every snapshot to this file while the window is open")
+    gui.add_argument("--replay", metavar="PATH", help="Drive the panels from a recording instead of live sampling")
+    gui.add_argument("--speed", type=float, default=1.0, help="Initial replay speed (default 1x)")
+    gui.add_argument("--fleet-port", type=int,
+                     help="Accept fleet agents on this port and show the fleet overview")
+
+    bench = sub.add_parser("bench", help="Run the benchmark suite headlessly and print JSON")
+    bench.add_argument("--workloads", help="Comma-separated workload names (default: all available)")
+    bench.add_argument("--mode", choices=BenchmarkRunner.MODES, default="process")
+    bench.add_argument("--workers", type=_at_least(1), default=os.cpu_count() or 1, help="Multi-core worker count")
+    bench.add_argument("--repetitions", type=_at_least(1), default=5)
+    bench.add_argument("--warmup", type=_at_least(0), default=1)
+    bench.add_argument("--target-time", type=float, default=0.25, help="Seconds per repetition")
+    bench.add_argument("--baseline", help="Baseline JSON report to compare against")
+    bench.add_argument("--tolerance", type=float, default=0.10,
+                       help="Allowed fractional score drop before failing (default 0.10)")
+    bench.add_argument("--output", help="Also write the JSON report to this file")
+    bench.add_argument("--list", action="store_true", help="List available workloads and exit")
+    bench.add_argument("--per-core", action="store_true",
+                       help="Pin a worker to each physical core in turn and report per-core, SMT and socket scores")
+    bench.add_argument("--scaling", action="store_true",
+                       help="Run each workload at 1, 2, 4 ... N process workers and fit Amdahl/USL models")
+    bench.add_argument("--degraded-threshold", type=float, default=0.10,
+                       help="Flag cores this far below the median of their peers (default 0.10)")
+    bench.add_argument("--disk", nargs="*", metavar="PATH",
+                       help="Benchmark storage instead of the CPU: the volumes holding PATHs, or every mounted volume "
+                            "except boot/EFI and volumes under 4 GiB")
+    bench.add_argument("--disk-size", type=_at_least(1), default=256, help="Disk test file size in MiB (default 256)")
+    bench.add_argument("--disk-duration", type=float, default=2.0,
+                       help="Seconds per random I/O queue depth (default 2)")
+    bench.add_argument("--queue-depths", default="1,4,16,32", help="Comma-separated 4K random I/O queue depths")
+    bench.add_argument("--direct", action="store_true",
+                       help="Bypass the page cache with O_DIRECT where supported. Without it, random writes land "
+                            "in the page cache and write IOPS mostly measure memory")
+    bench.add_argument("--memory", action="store_true",
+                       help="Run STREAM bandwidth and pointer-chase latency tests against the installed modules")
+    bench.add_argument("--caches", action="store_true",
+                       help="Sweep working-set sizes and report detected cache levels next to the declared sizes")
+    bench.add_argument("--stress", type=float, metavar="SECONDS",
+                       help="Keep all workers loaded with one workload (--workloads, default hash) for SECONDS "
+                            "and report sustained vs peak throughput")
+    bench.add_argument("--stress-interval", type=float, default=1.0, help="Stress throughput interval in seconds")
+    bench.add_argument("--no-telemetry", action="store_true",
+                       help="Do not trace temperatures and clock speeds while benchmarking")
+    bench.add_argument("--history", default=DEFAULT_PATH, help="SQLite history database")
+    bench.add_argument("--no-history", action="store_true", help="Do not record this run")
+
+    export = sub.add_parser("export", help="Serve live metrics in OpenMetrics format without the GUI")
+    export.add_argument("--host", default="0.0.0.0", help="Address to listen on (default all interfaces)")
+    export.add_argument("--port", type=int, default=9101)
+    export.add_argument("--interval", type=float, default=1.0, help="Sampler interval in seconds")
+    export.add_argument("--db", default=DEFAULT_PATH, help="History database to read the last benchmark scores from")
+    export.add_argument("--load-test", action="store_true",
+                        help="Start the exporter, scrape it from many concurrent clients and print latency stats")
+    export.add_argument("--clients", type=int, default=50, help="Concurrent scrapers for --load-test")
+    export.add_argument("--requests", type=int, default=20, help="Scrapes per client for --load-test")
+
+    collect = sub.add_parser("collect", help="Sample headlessly and publish snapshots to shared memory")
+    collect.add_argument("--name", default="cpu_monitor", help="Shared memory segment name")
+    collect.add_argument("--interval", type=float, default=1.0, help="Sampler interval in seconds")
+    collect.add_argument("--slots", type=int, default=64, help="Snapshots kept in the ring")
+
+    snapshot = sub.add_parser("snapshot", help="Print the latest snapshot published by a running collector")
+    snapshot.add_argument("--name", default="cpu_monitor", help="Shared memory segment name")
+    snapshot.add_argument("--watch", action="store_true", help="Print every new snapshot until interrupted")
+    snapshot.add_argument("--max-age", type=float, default=5.0,
+                          help="Fail when the newest snapshot is older than this many seconds (default: 5, "
+                               "at least five collector intervals)")
+
+    agent = sub.add_parser("agent", help="Stream compact metric frames to a fleet aggregator")
+    agent.add_argument("--server", required=True, help="Aggregator address as HOST or HOST:PORT (default port 9102)")
+    agent.add_argument("--name", default=socket.gethostname(), help="Host name shown in the fleet view")
+    agent.add_argument("--interval", type=float, default=1.0, help="Seconds between frames")
+    agent.add_argument("--deadband", type=int, default=3,
+                       help="Resend a CPU only when it moved this many 1/255 steps (default 3, about 1.2 %%)")
+    agent.add_argument("--simulate", type=int, metavar="N",
+                       help="Run N synthetic agents instead of reporting this host (for load testing)")
+    agent.add_argument("--cpus", type=int, default=16, help="Logical CPUs per synthetic agent")
+    agent.add_argument("--duration", type=float, help="Stop after this many seconds")
+
+    aggregate = sub.add_parser("aggregate", help="Accept fleet agents headlessly and print per-interval stats")
+    aggregate.add_argument("--host", default="0.0.0.0", help="Address to listen on (default all interfaces)")
+    aggregate.add_argument("--port", type=int, default=9102)
+    aggregate.add_argument("--report-interval", type=float, default=5.0, help="Seconds between stat lines")
+    aggregate.add_argument("--duration", type=float, help="Stop after this many seconds")
+
+    record = sub.add_parser("record", help="Append sampler snapshots to a compressed recording file")
+    record.add_argument("path", help="Recording file (appended to if it exists)")
+    record.add_argument("--interval", type=float, default=1.0, help="Sampler interval in seconds")
+    record.add_argument("--chunk-rows", type=int, default=300, help="Snapshots per compressed chunk")
+
+    replay = sub.add_parser("replay", help="Summarise a recording or print the snapshot at a time")
+    replay.add_argument("path", help="Recording file")
+    replay.add_argument("--at", help="Print the snapshot at this time: epoch, ISO date or age such as 1h")
+
+    history = sub.add_parser("history", help="Show or import stored benchmark results")
+    history.add_argument("--db", default=DEFAULT_PATH, help="SQLite history database")
+    history.add_argument("--host", help="Host fingerprint or hostname (default: this host)")
+    history.add_argument("--workload", default="composite")
+    history.add_argument("--kind", choices=("single", "multi"), default="multi")
+    history.add_argument("--since", help="Start time: epoch, ISO date or age such as 7d")
+    history.add_argument("--until", help="End time: epoch, ISO date or age such as 1h")
+    history.add_argument("--limit", type=int, help="Only the most recent N results")
+    history.add_argument("--hosts", action="store_true", help="List known hosts")
+    history.add_argument("--import", dest="import_files", nargs="+", metavar="REPORT",
+                         help="Import JSON reports (one report per file, or one per line)")
+    return parser
+
+
+def run_bench(args, out=sys.stdout):
+    if args.list:
+        for w in available_workloads():
+            print(f"{w.name}\t{w.title}\t{w.unit}", file=out)
+        for name, reason in skipped_workloads().items():
+            print(f"Skipping {name}: {reason}", file=sys.stderr)
+        return EXIT_OK
+
+    if args.disk is not None:
+        return run_disk_bench(args, out)
+
+    if args.memory:
+        return run_memory_bench(args, out)
+
+    if args.caches:
+        from CacheProbe import run_cache_probe
+        progress = lambda step: print(f"Running {step}...", file=sys.stderr)
+        try:
+            caches = run_cache_probe(progress=progress)
+        except (RuntimeError, OSError) as e:
+            print(f"Cache probe failed: {e}", file=sys.stderr)
+            return EXIT_ERROR
+        return _write_report({'caches': caches}, args, out)
+
+    names = [w.name for w in available_workloads()]
+    if args.workloads:
+        requested = [n.strip() for n in args.workloads.split(",") if n.strip()]
+        unknown = [n for n in requested if n not in names]
+        if unknown:
+            print(f"Unknown or unavailable workloads: {', '.join(unknown)}", file=sys.stderr)
+            return EXIT_ERROR
+        names = requested
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Cannot read baseline {args.baseline}: {e}", file=sys.stderr)
+            return EXIT_ERROR
+
+    harness = Harness(warmup=args.warmup, repetitions=args.repetitions, target_time=args.target_time)
+    runner = BenchmarkRunner({}, args.workers, mode=args.mode, workloads=names, harness=harness,
+                             telemetry=not args.no_telemetry)
+
+    if args.scaling:
+        progress = lambda step: print(f"Running {step}...", file=sys.stderr)
+        try:
+            reports = {name: runner.run_scaling(name, max_workers=args.workers, progress=progress)
+                       for name in names}
+        except RuntimeError as e:
+            print(f"Scaling benchmark failed: {e}", file=sys.stderr)
+            return EXIT_ERROR
+        return _write_report({'scaling': reports}, args, out)
+
+    if args.stress is not None:
+        if not args.stress > 0 or not args.stress_interval > 0:
+            print("--stress and --stress-interval must be positive numbers of seconds", file=sys.stderr)
+            return EXIT_ERROR
+        if args.workloads and len(names) > 1:
+            print("--stress runs one workload at a time; pass a single name to --workloads", file=sys.stderr)
+            return EXIT_ERROR
+        workload = names[0] if args.workloads else "hash"
+
+        def on_interval(record):
+            clock = f" @ {record['freq_mhz']:.0f} MHz" if 'freq_mhz' in record else ""
+            print(f"{record['t']:8.1f}s {record['ops_per_sec']:14,.0f} ops/s{clock}", file=sys.stderr)
+
+        try:
+            result = runner.run_stress(workload, duration=args.stress, interval=args.stress_interval,
+                                       workers=args.workers, on_interval=on_interval)
+        except RuntimeError as e:
+            print(f"Stress run failed: {e}", file=sys.stderr)
+            return EXIT_ERROR
+        return _write_report({'stress': result}, args, out)
+
+    if args.per_core:
+        progress = lambda step: print(f"Running {step}...", file=sys.stderr)
+        try:
+            reports = {name: runner.run_per_core(name, degraded_threshold=args.degraded_threshold,
+                                                 progress=progress)
+                       for name in names}
+        except RuntimeError as e:
+            print(f"Per-core benchmark failed: {e}", file=sys.stderr)
+            return EXIT_ERROR
+        degraded = any(r['degraded'] for r in reports.values())
+        return _write_report({'per_core': reports}, args, out, EXIT_REGRESSION if degraded else EXIT_OK)
+    progress = lambda name: print(f"Running {name}...", file=sys.stderr)
+    try:
+        report = build_report(runner.run_suite(progress=progress), runner)
+    except RuntimeError as e:
+        print(f"Benchmark failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if not args.no_history:
+        try:
+            store = BenchmarkHistory(args.history)
+            report['history'] = store.compare_report(report)
+            store.record(report)
+            store.close()
+        except Exception as e:
+            print(f"Could not update history {args.history}: {e}", file=sys.stderr)
+
+    status = EXIT_OK
+    if baseline is not None:
+        comparisons = compare_to_baseline(report, baseline, args.tolerance)
+        regressions = [c for c in comparisons if c['regression']]
+        report['baseline'] = {
+            'file': args.baseline,
+            'tolerance': args.tolerance,
+            'comparisons': comparisons,
+            'missing': [c['metric'] for c in comparisons if c.get('missing')],
+            'passed': not regressions,
+        }
+        if regressions:
+            status = EXIT_REGRESSION
+
+    return _write_report(report, args, out, status)
+
+
+def _write_report(report, args, out, status=EXIT_OK):
+    text = json.dumps(report, indent=2)
+    print(text, file=out)
+    if args.output:
+        try:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        except OSError as e:
+            print(f"Cannot write report to {args.output}: {e}", file=sys.stderr)
+            return EXIT_ERROR
+    return status
+
+
+def run_disk_bench(args, out=sys.stdout):
+    from DiskBenchmark import MIB, benchmark_volumes, mounted_volumes, volume_for_path
+    try:
+        depths = [int(d) for d in args.queue_depths.split(",") if d.strip()]
+    except ValueError:
+        depths = []
+    if not depths or min(depths) < 1 or args.disk_duration <= 0:
+        print(f"Invalid --queue-depths {args.queue_depths!r} or --disk-duration {args.disk_duration}", file=sys.stderr)
+        return EXIT_ERROR
+    volumes = [volume_for_path(p) for p in args.disk] if args.disk else mounted_volumes()
+    progress = lambda step: print(f"Running {step}...", file=sys.stderr)
+    results = benchmark_volumes(volumes, progress=progress, file_size=args.disk_size * MIB,
+                                queue_depths=depths, duration=args.disk_duration, direct=args.direct)
+    status = EXIT_ERROR if any('error' in r for r in results) else EXIT_OK
+    return _write_report({'disk': results}, args, out, status)
+
+
+def run_memory_bench(args, out=sys.stdout):
+    from MemoryBenchmark import run_memory_benchmark
+    from Inventory import shared_inventory
+    inventory = shared_inventory()
+    try:
+        modules = inventory.get_sync("memory_modules", timeout=30) or []
+    except Exception as e:
+        print(f"Could not read memory modules: {e}", file=sys.stderr)
+        modules = []
+    finally:
+        inventory.shutdown()
+    progress = lambda step: print(f"Running {step}...", file=sys.stderr)
+    report = {'memory': run_memory_benchmark(modules, workers=args.workers, repetitions=args.repetitions,
+                                             progress=progress)}
+    return _write_report(report, args, out)
+
+
+def run_export(args, out=sys.stdout):
+    from Sampler import Sampler
+    from SharedSnapshot import attach_collector
+    from MetricsExporter import MetricsExporter, load_test
+    # Reuse a running collector's snapshots rather than sampling the same counters twice
+    sampler = attach_collector() or Sampler(interval=args.interval).start()
+    exporter = MetricsExporter(sampler, host=args.host, port=args.port)
+    if not args.load_test and os.path.exists(args.db):
+        try:
+            from Report import host_info
+            store = BenchmarkHistory(args.db)
+            exporter.load_history(store, host_info()['fingerprint'])
+            store.close()
+        except Exception as e:
+            print(f"Could not read benchmark scores from {args.db}: {e}", file=sys.stderr)
+    try:
+        exporter.start()
+    except OSError as e:
+        sampler.stop()
+        print(f"Cannot listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    print(f"Serving http://{args.host}:{exporter.port}/metrics", file=sys.stderr)
+    try:
+        if args.load_test:
+            # Wait for the first rendered snapshot so the test measures real payloads
+            time.sleep(args.interval * 2)
+            result = load_test(f"http://127.0.0.1:{exporter.port}/metrics", args.clients, args.requests)
+            result['payload_bytes'] = len(exporter.payload)
+            print(json.dumps({'load_test': result}, indent=2), file=out)
+            return EXIT_ERROR if result['errors'] else EXIT_OK
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        exporter.stop()
+        sampler.stop()
+
+
+def run_collect(args, out=sys.stdout):
+    from SharedSnapshot import Collector
+    try:
+        collector = Collector(name=args.name, interval=args.interval, slots=args.slots).start()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return EXIT_ERROR
+    # Service managers stop daemons with SIGTERM; unwind the same way as Ctrl+C so the segment is unlinked
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Publishing snapshots to shared memory {args.name!r} every {args.interval:g}s", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        collector.stop()
+
+
+def _snapshot_json(snapshot):
+    return {
+        'seq': snapshot.seq,
+        'ts': snapshot.ts,
+        'interval': round(snapshot.interval, 3),
+        'total': round(snapshot.total, 1),
+        'per_thread': [round(v, 1) for v in snapshot.per_thread],
+        'per_core': [round(v, 1) for v in snapshot.per_core],
+        'memory': snapshot.memory._asdict(),
+        'swap': snapshot.swap._asdict(),
+        'disks': [{k: round(v, 2) if isinstance(v, float) else v for k, v in rate._asdict().items()}
+                  for rate in snapshot.disks],
+        'pressure': snapshot.pressure._asdict() if snapshot.pressure else None,
+    }
+
+
+def run_snapshot(args, out=sys.stdout):
+    from SharedSnapshot import SnapshotReader
+    try:
+        reader = SnapshotReader(args.name)
+    except (OSError, ValueError) as e:
+        print(f"No collector publishing {args.name!r}: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    # A collector that died leaves its segment behind; its last snapshot must not pass for a current one
+    max_age = max(args.max_age, 5 * reader.interval)
+    try:
+        last = None
+        while True:
+            snapshot = reader.read()
+            age = time.time() - snapshot.ts if snapshot is not None else None
+            if age is not None and age > max_age:
+                print(f"Collector {args.name!r} (pid {reader.writer_pid}) has not published for {age:.0f}s",
+                      file=sys.stderr)
+                return EXIT_ERROR
+            if snapshot is not None and snapshot.seq != last:
+                last = snapshot.seq
+                print(json.dumps(_snapshot_json(snapshot), indent=None if args.watch else 2), file=out, flush=True)
+            if not args.watch:
+                return EXIT_OK if snapshot is not None else EXIT_ERROR
+            time.sleep(reader.interval / 4)
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        reader.close()
+
+
+def run_agent(args, out=sys.stdout):
+    import asyncio
+    from Fleet import DEFAULT_PORT, SamplerSource, SyntheticSource, run_agents
+    host, _, port = args.server.partition(":")
+    port = int(port) if port else DEFAULT_PORT
+    sampler = None
+    if args.simulate:
+        agents = [(f"{args.name}-sim{i:03d}", SyntheticSource(args.cpus, seed=i)) for i in range(args.simulate)]
+    else:
+        from Sampler import Sampler
+        from SharedSnapshot import attach_collector
+        from MetricsExporter import psutil_temperatures
+        sampler = attach_collector() or Sampler(interval=args.interval).start()
+        while sampler.latest is None:
+            time.sleep(0.1)
+        agents = [(args.name, SamplerSource(sampler, psutil_temperatures))]
+    print(f"Streaming {len(agents)} agent(s) to {host}:{port}", file=sys.stderr)
+    try:
+        asyncio.run(run_agents(host, port, agents, interval=args.interval, deadband=args.deadband,
+                               duration=args.duration))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sampler is not None:
+            sampler.stop()
+    return EXIT_OK
+
+
+def run_aggregate(args, out=sys.stdout):
+    from Fleet import FleetAggregator
+    try:
+        aggregator = FleetAggregator(args.host, args.port).start()
+    except OSError as e:
+        print(f"Cannot listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    print(f"Accepting fleet agents on {args.host}:{aggregator.port}", file=sys.stderr)
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(args.report_interval if deadline is None else
+                       max(0.0, min(args.report_interval, deadline - time.monotonic())))
+            hosts = aggregator.snapshot()
+            online = [h for h in hosts if h.connected]
+            rates = sorted(h.bytes_per_second for h in online)
+            print(json.dumps({
+                'ts': round(time.time(), 3),
+                'hosts': len(hosts),
+                'online': len(online),
+                'logical_cpus': sum(h.n_cpus for h in online),
+                'mean_bytes_per_second': round(sum(rates) / len(rates), 1) if rates else 0,
+                'max_bytes_per_second': round(rates[-1], 1) if rates else 0,
+                'total_bytes_per_second': round(sum(rates), 1),
+            }), file=out, flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        aggregator.stop()
+    return EXIT_OK
+
+
+def run_record(args, out=sys.stdout):
+    from Sampler import Sampler
+    from SharedSnapshot import attach_collector
+    from Recording import MetricRecorder
+    sampler = attach_collector() or Sampler(interval=args.interval).start()
+    try:
+        recorder = MetricRecorder(args.path, sampler, chunk_rows=args.chunk_rows).start()
+    except (OSError, ValueError) as e:
+        sampler.stop()
+        print(f"Cannot record to {args.path}: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Recording to {args.path} every {sampler.interval:g}s", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        recorder.stop()
+        sampler.stop()
+        print(f"{recorder.chunks} chunks, {recorder.bytes_written / 1e6:.2f} MB written", file=sys.stderr)
+
+
+def run_replay(args, out=sys.stdout):
+    from Recording import Recording
+    try:
+        recording = Recording(args.path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot open recording {args.path}: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    try:
+        if not recording.index:
+            print(f"{args.path} has no complete chunks yet", file=sys.stderr)
+            return EXIT_ERROR
+        if args.at:
+            snapshot = recording.snapshot_at(parse_time(args.at))
+            print(json.dumps(_snapshot_json(snapshot), indent=2), file=out)
+            return EXIT_OK
+        span = recording.end - recording.start
+        size = os.path.getsize(args.path)
+        print(json.dumps({
+            'host': recording.header['hostname'],
+            'logical_cpus': recording.n_cpus,
+            'interval': recording.interval,
+            'start': datetime.fromtimestamp(recording.start).isoformat(timespec="seconds"),
+            'end': datetime.fromtimestamp(recording.end).isoformat(timespec="seconds"),
+            'snapshots': recording.rows,
+            'chunks': len(recording.index),
+            'bytes': size,
+            'bytes_per_snapshot': round(size / recording.rows, 1),
+            'mb_per_day': round(size / span * 86400 / 1e6, 2) if span else None,
+        }, indent=2), file=out)
+        return EXIT_OK
+    finally:
+        recording.close()
+
+
+def _load_reports(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        yield json.loads(text)
+    except ValueError:
+        for line in text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+
+def run_history(args, out=sys.stdout):
+    store = BenchmarkHistory(args.db)
+    try:
+        if args.import_files:
+            count = 0
+            for path in args.import_files:
+                count += store.import_reports(_load_reports(path))
+            print(f"Imported {count} reports into {args.db}", file=out)
+            return EXIT_OK
+
+        if args.hosts:
+            for host in store.hosts():
+                print(f"{host['fingerprint']}  {host['hostname']}  {host['cpu']}  "
+                      f"{host['physical_cores']}C/{host['logical_cpus']}T", file=out)
+            return EXIT_OK
+
+        if args.host:
+            host_id = store.find_host(args.host)
+        else:
+            from Report import host_info
+            host_id = store.find_host(host_info()['fingerprint'])
+        if host_id is None:
+            print("No history for this host.", file=sys.stderr)
+            return EXIT_ERROR
+
+        rows = store.query(host_id=host_id, workload=args.workload, kind=args.kind,
+                           since=parse_time(args.since), until=parse_time(args.until), limit=args.limit)
+        if not rows:
+            print("No results in the selected range.", file=out)
+            return EXIT_OK
+
+        for row in rows:
+            stamp = datetime.fromtimestamp(row['ts']).strftime("%Y-%m-%d %H:%M:%S")
+            flag = "  unstable" if row['unstable'] else ""
+            print(f"{stamp}  {row['score']:>14.2f}{flag}", file=out)
+
+        latest = rows[-1]
+        comparison = store.compare(host_id, args.workload, args.kind, latest['score'], before=latest['ts'])
+        print(f"\n{args.workload}.{args.kind}  {sparkline([r['score'] for r in rows])}", file=out)
+        if comparison['count']:
+            print(f"latest {latest['score']:.2f} | best {comparison['best']:.2f} ({comparison['vs_best']:+.1%})"
+                  f" | median {comparison['median']:.2f} ({comparison['vs_median']:+.1%})"
+                  f" over {comparison['count']} previous runs", file=out)
+        return EXIT_OK
+    finally:
+        store.close()
@@ -1,42 +1,541 @@
+import sys
 import threading
 import time
-import hashlib
+import os
+import multiprocessing
+import functools
+import queue
+from contextlib import contextmanager
+from Workloads import get_workload, available_workloads, composite_score
+from Measurement import Harness
+from Report import build_report
+from Topology import detect_topology
+from Scaling import worker_steps, analyse
+from Stress import analyse_stress
+
+
+def run_hashes(count):
+    get_workload("hash").execute(count)
+
+
+def pin_to_cpu(cpu):
+    # Best effort: sched_setaffinity on Linux, psutil elsewhere (Windows)
+    if cpu is None:
+        return
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+        else:
+            import psutil
+            psutil.Process().cpu_affinity([cpu])
+    except Exception:
+        pass
+
+
+def available_cpus(logical_threads):
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(logical_threads))
+
+
+def gather(results, procs, timeout=None):
+    # One item per worker. Polls rather than blocking so a worker that dies (MemoryError, OOM kill)
+    # fails the run instead of hanging it; the survivors are terminated
+    deadline = time.monotonic() + timeout if timeout else None
+    collected = []
+    try:
+        while len(collected) < len(procs):
+            try:
+                collected.append(results.get(timeout=0.2))
+                continue
+            except queue.Empty:
+                pass
+            dead = [p for p in procs if p.exitcode not in (None, 0)]
+            if dead:
+                raise RuntimeError(f"Benchmark worker {dead[0].pid} exited with code {dead[0].exitcode}")
+            if deadline is not None and time.monotonic() > deadline:
+                raise RuntimeError(f"Benchmark workers did not respond within {timeout:.0f} s")
+    except BaseException:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        raise
+    return collected
+
+
+def _process_worker(workload_name, cpu, iterations, threads, ready, start_event, results, warmup=0):
+    pin_to_cpu(cpu)
+    workload = get_workload(workload_name)
+    workload.prepare()
+    if warmup:
+        workload.execute(warmup)
+    ready.put(cpu)
+    start_event.wait()
+    start = time.perf_counter_ns()
+    if threads > 1:
+        thread_list = [threading.Thread(target=workload.execute, args=(iterations,), daemon=True)
+                       for _ in range(threads)]
+        for t in thread_list:
+            t.start()
+        for t in thread_list:
+            t.join()
+    else:
+        workload.execute(iterations)
+    results.put((cpu, iterations * threads, time.perf_counter_ns() - start))
+
+
+def _stress_worker(workload_name, cpu, chunk, counters, index, ready, stop_event):
+    # Loops until told to stop; the parent reads the running op count at every interval boundary
+    pin_to_cpu(cpu)
+    workload = get_workload(workload_name)
+    workload.prepare()
+    ready.put(cpu)
+    while not stop_event.is_set():
+        workload.execute(chunk)
+        counters[index] += chunk
+
+
+def _traced(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.tracing():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class BenchmarkRunner:
-    def __init__(self, result_labels, logical_threads):
+    MODES = ("thread", "process", "hybrid")
+    # Seconds of work between counter updates in stress mode: fine enough for 1 s intervals
+    STRESS_CHUNK = 0.02
+    # Spawning, pinning and preparing input data; anything slower than this is treated as stuck
+    READY_TIMEOUT = 120
+
+    def __init__(self, result_labels, logical_threads, mode="process", count=None, threads_per_worker=2,
+                 workloads=None, harness=None, history=None, telemetry=True):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown benchmark mode: {mode}")
         self.result_labels = result_labels
         self.logical_threads = logical_threads
+        self.mode = mode
+        # Overrides every workload's default iteration count when set
+        self.count = count
+        self.threads_per_worker = threads_per_worker
+        self.workloads = workloads or [w.name for w in available_workloads()]
+        self.harness = harness or Harness()
+        self.history = history
+        # Sensors are opened on the first run; telemetry=False skips them entirely
+        self.telemetry = telemetry
+        self.sensors = None
+        self.trace = None
+        self._calibrated = {}
+        self.last_results = {}
+        self.last_report = None
+        self.last_trace = None
+        self.last_error = None
+        self._session = threading.RLock()
+
+    def run_hashes(self, count):
+        run_hashes(count)
+
+    def run_test(self, threads, workload="hash"):
+        result = self.run_parallel(threads, workload=workload)
+        return result['score'], result['duration']
+
+    @staticmethod
+    def uses_processes(workers, mode, cpus=None):
+        return cpus is not None or (mode != "thread" and workers > 1)
+
+    def run_parallel(self, workers, mode=None, workload="hash", iterations=None, cpus=None, warmup=0):
+        # cpus pins worker i to cpus[i]; without it workers are spread over the allowed CPUs.
+        # warmup: untimed iterations each worker process runs before it reports ready
+        mode = mode or self.mode
+        iterations = iterations or self.count or get_workload(workload).iterations
+        if not self.uses_processes(workers, mode, cpus):
+            return self._run_threads(workload, workers, iterations)
+        threads = self.threads_per_worker if mode == "hybrid" else 1
+        return self._run_processes(workload, workers, threads, iterations, cpus, warmup)
+
+    def _run_threads(self, workload_name, threads, iterations):
+        workload = get_workload(workload_name)
+        workload.prepare()
+        per_worker = [None] * threads
+
+        def timed(idx):
+            per_worker[idx] = iterations / (Harness.time_ns(workload.execute, iterations) / 1e9)
 
-    def run_test(self, threads):
-        count = 1000000
         thread_list = []
-        start = time.time()
-        for _ in range(threads):
-            t = threading.Thread(target=self.run_hashes, args=(count,), daemon=True)
+        start = time.perf_counter_ns()
+        for idx in range(threads):
+            t = threading.Thread(target=timed, args=(idx,), daemon=True)
             t.start()
             thread_list.append(t)
         for t in thread_list:
             t.join()
-        duration = time.time() - start
-        score = round((count * threads) / duration, 2)
-        return score, duration
+        elapsed = time.perf_counter_ns() - start
+        return self._result(workload_name, "thread", threads, iterations * threads, elapsed, per_worker)
 
-    def run_hashes(self, count):
-        for _ in range(count):
-            hashlib.sha256(b"benchmark").hexdigest()
+    def _run_processes(self, workload_name, workers, threads, iterations, cpus=None, warmup=0):
+        cpus = cpus or available_cpus(self.logical_threads)
+        ctx = multiprocessing.get_context()
+        ready = ctx.Queue()
+        results = ctx.Queue()
+        start_event = ctx.Event()
+
+        procs = []
+        for idx in range(workers):
+            cpu = cpus[idx % len(cpus)] if cpus else None
+            p = ctx.Process(target=_process_worker,
+                            args=(workload_name, cpu, iterations, threads, ready, start_event, results, warmup),
+                            daemon=True)
+            p.start()
+            procs.append(p)
+
+        # Start the clock only once every worker is spawned, pinned and has its input data
+        gather(ready, procs, self.READY_TIMEOUT)
+        start = time.perf_counter_ns()
+        start_event.set()
+        collected = gather(results, procs)
+        elapsed = time.perf_counter_ns() - start
+        for p in procs:
+            p.join()
+
+        collected.sort(key=lambda r: r[0] if r[0] is not None else -1)
+        per_worker = [ops / (worker_ns / 1e9) for _, ops, worker_ns in collected]
+        total_ops = sum(ops for _, ops, _ in collected)
+        mode = "hybrid" if threads > 1 else "process"
+        return self._result(workload_name, mode, workers, total_ops, elapsed, per_worker)
+
+    def _result(self, workload, mode, workers, total_ops, elapsed_ns, per_worker):
+        return {
+            'workload': workload,
+            'mode': mode,
+            'workers': workers,
+            'ops': total_ops,
+            'elapsed_ns': elapsed_ns,
+            'score': round(total_ops / (elapsed_ns / 1e9), 2),
+            'duration': elapsed_ns / 1e9,
+            'per_worker': [round(v, 2) for v in per_worker],
+        }
+
+    def calibrate(self, workload):
+        if self.count:
+            return self.count
+        if workload not in self._calibrated:
+            w = get_workload(workload)
+            w.prepare()
+            self._calibrated[workload] = self.harness.calibrate(lambda n: Harness.time_ns(w.execute, n))
+        return self._calibrated[workload]
+
+    def measure_parallel(self, workers, workload="hash", mode=None, cpus=None):
+        iterations = self.calibrate(workload)
+        last = {}
+        # A warmup run in fresh processes warms nothing the measured processes use: process workers instead
+        # run a tenth of the iterations per warmup pass, untimed, before the start signal
+        in_process = self.uses_processes(workers, mode or self.mode, cpus)
+        warmup = max(1, iterations // 10) * self.harness.warmup if in_process else 0
+
+        def run(n):
+            last.update(self.run_parallel(workers, mode=mode, workload=workload, iterations=n, cpus=cpus,
+                                          warmup=warmup))
+            return last['ops'], last['elapsed_ns']
+
+        start = time.perf_counter()
+        stats = self.harness.measure(run, iterations, warmup=0 if in_process else None)
+        end = time.perf_counter()
+        result = dict(last)
+        result['score'] = round(stats['median'], 2)
+        result['duration'] = stats['duration']
+        result['stats'] = stats
+        result['unstable'] = stats['unstable']
+        if self.trace is not None:
+            result['telemetry'] = self.trace.window(start, end, cpus, busiest=None if cpus else workers)
+        return result
+
+    @contextmanager
+    def tracing(self):
+        # One session at a time: the suite, per-core, scaling and stress runs would load each other's CPUs
+        # and share self.trace. Nested calls on the same thread re-enter
+        if not self._session.acquire(blocking=False):
+            raise RuntimeError("Another benchmark is already running")
+        try:
+            with self._tracing() as trace:
+                yield trace
+        finally:
+            self._session.release()
+
+    @contextmanager
+    def _tracing(self):
+        # Records temperatures and clocks for everything measured inside; nested runs share the outer trace
+        if self.trace is not None or not self.telemetry:
+            yield self.trace
+            return
+        if self.sensors is None:
+            from Sensors import open_sensors
+            self.sensors = open_sensors(logical=self.logical_threads)
+            self.telemetry = self.sensors is not None
+            if self.sensors is None:
+                yield None
+                return
+        from Sensors import SensorTrace
+        self.trace = SensorTrace(self.sensors).start()
+        try:
+            yield self.trace
+        finally:
+            self.trace.stop()
+            self.last_trace, self.trace = self.trace, None
+
+    def run_workload(self, workload):
+        # The single-core score comes from one pinned worker process, not from this (GUI) process
+        cpus = available_cpus(self.logical_threads)
+        single = self.measure_parallel(1, workload=workload, mode="process", cpus=cpus[:1] or None)
+        multi = self.measure_parallel(self.logical_threads, workload=workload)
+        multi['speedup'] = round(multi['score'] / single['score'], 2) if single['score'] else 0.0
+        multi['efficiency'] = round(multi['speedup'] / multi['workers'], 3) if multi['workers'] else 0.0
+        return {'single': single, 'multi': multi}
+
+    @_traced
+    def run_per_core(self, workload="hash", topology=None, degraded_threshold=0.10, progress=None):
+        # Pins one process to each physical core in turn, then loads SMT siblings and socket pairs together
+        topology = topology or detect_topology(self.logical_threads)
+        cores = []
+        for index, ((package, die, core), members) in enumerate(topology.cores):
+            if progress:
+                progress(f"core {index + 1}/{len(topology.cores)}")
+            single = self.measure_parallel(1, workload=workload, mode="process", cpus=[members[0]])
+            entry = {
+                'label': topology.core_label(index),
+                'package': package,
+                'die': die,
+                'core': core,
+                'cpus': list(members),
+                'core_type': topology.cpus[members[0]].core_type,
+                'score': single['score'],
+                'unstable': single['unstable'],
+            }
+            if 'telemetry' in single:
+                entry['telemetry'] = single['telemetry']
+            if len(members) > 1:
+                both = self.measure_parallel(len(members), workload=workload, mode="process", cpus=list(members))
+                entry['smt_score'] = both['score']
+                entry['smt_scaling'] = round(both['score'] / single['score'], 3) if single['score'] else 0.0
+            cores.append(entry)
+
+        # Degraded cores are compared against peers of the same type so E-cores are not flagged against P-cores
+        by_type = {}
+        for entry in cores:
+            by_type.setdefault(entry['core_type'], []).append(entry['score'])
+        for entry in cores:
+            peers = sorted(by_type[entry['core_type']])
+            median = peers[len(peers) // 2]
+            entry['vs_median'] = round(entry['score'] / median - 1, 4) if median else 0.0
+            entry['degraded'] = entry['vs_median'] < -degraded_threshold
+
+        result = {'workload': workload, 'topology': topology.summary(), 'cores': cores,
+                  'degraded': [e['label'] for e in cores if e['degraded']]}
+        smt = [e['smt_scaling'] for e in cores if 'smt_scaling' in e]
+        if smt:
+            result['smt_scaling'] = round(sum(smt) / len(smt), 3)
+
+        packages = topology.packages
+        if len(packages) > 1:
+            first = {p: next(m for (pkg, _, _), m in topology.cores if pkg == p) for p in packages}
+            same = [m for (pkg, _, _), m in topology.cores if pkg == packages[0]]
+            if len(same) > 1:
+                local = self.measure_parallel(2, workload=workload, mode="process", cpus=[same[0][0], same[1][0]])
+                remote = self.measure_parallel(2, workload=workload, mode="process",
+                                               cpus=[first[packages[0]][0], first[packages[1]][0]])
+                result['cross_socket'] = {
+                    'same_socket_pair': local['score'],
+                    'cross_socket_pair': remote['score'],
+                    'ratio': round(remote['score'] / local['score'], 3) if local['score'] else 0.0,
+                }
+        return result
+
+    @_traced
+    def run_scaling(self, workload="hash", max_workers=None, topology=None, progress=None):
+        # Process workers at 1, 2, 4 ... N, filling one thread per physical core before using SMT siblings
+        topology = topology or detect_topology(self.logical_threads)
+        order = [topology.cpus_by_position[p] for p in topology.spread_order()]
+        allowed = set(available_cpus(self.logical_threads))
+        order = [cpu for cpu in order if cpu in allowed] or sorted(allowed)
+        max_workers = max_workers or self.logical_threads
+        steps = []
+        for workers in worker_steps(max_workers, extra=(len(topology.cores),)):
+            if progress:
+                progress(f"{workload} x{workers}")
+            cpus = [order[i % len(order)] for i in range(workers)]
+            result = self.measure_parallel(workers, workload=workload, mode="process", cpus=cpus)
+            step = {'workers': workers, 'score': result['score'], 'unstable': result['unstable'],
+                    'per_worker': result['per_worker']}
+            if 'telemetry' in result:
+                step['telemetry'] = result['telemetry']
+            steps.append(step)
+        analysis = analyse(steps)
+        analysis['workload'] = workload
+        analysis['physical_cores'] = len(topology.cores)
+        return analysis
+
+    @_traced
+    def run_stress(self, workload="hash", duration=300.0, interval=1.0, workers=None, on_interval=None,
+                   stop=None):
+        # Keeps every worker busy for `duration` seconds and records throughput per interval, with the
+        # clocks and temperatures of the same interval; stop (an Event) ends the run early
+        if not duration > 0 or not interval > 0:
+            raise ValueError(f"Stress duration and interval must be positive (got {duration}s, {interval}s)")
+        workers = workers or self.logical_threads
+        chunk = max(1, int(self.calibrate(workload) * self.STRESS_CHUNK / self.harness.target_time))
+        cpus = available_cpus(self.logical_threads)
+        ctx = multiprocessing.get_context()
+        counters = ctx.Array('Q', workers, lock=False)
+        ready = ctx.Queue()
+        stop_event = ctx.Event()
+        stop = stop or threading.Event()
+
+        procs = []
+        for idx in range(workers):
+            cpu = cpus[idx % len(cpus)] if cpus else None
+            p = ctx.Process(target=_stress_worker,
+                            args=(workload, cpu, chunk, counters, idx, ready, stop_event), daemon=True)
+            p.start()
+            procs.append(p)
+
+        intervals = []
+        try:
+            gather(ready, procs, self.READY_TIMEOUT)
+            # With telemetry every boundary takes its own sensor reading, so the throttle counter delta
+            # of an interval is known as soon as it ends rather than one trace tick later
+            start = previous_t = self.trace.mark().ts if self.trace is not None else time.perf_counter()
+            previous_ops = sum(counters)
+            next_tick = start + interval
+            while next_tick - start <= duration + 1e-9:
+                if stop.wait(max(0.0, next_tick - time.perf_counter())):
+                    break
+                dead = [p for p in procs if p.exitcode is not None]
+                if dead:
+                    raise RuntimeError(f"Stress worker {dead[0].pid} exited with code {dead[0].exitcode}")
+                latest = self.trace.mark() if self.trace is not None else None
+                now = latest.ts if latest is not None else time.perf_counter()
+                ops = sum(counters)
+                record = {'t': round(now - start, 3),
+                          'ops_per_sec': round((ops - previous_ops) / (now - previous_t), 2)}
+                if latest is not None:
+                    telemetry = self.trace.window(previous_t, now)
+                    for key in ('freq_mhz', 'temp_max_c', 'throttle_events'):
+                        if key in telemetry:
+                            record[key] = telemetry[key]
+                    if any(f is not None for f in latest.frequencies):
+                        record['freq_per_cpu'] = [round(f) if f is not None else None for f in latest.frequencies]
+                    if latest.temperatures:
+                        record['temperatures'] = {k: round(v, 1) for k, v in latest.temperatures.items()}
+                intervals.append(record)
+                if on_interval:
+                    on_interval(record)
+                previous_t, previous_ops = now, ops
+                next_tick += interval
+        finally:
+            stop_event.set()
+            for p in procs:
+                p.join(timeout=5)
+                if p.is_alive():
+                    p.terminate()
+
+        if not intervals:
+            raise RuntimeError("Stress run stopped before the first interval completed")
+        result = analyse_stress(intervals)
+        result.update({'workload': workload, 'workers': workers, 'interval': interval,
+                       'duration': intervals[-1]['t']})
+        return result
+
+    def run_suite(self, progress=None):
+        results = {}
+        with self.tracing() as trace:
+            for name in self.workloads:
+                if progress:
+                    progress(name)
+                results[name] = self.run_workload(name)
+        composite = {
+            'single': composite_score({n: r['single']['score'] for n, r in results.items()}),
+            'multi': composite_score({n: r['multi']['score'] for n, r in results.items()}),
+        }
+        self.last_results = {'workloads': results, 'composite': composite}
+        if trace is not None:
+            self.last_results['telemetry'] = trace.trace()
+        return self.last_results
+
+    def _set_label(self, key, text, unstable=False):
+        if key in self.result_labels:
+            if unstable:
+                self.result_labels[key].config(text=f"{text} ⚠", foreground="#FF9800")
+            else:
+                self.result_labels[key].config(text=text)
+
+    @staticmethod
+    def format_score(result, precision=1):
+        stats = result.get('stats')
+        if not stats:
+            return f"{result['score']:.{precision}f}"
+        return f"{result['score']:.{precision}f} ±{stats['ci95_pct']:.1f}%"
+
+    @staticmethod
+    def format_telemetry(result):
+        telemetry = result.get('telemetry') or {}
+        parts = []
+        if 'freq_mhz' in telemetry:
+            parts.append(f"{telemetry['freq_mhz'] / 1000:.2f} GHz")
+        if 'temp_max_c' in telemetry:
+            parts.append(f"{telemetry['temp_max_c']:.0f} °C")
+        if telemetry.get('throttled'):
+            parts.append("throttled")
+        return ", ".join(parts) or "No sensors"
+
+    def start_benchmark(self, callback=None, dispatch=None):
+        # dispatch(fn) runs fn on the Tk thread; labels and the callback are only touched from there
+        dispatch = dispatch or (lambda fn: fn())
 
-    def start_benchmark(self, callback=None):
         def task():
-            single_score, single_time = self.run_test(1)
-            multi_score, multi_time = self.run_test(self.logical_threads)
+            self.last_error = None
+            try:
+                results = self.run_suite()
+                self.last_report = build_report(results, self)
+            except Exception as e:
+                # Whatever failed, the callback has to run: it is what re-enables the GUI's Run button
+                self.last_error = str(e) or type(e).__name__
+                if callback:
+                    dispatch(callback)
+                return
+            if self.history is not None:
+                try:
+                    self.history.record(self.last_report)
+                except Exception as e:
+                    print(f"Could not save benchmark history: {e}", file=sys.stderr)
+            dispatch(lambda: self._show_results(results, callback))
 
-            self.result_labels['single_time'].config(text=f"{single_time:.2f} s")
-            self.result_labels['single_score'].config(text=f"{single_score} ")
-            self.result_labels['multi_time'].config(text=f"{multi_time:.2f} s")
-            self.result_labels['multi_score'].config(text=f"{multi_score} ")
+        threading.Thread(target=task, daemon=True).start()
 
+    def _show_results(self, results, callback=None):
+        try:
+            self._show_labels(results)
+        finally:
             if callback:
                 callback()
 
-        threading.Thread(target=task, daemon=True).start()
-    
\ No newline at end of file
+    def _show_labels(self, results):
+        workloads = results['workloads']
+        if 'hash' in workloads:
+            single, multi = workloads['hash']['single'], workloads['hash']['multi']
+            self._set_label('single_time', f"{single['duration']:.2f} s")
+            self._set_label('single_score', self.format_score(single, 2), single.get('unstable'))
+            self._set_label('multi_time', f"{multi['duration']:.2f} s")
+            self._set_label('multi_score', self.format_score(multi, 2), multi.get('unstable'))
+            self._set_label('speedup', f"{multi['speedup']}x ({multi['efficiency'] * 100:.0f}%)")
+            per_worker = multi['per_worker']
+            avg = sum(per_worker) / len(per_worker) if per_worker else 0
+            self._set_label('per_worker', f"{avg:.0f} (min {min(per_worker, default=0):.0f})")
+            self._set_label('clock_single', self.format_telemetry(single), single.get('telemetry', {}).get('throttled'))
+            self._set_label('clock_multi', self.format_telemetry(multi), multi.get('telemetry', {}).get('throttled'))
+
+        for name, result in workloads.items():
+            self._set_label(f"{name}_single", self.format_score(result['single']), result['single'].get('unstable'))
+            self._set_label(f"{name}_multi", self.format_score(result['multi']), result['multi'].get('unstable'))
+        self._set_label('composite_single', f"{results['composite']['single']}")
+        self._set_label('composite_multi', f"{results['composite']['multi']}")
@@ -0,0 +1,91 @@
+import threading
+from tkinter import ttk
+from CacheProbe import format_size, run_cache_probe
+from UiQueue import shared_ui_queue
+
+
+class CachePanel:
+    COLUMNS = (("declared", "Declared", 90), ("effective", "Detected", 90), ("latency", "Latency ns", 90),
+               ("bandwidth", "Read GB/s", 90))
+
+    def __init__(self, root, cpu_info=None):
+        self.root = root
+        self.ui = shared_ui_queue(root)
+        self.cpu_info = cpu_info
+        self.frame = ttk.LabelFrame(root, text="🧮 Cache Hierarchy", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill='x', pady=4)
+        self.run_btn = ttk.Button(controls, text="▶ Probe caches", command=self.start)
+        self.run_btn.pack(side='left', padx=4)
+        self.status_label = ttk.Label(controls, text="", font=("Segoe UI", 10, "italic"), foreground="blue")
+        self.status_label.pack(side='left', padx=8)
+
+        self.tree = ttk.Treeview(self.frame, columns=[c[0] for c in self.COLUMNS], height=5)
+        self.tree.heading("#0", text="Level")
+        self.tree.column("#0", width=80, stretch=False)
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor='e')
+        self.tree.pack(fill='x', pady=4)
+
+        # matplotlib is imported on first use so it stays off the startup path
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig, self.ax = plt.subplots(figsize=(6, 2.6))
+        self.ax_bw = self.ax.twinx()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
+        self.canvas.get_tk_widget().pack(pady=6)
+
+    def start(self):
+        self.run_btn.config(state='disabled')
+
+        def progress(step):
+            self.ui.call(lambda: self.status_label.config(text=f"Running {step}...", foreground="blue"))
+
+        def task():
+            try:
+                result = run_cache_probe(self.cpu_info, progress=progress)
+                self.ui.call(lambda: self.show(result))
+            except Exception as e:
+                message = f"Error: {e}"
+                self.ui.call(lambda: self.status_label.config(text=message, foreground="red"))
+            finally:
+                self.ui.call(lambda: self.run_btn.config(state='normal'))
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def show(self, result):
+        self.tree.delete(*self.tree.get_children())
+        for level in result['levels']:
+            bandwidth = level['read_gb_s']
+            self.tree.insert("", "end", text=level['name'], values=(
+                format_size(level['declared_size']), format_size(level['effective_size']),
+                f"{level['latency_ns']:.1f}", f"{bandwidth:.1f}" if bandwidth is not None else "-"))
+
+        points = result['points']
+        sizes = [p['size'] / 1024 for p in points]
+        self.ax.clear()
+        self.ax_bw.clear()
+        self.ax.plot(sizes, [p['latency_ns'] for p in points], marker='o', markersize=3, color='#e91e63',
+                     label='ns per access')
+        if points and points[0]['read_gb_s'] is not None:
+            self.ax_bw.plot(sizes, [p['read_gb_s'] for p in points], color='#2196f3', label='Read GB/s')
+            self.ax_bw.legend(loc='upper right', fontsize=8)
+        for cache in result['declared']:
+            if cache['size']:
+                self.ax.axvline(cache['size'] / 1024, color='#9e9e9e', linestyle=':')
+        self.ax.set_xscale('log', base=2)
+        self.ax.set_xlabel('Working set (KiB)', fontsize=9)
+        self.ax.set_ylabel('ns', fontsize=9)
+        self.ax_bw.set_ylabel('GB/s', fontsize=9)
+        self.ax.legend(loc='upper left', fontsize=8)
+        self.fig.tight_layout()
+        self.canvas.draw()
+        if result['overhead_ns'] is None:
+            method = "vectorised random gather, ns per access"
+        else:
+            method = f"interpreter overhead {result['overhead_ns']:.1f} ns per load subtracted"
+        self.status_label.config(text=f"✅ Probe complete ({method})", foreground="blue")
@@ -0,0 +1,180 @@
+import math
+import statistics
+import time
+from MemoryBenchmark import MIB, available_memory, build_chain, chase_ns
+from Topology import declared_caches
+from Workloads import HAVE_NUMPY
+
+KIB = 1024
+
+
+def sweep_sizes(min_size=4 * KIB, max_size=256 * MIB, per_octave=2):
+    # Geometric steps, several per doubling, so a knee lands between two close points
+    sizes = []
+    k = 0
+    while True:
+        size = int(min_size * 2 ** (k / per_octave))
+        if size > max_size:
+            return sizes
+        sizes.append(size - size % 64)
+        k += 1
+
+
+def read_bandwidth(size, target_bytes=64 * MIB, repetitions=3):
+    # A zero-stride outer axis re-reads the same `size` bytes many times in one NumPy call,
+    # so call overhead is amortised without growing the working set
+    import numpy as np
+    n = max(8, size // 8)
+    data = np.ones(n)
+    reps = max(1, target_bytes // (n * 8))
+    view = np.lib.stride_tricks.as_strided(data, shape=(reps, n), strides=(0, 8))
+    view.sum()
+    best = None
+    for _ in range(repetitions):
+        start = time.perf_counter_ns()
+        view.sum()
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return reps * n * 8 / best
+
+
+def gather_ns(size, line_size=64, accesses=1 << 22, repetitions=3, block=4096):
+    # One int64 per cache line, read in a random order with a single vectorised np.take per pass. The loads
+    # are independent, so this is the cost per access with misses overlapping rather than a dependent-load
+    # latency, but it steps up at the same working-set sizes and is free of interpreter overhead. Small sets
+    # tile the permutation to `block` indices so the per-call cost spreads over enough accesses
+    import numpy as np
+    stride = line_size // 8
+    lines = max(2, size // line_size)
+    data = np.ones(lines * stride, dtype=np.int64)
+    order = np.random.default_rng(1).permutation(lines).astype(np.intp) * stride
+    index = np.tile(order, -(-block // lines))
+    out = np.empty(len(index), dtype=np.int64)
+    calls = max(1, accesses // len(index))
+    np.take(data, index, out=out)
+    best = None
+    for _ in range(repetitions):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            np.take(data, index, out=out)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (calls * len(index))
+
+
+def sweep(sizes=None, line_size=64, progress=None):
+    sizes = sizes or sweep_sizes(max_size=min(256 * MIB, available_memory() // 4))
+    # Without NumPy only the pointer chase is left; every load then also pays for the interpreter, which is
+    # measured on a chain that fits in L1 and subtracted
+    overhead = None if HAVE_NUMPY else chase_ns(build_chain(4 * KIB, line_size))
+    points = []
+    for size in sizes:
+        if progress:
+            progress(f"working set {format_size(size)}")
+        if HAVE_NUMPY:
+            latency = gather_ns(size, line_size)
+        else:
+            latency = max(0.0, chase_ns(build_chain(size, line_size), steps=1 << 20) - overhead)
+        points.append({
+            'size': size,
+            'latency_ns': round(latency, 2),
+            'read_gb_s': round(read_bandwidth(size), 2) if HAVE_NUMPY else None,
+        })
+    return {'method': "gather" if HAVE_NUMPY else "pointer_chase",
+            'overhead_ns': round(overhead, 2) if overhead is not None else None, 'points': points}
+
+
+def smooth(values):
+    # Running median of three: a single descheduled or lucky measurement must not look like a knee
+    if len(values) < 3:
+        return list(values)
+    return [values[0]] + [statistics.median(values[i - 1:i + 2]) for i in range(1, len(values) - 1)] + [values[-1]]
+
+
+def _starts_new_level(latency, level, tolerance, min_step_ns):
+    return latency > level * (1 + tolerance) and latency - level > min_step_ns
+
+
+def detect_levels(points, tolerance=0.25, min_step_ns=1.0, confirm=3):
+    # Split the smoothed latency curve into plateaus: a point more than `tolerance` (and min_step_ns)
+    # above the running plateau median starts a new one, but only if the next `confirm` points all stay
+    # up there too, so a noisy bump is not a cache level. Single-point plateaus are the slopes between levels.
+    if not points:
+        return []
+    latencies = smooth([p['latency_ns'] for p in points])
+    plateaus = [[0]]
+    for i in range(1, len(points)):
+        level = statistics.median(latencies[j] for j in plateaus[-1])
+        if all(_starts_new_level(latency, level, tolerance, min_step_ns) for latency in latencies[i:i + confirm]):
+            plateaus.append([i])
+        else:
+            plateaus[-1].append(i)
+    kept = [p for p in plateaus if len(p) > 1] or plateaus
+
+    # Dropping a slope can leave two neighbouring plateaus at the same latency; join them again
+    merged = [kept[0]]
+    for plateau in kept[1:]:
+        previous = statistics.median(latencies[j] for j in merged[-1])
+        current = statistics.median(latencies[j] for j in plateau)
+        if _starts_new_level(current, previous, tolerance, min_step_ns):
+            merged.append(plateau)
+        else:
+            merged[-1] = merged[-1] + plateau
+
+    levels = []
+    for plateau in merged:
+        bandwidth = [points[j]['read_gb_s'] for j in plateau if points[j]['read_gb_s'] is not None]
+        levels.append({
+            'effective_size': points[plateau[-1]]['size'],
+            'latency_ns': round(statistics.median(latencies[j] for j in plateau), 2),
+            'read_gb_s': round(statistics.median(bandwidth), 2) if bandwidth else None,
+        })
+    return levels
+
+
+def match_declared(levels, declared, max_distance=2.0):
+    # A plateau ends at or a little before its cache's declared size (other lines and the TLB compete for it),
+    # so it pairs with the next declared cache big enough to hold it, if that is within `max_distance`
+    # doublings. A knee the sweep could not resolve leaves its cache out instead of shifting every label
+    # down a level; a last plateau that matches nothing is DRAM
+    caches = [c for c in declared if c['type'] != "Instruction" and c['size']]
+    rows = []
+    next_cache = 0
+    for i, level in enumerate(levels):
+        cache = None
+        for k in range(next_cache, len(caches)):
+            if caches[k]['size'] * 1.5 >= level['effective_size']:
+                if math.log2(caches[k]['size'] / level['effective_size']) <= max_distance:
+                    cache, next_cache = caches[k], k + 1
+                break
+        if cache:
+            name = f"L{cache['level']}" + ("d" if cache['type'] == "Data" else "")
+        else:
+            name = "DRAM" if i == len(levels) - 1 else f"level {i + 1}"
+        rows.append(dict(level, name=name, declared_size=cache['size'] if cache else None,
+                         line_size=cache['line_size'] if cache else None))
+    return rows
+
+
+def format_size(size):
+    if size is None:
+        return "-"
+    if size >= MIB:
+        return f"{size / MIB:.0f} MiB" if size % MIB == 0 else f"{size / MIB:.1f} MiB"
+    return f"{size // KIB} KiB"
+
+
+def run_cache_probe(cpu_info=None, progress=None):
+    declared = declared_caches(cpu_info)
+    if not declared and cpu_info is None:
+        from CpuInfoCache import get_cpu_info
+        declared = declared_caches(get_cpu_info())
+    result = sweep(progress=progress)
+    levels = match_declared(detect_levels(result['points']), declared)
+    return {
+        'declared': declared,
+        'method': result['method'],
+        'overhead_ns': result['overhead_ns'],
+        'points': result['points'],
+        'levels': levels,
+    }
@@ -0,0 +1,90 @@
+import tkinter as tk
+
+
+class MatplotlibRenderer:
+    def __init__(self, root, max_points, blit=True):
+        # Imported here so the Tk renderer never pays for matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.max_points = max_points
+        self.blit = blit
+        self.background = None
+
+        self.fig, self.ax = plt.subplots(figsize=(6, 3))
+        self.line1, = self.ax.plot(range(max_points), [0] * max_points, label='Total CPU Usage',
+                                   color='#2196f3', animated=blit)
+        self.ax.set_ylim(0, 100)
+        self.ax.set_xlim(0, max_points - 1)
+        self.ax.set_title('CPU Usage Over Time', fontsize=14, fontweight='bold')
+        self.ax.set_ylabel('%', fontsize=12)
+        self.ax.tick_params(axis='both', which='major', labelsize=10)
+        self.ax.legend(loc='upper right', fontsize=10)
+        self.fig.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=root)
+        self.widget = self.canvas.get_tk_widget()
+        if blit:
+            # Any full redraw (first show, resize) invalidates the cached background
+            self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.line1)
+
+    def set_view(self, max_points, xlabel=""):
+        self.max_points = max_points
+        self.ax.set_xlim(0, max_points - 1)
+        self.ax.set_xlabel(xlabel, fontsize=9)
+        self.background = None
+        self.canvas.draw_idle()
+
+    def update(self, values):
+        self.line1.set_data(range(len(values)), values)
+        if not self.blit:
+            self.canvas.draw()
+            return
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.line1)
+        self.canvas.blit(self.ax.bbox)
+
+
+class TkCanvasRenderer:
+    def __init__(self, root, max_points, width=600, height=300):
+        self.max_points = max_points
+        self.width = width
+        self.height = height
+        self.left, self.right, self.top, self.bottom = 40, width - 12, 34, height - 24
+
+        self.widget = tk.Canvas(root, width=width, height=height, bg="white", highlightthickness=0)
+        self.widget.create_text(width // 2, 16, text="CPU Usage Over Time", font=("Segoe UI", 13, "bold"))
+        for pct in (0, 25, 50, 75, 100):
+            y = self._y(pct)
+            self.widget.create_line(self.left, y, self.right, y, fill="#e0e0e0")
+            self.widget.create_text(self.left - 6, y, text=str(pct), anchor='e', font=("Segoe UI", 9))
+        self.widget.create_rectangle(self.left, self.top, self.right, self.bottom, outline="#9e9e9e")
+        self.xlabel = self.widget.create_text(width // 2, height - 10, text="", font=("Segoe UI", 9))
+        self.line1 = self.widget.create_line(*self._points([0] * max_points), fill="#2196f3", width=2)
+
+    def _y(self, value):
+        return self.bottom - (self.bottom - self.top) * max(0.0, min(100.0, value)) / 100.0
+
+    def _points(self, values):
+        step = (self.right - self.left) / max(1, self.max_points - 1)
+        coords = []
+        for i, v in enumerate(values):
+            coords.append(self.left + i * step)
+            coords.append(self._y(v))
+        if len(coords) < 4:
+            coords.extend(coords or [self.left, self.bottom])
+        return coords
+
+    def set_view(self, max_points, xlabel=""):
+        self.max_points = max_points
+        self.widget.itemconfig(self.xlabel, text=xlabel)
+
+    def update(self, values):
+        self.widget.coords(self.line1, *self._points(values))
@@ -0,0 +1,74 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+
+# Ten usage buckets from idle green through yellow to saturated red
+BUCKET_COLORS = ["#e8f5e9", "#c8e6c9", "#a5d6a7", "#dce775", "#fff176",
+                 "#ffd54f", "#ffb74d", "#ff8a65", "#f4511e", "#b71c1c"]
+
+
+def usage_bucket(value):
+    return min(len(BUCKET_COLORS) - 1, max(0, int(value * len(BUCKET_COLORS) / 100.0)))
+
+
+class CoreHeatmap:
+    def __init__(self, root, core_groups, cell=16, gap=2, max_width=560, title="🔥 Logical CPU Heatmap"):
+        self.frame = ttk.LabelFrame(root, text=title, padding=8)
+        self.frame.pack(fill='x', padx=8, pady=6)
+
+        # Cells follow core order so SMT siblings sit next to each other
+        self.order = [cpu for group in core_groups for cpu in group]
+        count = len(self.order)
+        pitch = cell + gap
+        self.columns = max(1, min(count, max_width // pitch))
+        rows = math.ceil(count / self.columns)
+
+        self.canvas = tk.Canvas(self.frame, width=self.columns * pitch + gap, height=rows * pitch + gap,
+                                bg="#fafafa", highlightthickness=0)
+        self.canvas.pack(anchor='w')
+
+        self.cells = {}
+        self.buckets = {}
+        self.values = {}
+        for pos, cpu in enumerate(self.order):
+            row, col = divmod(pos, self.columns)
+            x, y = gap + col * pitch, gap + row * pitch
+            self.cells[cpu] = self.canvas.create_rectangle(x, y, x + cell, y + cell, fill=BUCKET_COLORS[0],
+                                                           outline="#bdbdbd", tags=(f"cpu{cpu}",))
+            self.buckets[cpu] = 0
+            self.values[cpu] = 0.0
+        self.item_to_cpu = {item: cpu for cpu, item in self.cells.items()}
+
+        self.info_label = ttk.Label(self.frame, text=f"{count} logical CPUs — hover a cell for details",
+                                    font=("Segoe UI", 10))
+        self.info_label.pack(anchor='w', pady=(4, 0))
+        self.canvas.bind("<Motion>", self._on_motion)
+
+        legend = ttk.Frame(self.frame)
+        legend.pack(anchor='w', pady=(4, 0))
+        for i, color in enumerate(BUCKET_COLORS):
+            tk.Label(legend, bg=color, width=2, text="").pack(side='left')
+        ttk.Label(legend, text=" 0 → 100 %", font=("Segoe UI", 9)).pack(side='left')
+
+    def update(self, per_thread):
+        # Only cells whose colour bucket changed are touched, so a quiet 256-thread box costs almost nothing
+        changed = 0
+        for cpu, item in self.cells.items():
+            if cpu >= len(per_thread):
+                continue
+            value = per_thread[cpu]
+            self.values[cpu] = value
+            bucket = usage_bucket(value)
+            if bucket != self.buckets[cpu]:
+                self.buckets[cpu] = bucket
+                self.canvas.itemconfig(item, fill=BUCKET_COLORS[bucket])
+                changed += 1
+        return changed
+
+    def _on_motion(self, event):
+        items = self.canvas.find_overlapping(event.x, event.y, event.x, event.y)
+        for item in items:
+            cpu = self.item_to_cpu.get(item)
+            if cpu is not None:
+                self.info_label.config(text=f"CPU {cpu}: {self.values[cpu]:.1f} %")
+                return
@@ -0,0 +1,64 @@
+import json
+import os
+import platform
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cpu_monitor", "cpuinfo.json")
+BOOT_ID = "/proc/sys/kernel/random/boot_id"
+PROC_CPUINFO = "/proc/cpuinfo"
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _microcode():
+    text = _read(PROC_CPUINFO)
+    if text:
+        for line in text.splitlines():
+            if line.startswith("microcode"):
+                return line.split(":", 1)[1].strip()
+    return None
+
+
+def cache_key():
+    # A reboot (new boot ID) or microcode update changes what CPUID reports, so both invalidate the cache
+    boot = (_read(BOOT_ID) or "").strip()
+    if not boot:
+        try:
+            import psutil
+            boot = str(int(psutil.boot_time()))
+        except Exception:
+            boot = ""
+    return "|".join([platform.node(), platform.processor(), boot, _microcode() or ""])
+
+
+def load_cached(path=CACHE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('key') != cache_key():
+        return None
+    return data.get('info')
+
+
+def get_cpu_info(path=CACHE_PATH):
+    info = load_cached(path)
+    if info is not None:
+        return info
+    import cpuinfo
+    info = cpuinfo.get_cpu_info()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({'key': cache_key(), 'info': info}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return info
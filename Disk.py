@@ -1,12 +1,15 @@
+import os
+import threading
 import tkinter as tk
-from tkinter import ttk
-import wmi
-import subprocess
-import json
+from tkinter import ttk, messagebox
+from Inventory import shared_inventory
+from UiQueue import shared_ui_queue
 
 class DiskInfo:
-    def __init__(self, root):
+    def __init__(self, root, inventory=None):
         self.root = root
+        self.ui = shared_ui_queue(root)
+        self.inventory = inventory or shared_inventory()
         self.frame = ttk.LabelFrame(root, text="💾 Disk Drives Information", padding=12)
         self.frame.pack(fill='x', padx=10, pady=10)
 
@@ -14,54 +17,118 @@ class DiskInfo:
         self.text.pack(fill='both', padx=5, pady=5)
         self.text.config(state=tk.DISABLED)
 
-        self.refresh_btn = ttk.Button(self.frame, text="🔄 Refresh", command=self.update_info)
-        self.refresh_btn.pack(pady=6)
+        controls = ttk.Frame(self.frame)
+        controls.pack(pady=6)
+        self.refresh_btn = ttk.Button(controls, text="🔄 Refresh", command=self.refresh)
+        self.refresh_btn.pack(side='left', padx=4)
+        self.bench_btn = ttk.Button(controls, text="⏱ Benchmark volume", command=self.start_benchmark)
+        self.bench_btn.pack(side='left', padx=4)
+        self.volume_box = ttk.Combobox(controls, state="readonly", width=18)
+        self.volume_box.pack(side='left', padx=4)
+        self.volumes = {}
+        self._load_volumes()
+        # Buffered random writes only reach the page cache, so the GUI measures the device by default
+        self.direct_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(controls, text="Bypass page cache (O_DIRECT)", variable=self.direct_var).pack(side='left', padx=4)
+        self.status_label = ttk.Label(self.frame, text="", font=("Segoe UI", 10, "italic"), foreground="blue")
+        self.status_label.pack()
 
-        self.update_info()
+        self.disks = None
+        self.bench_results = []
+        self._show_placeholder()
+        self.inventory.get("disks", self._on_result)
 
-    def get_disk_types(self):
-        disk_types = {}
+    def _show_placeholder(self):
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "Loading...")
+        self.text.config(state=tk.DISABLED)
+
+    def refresh(self):
+        self._show_placeholder()
+        self.inventory.refresh("disks", self._on_result)
+
+    def _on_result(self, disks, error):
+        self.ui.call(self.update_info, disks, error)
+
+    def _load_volumes(self):
+        from DiskBenchmark import mounted_volumes, volume_for_path
         try:
-            cmd = ['powershell', '-Command',
-                   "Get-PhysicalDisk | Select-Object FriendlyName, MediaType | ConvertTo-Json"]
-            output = subprocess.check_output(cmd, text=True)
-            disks = json.loads(output)
-            if isinstance(disks, dict):
-                disks = [disks]
-
-            for disk in disks:
-                name = disk.get("FriendlyName", "").strip()
-                media = disk.get("MediaType", "Unknown")
-                disk_types[name] = media
+            self.volumes = {v['mountpoint']: v for v in mounted_volumes()}
         except Exception:
-            pass
-        return disk_types
+            self.volumes = {}
+        self.volume_box.config(values=list(self.volumes))
+        home = volume_for_path(os.path.expanduser("~"))['mountpoint']
+        if self.volumes:
+            self.volume_box.set(home if home in self.volumes else next(iter(self.volumes)))
+        else:
+            self.bench_btn.config(state='disabled')
+
+    def start_benchmark(self):
+        # Writes a temporary file to the chosen volume, so it only runs on request and after confirmation
+        from DiskBenchmark import DiskBenchmark, MIB
+        volume = self.volumes.get(self.volume_box.get())
+        if volume is None:
+            return
+        defaults = DiskBenchmark(volume['mountpoint'])
+        seconds = 2 * len(defaults.queue_depths) * defaults.duration
+        if not messagebox.askyesno("Disk benchmark",
+                                   f"Write a {defaults.file_size // MIB} MiB test file to {volume['mountpoint']} "
+                                   f"({volume['device']}) and run about {seconds:.0f} s of random I/O on it?"):
+            return
+        self.bench_btn.config(state='disabled')
+        direct = self.direct_var.get()
+
+        def progress(step):
+            self.ui.call(lambda: self.status_label.config(text=f"Running {step}...", foreground="blue"))
+
+        def task():
+            try:
+                from DiskBenchmark import benchmark_volumes
+                results = benchmark_volumes([volume], progress=progress, direct=direct)
+                self.ui.call(self.show_benchmark, results)
+            except Exception as e:
+                message = f"Error: {e}"
+                self.ui.call(lambda: self.status_label.config(text=message, foreground="red"))
+            finally:
+                self.ui.call(lambda: self.bench_btn.config(state='normal'))
 
-    def update_info(self):
+        threading.Thread(target=task, daemon=True).start()
+
+    def show_benchmark(self, results):
+        # Newest result per volume; other volumes keep what they showed before
+        mounts = {r['mountpoint'] for r in results}
+        self.bench_results = [r for r in self.bench_results if r['mountpoint'] not in mounts] + results
+        self.status_label.config(text="✅ Disk benchmark complete!", foreground="blue")
+        if self.disks is not None:
+            self.update_info(self.disks)
+
+    def _insert_benchmarks(self, results):
+        from DiskBenchmark import summary_line
+        for result in results:
+            self.text.insert(tk.END, f"  Volume {result['mountpoint']}: ", "label")
+            self.text.insert(tk.END, f"{summary_line(result)}\n", "error" if 'error' in result else "value_bench")
+
+    def update_info(self, disks, error=None):
         try:
+            if error:
+                raise error
+            self.disks = disks
+            matched = set()
             self.text.config(state=tk.NORMAL)
             self.text.delete("1.0", tk.END)
-            c = wmi.WMI()
-            disks = c.Win32_DiskDrive()
             if not disks:
                 self.text.insert(tk.END, "No disk drive info found.", ("error",))
                 self.text.config(state=tk.DISABLED)
                 return
 
-            disk_types = self.get_disk_types()
-
             for i, disk in enumerate(disks, 1):
-                size_gb = int(disk.Size) // (1024**3) if disk.Size else "Unknown"
-                model = disk.Model.strip() if disk.Model else 'N/A'
-                serial = disk.SerialNumber.strip() if disk.SerialNumber else 'N/A'
-                interface = disk.InterfaceType if hasattr(disk, 'InterfaceType') else 'N/A'
-                media_type = disk.MediaType if hasattr(disk, 'MediaType') else 'N/A'
-
-                disk_type = "Unknown"
-                for friendly_name, media in disk_types.items():
-                    if friendly_name.lower() in model.lower():
-                        disk_type = media
-                        break
+                size_gb = disk['size_gb']
+                model = disk['model']
+                serial = disk['serial']
+                interface = disk['interface']
+                media_type = disk['media_type']
+                disk_type = disk['disk_type']
 
                 # Insert formatted info with tags for colors
                 self.text.insert(tk.END, f"Drive {i}:\n", "drive_title")
@@ -73,12 +140,21 @@ class DiskInfo:
                 self.text.insert(tk.END, f"{interface}\n", "value_interface")
                 self.text.insert(tk.END, f"  Size: ", "label")
                 self.text.insert(tk.END, f"{size_gb} GB\n", "value_size")
-                self.text.insert(tk.END, f"  Media Type (WMI): ", "label")
+                self.text.insert(tk.END, f"  Media Type: ", "label")
                 self.text.insert(tk.END, f"{media_type}\n", "value_media")
-                self.text.insert(tk.END, f"  Drive Type (PowerShell): ", "label")
+                self.text.insert(tk.END, f"  Drive Type: ", "label")
                 self.text.insert(tk.END, f"{disk_type}\n", "value_disk_type")
+                volumes = [r for r in self.bench_results if r.get('disk') == disk['name']]
+                matched.update(id(r) for r in volumes)
+                self._insert_benchmarks(volumes)
                 self.text.insert(tk.END, "-"*45 + "\n", "separator")
 
+            # Volumes whose backing drive could not be resolved (Windows drive letters, dm/LVM, RAID)
+            others = [r for r in self.bench_results if id(r) not in matched]
+            if others:
+                self.text.insert(tk.END, "Other volumes:\n", "drive_title")
+                self._insert_benchmarks(others)
+
             # Color configuration
             self.text.tag_config("drive_title", foreground="#2c3e50", font=("Segoe UI", 11, "bold"))
             self.text.tag_config("label", foreground="#34495e", font=("Segoe UI", 10, "bold"))
@@ -89,6 +165,8 @@ class DiskInfo:
             self.text.tag_config("value_media", foreground="#c0392b")
             self.text.tag_config("value_disk_type", foreground="#27ae60")
             self.text.tag_config("separator", foreground="#bdc3c7")
+            self.text.tag_config("value_bench", foreground="#e67e22")
+            self.text.tag_config("error", foreground="red")
 
             self.text.config(state=tk.DISABLED)
 
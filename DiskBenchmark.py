@@ -0,0 +1,306 @@
+import math
+import mmap
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MIB = 1024 * 1024
+O_DIRECT = getattr(os, "O_DIRECT", 0)
+O_BINARY = getattr(os, "O_BINARY", 0)
+SYS_CLASS_BLOCK = "/sys/class/block"
+# Pseudo and network filesystems are never worth benchmarking as local storage
+SKIP_FSTYPES = {"squashfs", "tmpfs", "devtmpfs", "overlay", "proc", "sysfs", "nfs", "nfs4", "cifs", "smbfs",
+                "fuse.sshfs", "iso9660", "udf"}
+# Boot and firmware partitions are small and matter to the machine starting; never fill them unasked
+SYSTEM_MOUNTS = {"/boot", "/boot/efi", "/efi", "/recovery"}
+MIN_VOLUME_SIZE = 4 * 1024 * MIB
+
+
+def percentile(sorted_values, q):
+    # Nearest-rank percentile on an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_stats(latencies_ns):
+    values = sorted(latencies_ns)
+    if not values:
+        return {'p50_us': 0.0, 'p99_us': 0.0, 'p999_us': 0.0, 'mean_us': 0.0, 'max_us': 0.0}
+    return {
+        'p50_us': round(percentile(values, 50) / 1000, 1),
+        'p99_us': round(percentile(values, 99) / 1000, 1),
+        'p999_us': round(percentile(values, 99.9) / 1000, 1),
+        'mean_us': round(sum(values) / len(values) / 1000, 1),
+        'max_us': round(values[-1] / 1000, 1),
+    }
+
+
+def aligned_buffer(size):
+    # Anonymous mmaps are page aligned, which O_DIRECT needs for the user buffer
+    buf = mmap.mmap(-1, size)
+    buf.write(os.urandom(size))
+    return buf
+
+
+def parent_disk(device):
+    # /dev/nvme0n1p2 -> /dev/nvme0n1; whole disks and non-Linux devices map to themselves
+    name = os.path.basename(device)
+    path = os.path.join(SYS_CLASS_BLOCK, name)
+    if os.path.exists(os.path.join(path, "partition")):
+        return "/dev/" + os.path.basename(os.path.dirname(os.path.realpath(path)))
+    return device
+
+
+def mounted_volumes(include_system=False):
+    # Writable local volumes; boot/EFI mounts and anything under MIN_VOLUME_SIZE only with include_system
+    import psutil
+    volumes = []
+    seen = set()
+    for part in psutil.disk_partitions(all=False):
+        opts = part.opts.split(",")
+        if part.fstype in SKIP_FSTYPES or "ro" in opts or "cdrom" in opts or part.device in seen:
+            continue
+        if not include_system:
+            try:
+                total = psutil.disk_usage(part.mountpoint).total
+            except OSError:
+                continue
+            if part.mountpoint in SYSTEM_MOUNTS or total < MIN_VOLUME_SIZE:
+                continue
+        seen.add(part.device)
+        volumes.append({
+            'device': part.device,
+            'mountpoint': part.mountpoint,
+            'fstype': part.fstype,
+            'disk': parent_disk(part.device) if platform.system() == "Linux" else part.device,
+        })
+    return volumes
+
+
+def _drop_cache(fd):
+    # Evict the test file from the page cache so buffered reads hit the device
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+class DiskBenchmark:
+    def __init__(self, directory, file_size=256 * MIB, block_size=MIB, io_size=4096,
+                 queue_depths=(1, 4, 16, 32), duration=2.0, direct=False):
+        if file_size < block_size:
+            raise ValueError(f"Disk test file must be at least {block_size // 1024} KiB")
+        if duration <= 0 or not queue_depths or min(queue_depths) < 1:
+            raise ValueError("Disk benchmark needs a positive duration and queue depths of at least 1")
+        self.directory = directory
+        self.file_size = file_size - file_size % block_size
+        self.block_size = block_size
+        self.io_size = io_size
+        self.queue_depths = tuple(queue_depths)
+        self.duration = duration
+        self.direct = direct and bool(O_DIRECT)
+        self.path = None
+
+    def _open(self, flags):
+        flags |= O_BINARY
+        if self.direct:
+            try:
+                return os.open(self.path, flags | O_DIRECT)
+            except OSError:
+                # tmpfs and some FUSE filesystems reject O_DIRECT; fall back to buffered I/O
+                self.direct = False
+        return os.open(self.path, flags)
+
+    def _timed_blocks(self, fd, write):
+        buf = aligned_buffer(self.block_size)
+        f = os.fdopen(fd, "r+b" if write else "rb", buffering=0)
+        latencies = []
+        try:
+            start = time.perf_counter_ns()
+            for offset in range(0, self.file_size, self.block_size):
+                t0 = time.perf_counter_ns()
+                if write:
+                    f.write(buf)
+                else:
+                    f.readinto(buf)
+                latencies.append(time.perf_counter_ns() - t0)
+            if write:
+                os.fsync(f.fileno())
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            f.close()
+            buf.close()
+        return self._throughput(self.file_size, elapsed, latencies)
+
+    def _throughput(self, size, elapsed_ns, latencies):
+        seconds = elapsed_ns / 1e9
+        return {
+            'mb_s': round(size / MIB / seconds, 1) if seconds else 0.0,
+            'seconds': round(seconds, 3),
+            'latency': latency_stats(latencies),
+        }
+
+    def sequential_write(self):
+        return self._timed_blocks(self._open(os.O_RDWR | os.O_CREAT | os.O_TRUNC), write=True)
+
+    def sequential_read(self):
+        fd = self._open(os.O_RDONLY)
+        if not self.direct:
+            _drop_cache(fd)
+        return self._timed_blocks(fd, write=False)
+
+    def mmap_read(self):
+        fd = os.open(self.path, os.O_RDONLY | O_BINARY)
+        try:
+            _drop_cache(fd)
+            mapped = mmap.mmap(fd, self.file_size, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        view = memoryview(mapped)
+        latencies = []
+        checksum = 0
+        try:
+            start = time.perf_counter_ns()
+            for offset in range(0, self.file_size, self.block_size):
+                t0 = time.perf_counter_ns()
+                # Copying the slice faults every page of the block in
+                checksum ^= bytes(view[offset:offset + self.block_size])[-1]
+                latencies.append(time.perf_counter_ns() - t0)
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            view.release()
+            mapped.close()
+        return self._throughput(self.file_size, elapsed, latencies)
+
+    def random_io(self, write, queue_depth):
+        # queue_depth threads each keep one request in flight; file objects release the GIL during I/O
+        blocks = self.file_size // self.io_size
+        deadline = time.perf_counter() + self.duration
+        if not write:
+            fd = self._open(os.O_RDONLY)
+            if not self.direct:
+                _drop_cache(fd)
+            os.close(fd)
+
+        def worker(seed):
+            rng = random.Random(seed)
+            buf = aligned_buffer(self.io_size)
+            f = os.fdopen(self._open(os.O_RDWR if write else os.O_RDONLY), "r+b" if write else "rb", buffering=0)
+            latencies = []
+            try:
+                while time.perf_counter() < deadline:
+                    offset = rng.randrange(blocks) * self.io_size
+                    t0 = time.perf_counter_ns()
+                    f.seek(offset)
+                    if write:
+                        f.write(buf)
+                    else:
+                        f.readinto(buf)
+                    latencies.append(time.perf_counter_ns() - t0)
+                if write:
+                    os.fsync(f.fileno())
+            finally:
+                f.close()
+                buf.close()
+            return latencies
+
+        start = time.perf_counter_ns()
+        with ThreadPoolExecutor(max_workers=queue_depth) as pool:
+            per_thread = list(pool.map(worker, range(queue_depth)))
+        elapsed = time.perf_counter_ns() - start
+        latencies = [lat for thread in per_thread for lat in thread]
+        seconds = elapsed / 1e9
+        return {
+            'queue_depth': queue_depth,
+            'iops': round(len(latencies) / seconds) if seconds else 0,
+            'mb_s': round(len(latencies) * self.io_size / MIB / seconds, 1) if seconds else 0.0,
+            'latency': latency_stats(latencies),
+        }
+
+    def run(self, progress=None):
+        def step(name):
+            if progress:
+                progress(name)
+
+        free = shutil.disk_usage(self.directory).free
+        if free < 2 * self.file_size:
+            raise OSError(f"Only {free // MIB} MiB free; the test needs twice its {self.file_size // MIB} MiB file")
+        fd, self.path = tempfile.mkstemp(prefix=".cpu_monitor_disk_", dir=self.directory)
+        os.close(fd)
+        try:
+            step("sequential write")
+            seq_write = self.sequential_write()
+            step("sequential read")
+            seq_read = self.sequential_read()
+            step("mmap read")
+            mapped = self.mmap_read()
+            random_results = {'read': [], 'write': []}
+            for kind in ('read', 'write'):
+                for depth in self.queue_depths:
+                    step(f"4K random {kind} QD{depth}")
+                    random_results[kind].append(self.random_io(kind == 'write', depth))
+        finally:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        return {
+            'path': self.directory,
+            'direct': self.direct,
+            'file_size_mb': self.file_size // MIB,
+            'block_size_kb': self.block_size // 1024,
+            'io_size_kb': self.io_size // 1024,
+            'sequential': {'read': seq_read, 'write': seq_write},
+            'mmap_read': mapped,
+            'random': random_results,
+        }
+
+
+def benchmark_volumes(volumes=None, progress=None, **options):
+    # One result per volume; volumes that cannot be written carry an 'error' instead of numbers
+    results = []
+    for volume in volumes if volumes is not None else mounted_volumes():
+        result = dict(volume)
+        try:
+            bench = DiskBenchmark(volume.get('path', volume['mountpoint']), **options)
+            result.update(bench.run(lambda name: progress(f"{volume['mountpoint']}: {name}") if progress else None))
+        except (OSError, ValueError) as e:
+            result['error'] = str(e)
+        results.append(result)
+    return results
+
+
+def volume_for_path(path):
+    # Used for explicit paths on the command line; the longest mountpoint prefix wins
+    path = os.path.abspath(path)
+    try:
+        volumes = mounted_volumes(include_system=True)
+    except Exception:
+        volumes = []
+    best = None
+    for volume in volumes:
+        mount = volume['mountpoint']
+        if (path == mount or path.startswith(mount.rstrip(os.sep) + os.sep)) and \
+                (best is None or len(mount) > len(best['mountpoint'])):
+            best = volume
+    if best is None:
+        return {'device': None, 'mountpoint': path, 'fstype': None, 'disk': None, 'path': path}
+    return dict(best, path=path)
+
+
+def summary_line(result):
+    if 'error' in result:
+        return f"error: {result['error']}"
+    seq = result['sequential']
+    best_read = max(result['random']['read'], key=lambda r: r['iops'])
+    best_write = max(result['random']['write'], key=lambda r: r['iops'])
+    # Buffered random writes land in the page cache and are only flushed at the end of each run
+    cached = "" if result['direct'] else " (page cache)"
+    return (f"seq R {seq['read']['mb_s']:.0f} / W {seq['write']['mb_s']:.0f} MB/s | "
+            f"4K R {best_read['iops']:,} IOPS @QD{best_read['queue_depth']} / "
+            f"W {best_write['iops']:,} IOPS @QD{best_write['queue_depth']}{cached} | "
+            f"p99 R {best_read['latency']['p99_us']:.0f} µs")
@@ -0,0 +1,156 @@
+import os
+from collections import namedtuple
+
+PROC_DISKSTATS = "/proc/diskstats"
+SYS_CLASS_BLOCK = "/sys/class/block"
+SYS_VIRTUAL_BLOCK = "/sys/devices/virtual/block"
+SECTOR = 512
+MIB = 1024 * 1024
+
+# Raw cumulative counters, normalised across /proc/diskstats and psutil
+Counters = namedtuple("Counters", "reads writes read_bytes write_bytes read_ms write_ms busy_ms queue_ms")
+# One row of the live view; rates are per second over the last sampler interval
+DiskRate = namedtuple("DiskRate", "name read_mb_s write_mb_s read_iops write_iops await_ms util queue")
+
+
+def _delta(now, before, limit):
+    # Older kernels keep some diskstats fields in 32-bit counters. A counter that went backwards is a wrap
+    # only if the step it implies is no more than `limit`, the most the device could plausibly do in one
+    # interval; otherwise the device was re-added with fresh counters and the delta is unknown
+    if now >= before:
+        return now - before
+    # Sector counts are scaled to bytes on read, so a 32-bit sector counter wraps at 2 ** 41 bytes
+    for width in (32, 41, 64):
+        if before < 2 ** width and now + 2 ** width - before <= limit:
+            return now + 2 ** width - before
+    return None
+
+
+def _sysfs_classifier():
+    cache = {}
+
+    def classify(name):
+        # 'virtual' for loop/dm/md/zram/nbd, 'partition' for sda1/nvme0n1p2, otherwise 'disk'
+        kind = cache.get(name)
+        if kind is None:
+            sys_name = name.replace("/", "!")
+            if os.path.exists(os.path.join(SYS_VIRTUAL_BLOCK, sys_name)):
+                kind = 'virtual'
+            elif os.path.exists(os.path.join(SYS_CLASS_BLOCK, sys_name, "partition")):
+                kind = 'partition'
+            else:
+                kind = 'disk'
+            cache[name] = kind
+        return kind
+
+    return classify
+
+
+def _name_classifier(name):
+    # Used where there is no sysfs (Windows reports PhysicalDriveN only)
+    if name.startswith(("loop", "ram", "zram", "dm-", "md", "nbd", "sr", "fd")):
+        return 'virtual'
+    return 'disk'
+
+
+def read_diskstats(wanted, path=PROC_DISKSTATS):
+    # -> {name: (major:minor, Counters)}; the name filter runs before any integer parsing so hundreds of
+    # loop/dm devices cost one split each
+    result = {}
+    with open(path, "rb") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            name = fields[2].decode()
+            if not wanted(name):
+                continue
+            result[name] = (fields[0] + b":" + fields[1], Counters(
+                reads=int(fields[3]),
+                writes=int(fields[7]),
+                read_bytes=int(fields[5]) * SECTOR,
+                write_bytes=int(fields[9]) * SECTOR,
+                read_ms=int(fields[6]),
+                write_ms=int(fields[10]),
+                busy_ms=int(fields[12]),
+                queue_ms=int(fields[13]),
+            ))
+    return result
+
+
+def read_psutil_disks(wanted):
+    import psutil
+    result = {}
+    counters = psutil.disk_io_counters(perdisk=True, nowrap=False) or {}
+    for name, c in counters.items():
+        if not wanted(name):
+            continue
+        # psutil has no device numbers; the name is all the identity there is
+        result[name] = (None, Counters(
+            reads=c.read_count,
+            writes=c.write_count,
+            read_bytes=c.read_bytes,
+            write_bytes=c.write_bytes,
+            read_ms=c.read_time,
+            write_ms=c.write_time,
+            busy_ms=getattr(c, 'busy_time', 0),
+            queue_ms=0,
+        ))
+    return result
+
+
+class DiskIoMonitor:
+    # Per second of interval: far above any real device (16M IOs or ms), far below a 32-bit counter's range
+    MAX_RATE = 2 ** 24
+
+    def __init__(self, include_virtual=False, include_partitions=False):
+        self.include_virtual = include_virtual
+        self.include_partitions = include_partitions
+        if os.path.exists(PROC_DISKSTATS):
+            self.classify = _sysfs_classifier()
+            self.read_counters = read_diskstats
+        else:
+            self.classify = _name_classifier
+            self.read_counters = read_psutil_disks
+        self._previous = {}
+
+    def wanted(self, name):
+        kind = self.classify(name)
+        if kind == 'virtual':
+            return self.include_virtual
+        if kind == 'partition':
+            return self.include_partitions
+        return True
+
+    def sample(self, interval):
+        # Deltas against the previous snapshot only; a device seen for the first time (hot-plug), re-added
+        # under the same name with new device numbers, or whose counters were reset produces no row until
+        # the next tick
+        current = self.read_counters(self.wanted)
+        previous, self._previous = self._previous, current
+        if interval <= 0:
+            return ()
+        limit = max(1, interval) * self.MAX_RATE
+        limits = [limit * 4096 if field.endswith("_bytes") else limit for field in Counters._fields]
+        rows = []
+        for name, (device, now) in current.items():
+            before_device, before = previous.get(name, (None, None))
+            if before is None or device != before_device:
+                continue
+            deltas = [_delta(n, b, cap) for n, b, cap in zip(now, before, limits)]
+            if None in deltas:
+                continue
+            d = Counters(*deltas)
+            ios = d.reads + d.writes
+            rows.append(DiskRate(
+                name=name,
+                read_mb_s=d.read_bytes / MIB / interval,
+                write_mb_s=d.write_bytes / MIB / interval,
+                read_iops=d.reads / interval,
+                write_iops=d.writes / interval,
+                await_ms=(d.read_ms + d.write_ms) / ios if ios else 0.0,
+                util=min(100.0, d.busy_ms / (interval * 10)),
+                queue=d.queue_ms / (interval * 1000),
+            ))
+        rows.sort(key=lambda r: r.name)
+        return tuple(rows)
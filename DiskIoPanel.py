@@ -0,0 +1,90 @@
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+from History import sparkline
+
+
+class DiskIoPanel:
+    COLUMNS = (("read", "Read MB/s", 80), ("write", "Write MB/s", 80), ("iops", "IOPS (r/w)", 110),
+               ("await", "Await ms", 70), ("util", "Util %", 60), ("queue", "Queue", 55), ("trend", "Last 60 s", 150))
+
+    def __init__(self, root, sampler, history=60):
+        self.root = root
+        self.sampler = sampler
+        self.history = history
+        self.last_seq = None
+        self.after_id = None
+        self.trends = {}
+        self.frame = ttk.LabelFrame(root, text="📀 Live Disk I/O", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill='x', pady=4)
+        monitor = sampler.disk_io
+        # Attached to a collector there is no local monitor: its filters apply to every viewer
+        state = 'normal' if monitor is not None else 'disabled'
+        self.virtual_var = tk.BooleanVar(value=monitor.include_virtual if monitor else False)
+        self.partition_var = tk.BooleanVar(value=monitor.include_partitions if monitor else False)
+        ttk.Checkbutton(controls, text="Virtual devices (loop, dm, md, zram)", variable=self.virtual_var,
+                        command=self._apply_filters, state=state).pack(side='left', padx=4)
+        ttk.Checkbutton(controls, text="Partitions", variable=self.partition_var,
+                        command=self._apply_filters, state=state).pack(side='left', padx=4)
+
+        self.tree = ttk.Treeview(self.frame, columns=[c[0] for c in self.COLUMNS], height=6)
+        self.tree.heading("#0", text="Device")
+        self.tree.column("#0", width=90, stretch=False)
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor='e' if key != "trend" else 'w', stretch=key == "trend")
+        self.tree.pack(fill='x', pady=4)
+
+        self.status_label = ttk.Label(self.frame, text="Waiting for first sample...", font=("Segoe UI", 9),
+                                      foreground="gray")
+        self.status_label.pack(anchor='w')
+        self._poll()
+
+    def _apply_filters(self):
+        # The sampler thread reads these flags on its next tick
+        self.sampler.disk_io.include_virtual = self.virtual_var.get()
+        self.sampler.disk_io.include_partitions = self.partition_var.get()
+
+    def _poll(self):
+        snap = self.sampler.latest
+        if snap is not None and snap.seq != self.last_seq:
+            self.last_seq = snap.seq
+            self.show(snap.disks)
+        self.after_id = self.root.after(int(self.sampler.interval * 1000), self._poll)
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def show(self, disks):
+        seen = set()
+        for rate in disks:
+            seen.add(rate.name)
+            trend = self.trends.get(rate.name)
+            if trend is None:
+                trend = self.trends[rate.name] = deque(maxlen=self.history)
+            trend.append(rate.read_mb_s + rate.write_mb_s)
+            values = (f"{rate.read_mb_s:.1f}", f"{rate.write_mb_s:.1f}",
+                      f"{rate.read_iops:.0f}/{rate.write_iops:.0f}", f"{rate.await_ms:.2f}",
+                      f"{rate.util:.0f}", f"{rate.queue:.2f}", sparkline(list(trend)))
+            if self.tree.exists(rate.name):
+                self.tree.item(rate.name, values=values)
+            else:
+                self.tree.insert("", "end", iid=rate.name, text=rate.name, values=values)
+
+        # Hot-unplugged or filtered-out devices disappear from the table
+        for name in list(self.trends):
+            if name not in seen:
+                del self.trends[name]
+                if self.tree.exists(name):
+                    self.tree.delete(name)
+
+        busiest = max(disks, key=lambda r: r.util, default=None)
+        if busiest is None:
+            self.status_label.config(text="No block devices match the filters.")
+        else:
+            self.status_label.config(text=f"{len(disks)} devices | busiest {busiest.name} at {busiest.util:.0f}%")
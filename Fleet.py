@@ -0,0 +1,361 @@
+import asyncio
+import random
+import socket
+import struct
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_PORT = 9102
+MAGIC = b"CPMF"
+VERSION = 1
+
+# Every message is length-prefixed; the first one on a connection is HELLO, then one frame per tick
+LENGTH = struct.Struct("<H")
+HELLO = struct.Struct("<4sBHQH")            # magic version n_cpus mem_total name_len, name follows
+KEY = struct.Struct("<BIBIh")               # type seq total mem_used_mib temp_decidegrees, n_cpus bytes follow
+DELTA = struct.Struct("<BIB")               # type seq flags, then the fields named by flags
+KEY_FRAME, DELTA_FRAME = 1, 2
+HAS_TOTAL, HAS_MEMORY, HAS_TEMPERATURE, HAS_CPUS = 1, 2, 4, 8
+NO_TEMPERATURE = -32768
+U8, U32, I16 = struct.Struct("<B"), struct.Struct("<I"), struct.Struct("<h")
+
+FleetSample = namedtuple("FleetSample", "per_thread total mem_used mem_total temperature")
+FleetHost = namedtuple("FleetHost", "name address n_cpus per_cpu total mem_used mem_total temperature "
+                                    "connected last_seen bytes_per_second")
+
+
+def quantize(percent):
+    # 0-100 % -> 0-255 so a whole CPU fits in one byte (~0.4 % steps)
+    return min(255, max(0, round(percent * 2.55)))
+
+
+def dequantize(value):
+    return value / 2.55
+
+
+def _temperature(celsius):
+    return NO_TEMPERATURE if celsius is None else max(-32767, min(32767, round(celsius * 10)))
+
+
+def hello(name, n_cpus, mem_total):
+    encoded = name.encode()[:255]
+    payload = HELLO.pack(MAGIC, VERSION, n_cpus, mem_total, len(encoded)) + encoded
+    return LENGTH.pack(len(payload)) + payload
+
+
+class FrameEncoder:
+    # Per-connection sender state: the first frame is a key frame, later ones carry only the fields
+    # and CPUs that moved past the deadband since they were last sent, so the receiver never drifts
+    def __init__(self, n_cpus, deadband=3):
+        self.n_cpus = n_cpus
+        self.deadband = deadband
+        self.sent = None
+        self.total = self.mem_used = self.temperature = None
+        self.seq = 0
+
+    def encode(self, sample):
+        self.seq += 1
+        cpus = bytes(quantize(v) for v in sample.per_thread[:self.n_cpus]).ljust(self.n_cpus, b"\0")
+        total = quantize(sample.total)
+        mem_used = min(0xFFFFFFFF, sample.mem_used >> 20)
+        temperature = _temperature(sample.temperature)
+
+        if self.sent is None:
+            self.sent = bytearray(cpus)
+            self.total, self.mem_used, self.temperature = total, mem_used, temperature
+            payload = KEY.pack(KEY_FRAME, self.seq, total, mem_used, temperature) + cpus
+            return LENGTH.pack(len(payload)) + payload
+
+        flags, body = 0, []
+        if abs(total - self.total) >= self.deadband:
+            flags |= HAS_TOTAL
+            body.append(U8.pack(total))
+            self.total = total
+        if mem_used != self.mem_used:
+            flags |= HAS_MEMORY
+            body.append(U32.pack(mem_used))
+            self.mem_used = mem_used
+        if abs(temperature - self.temperature) >= 5 or (temperature == NO_TEMPERATURE) != \
+                (self.temperature == NO_TEMPERATURE):
+            flags |= HAS_TEMPERATURE
+            body.append(I16.pack(temperature))
+            self.temperature = temperature
+        mask, values = 0, bytearray()
+        for cpu, value in enumerate(cpus):
+            if abs(value - self.sent[cpu]) >= self.deadband:
+                mask |= 1 << cpu
+                values.append(value)
+                self.sent[cpu] = value
+        if mask:
+            flags |= HAS_CPUS
+            body.append(mask.to_bytes((self.n_cpus + 7) // 8, "little"))
+            body.append(bytes(values))
+        payload = DELTA.pack(DELTA_FRAME, self.seq, flags) + b"".join(body)
+        return LENGTH.pack(len(payload)) + payload
+
+
+class HostState:
+    def __init__(self, name, address, n_cpus, mem_total):
+        self.name = name
+        self.address = address
+        self.n_cpus = n_cpus
+        self.mem_total = mem_total
+        self.per_cpu = bytearray(n_cpus)
+        self.total = 0
+        self.mem_used = 0
+        self.temperature = NO_TEMPERATURE
+        self.seq = 0
+        self.connected = True
+        self.since = time.monotonic()
+        self.last_seen = time.time()
+        self.bytes = 0
+
+    def apply(self, payload):
+        # Frames come off the network: anything short, unknown or naming CPUs this host does not have is
+        # rejected with ValueError before any field is applied
+        if not payload:
+            raise ValueError("Empty frame")
+        self.bytes += len(payload) + LENGTH.size
+        self.last_seen = time.time()
+        kind = payload[0]
+        if kind == KEY_FRAME:
+            if len(payload) < KEY.size + self.n_cpus:
+                raise ValueError(f"Key frame of {len(payload)} bytes for {self.n_cpus} CPUs")
+            _, self.seq, self.total, self.mem_used, self.temperature = KEY.unpack_from(payload)
+            self.per_cpu[:] = payload[KEY.size:KEY.size + self.n_cpus]
+            return
+        if kind != DELTA_FRAME:
+            raise ValueError(f"Unknown frame type {kind}")
+        if len(payload) < DELTA.size:
+            raise ValueError(f"Delta frame of {len(payload)} bytes")
+        _, seq, flags = DELTA.unpack_from(payload)
+        width = (self.n_cpus + 7) // 8
+        pos = DELTA.size
+        for flag, size in ((HAS_TOTAL, U8.size), (HAS_MEMORY, U32.size), (HAS_TEMPERATURE, I16.size)):
+            if flags & flag:
+                pos += size
+        mask = 0
+        if flags & HAS_CPUS:
+            mask = int.from_bytes(payload[pos:pos + width], "little")
+            if mask >> self.n_cpus:
+                raise ValueError(f"CPU mask names CPUs beyond {self.n_cpus}")
+            pos += width + bin(mask).count("1")
+        if len(payload) < pos:
+            raise ValueError(f"Delta frame of {len(payload)} bytes, flags {flags:#x} need {pos}")
+
+        self.seq = seq
+        pos = DELTA.size
+        if flags & HAS_TOTAL:
+            self.total = payload[pos]
+            pos += 1
+        if flags & HAS_MEMORY:
+            self.mem_used = U32.unpack_from(payload, pos)[0]
+            pos += 4
+        if flags & HAS_TEMPERATURE:
+            self.temperature = I16.unpack_from(payload, pos)[0]
+            pos += 2
+        if flags & HAS_CPUS:
+            pos += width
+            while mask:
+                cpu = (mask & -mask).bit_length() - 1
+                self.per_cpu[cpu] = payload[pos]
+                pos += 1
+                mask &= mask - 1
+
+    def snapshot(self):
+        elapsed = max(1e-6, time.monotonic() - self.since)
+        return FleetHost(
+            name=self.name,
+            address=self.address,
+            n_cpus=self.n_cpus,
+            per_cpu=tuple(dequantize(v) for v in self.per_cpu),
+            total=dequantize(self.total),
+            mem_used=self.mem_used << 20,
+            mem_total=self.mem_total,
+            temperature=None if self.temperature == NO_TEMPERATURE else self.temperature / 10,
+            connected=self.connected,
+            last_seen=self.last_seen,
+            bytes_per_second=self.bytes / elapsed,
+        )
+
+
+class FleetAggregator:
+    def __init__(self, host="0.0.0.0", port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.hosts = {}
+        self._loop = None
+        self._task = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    async def _handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        address = peer[0] if peer else "?"
+        state = None
+        try:
+            size = LENGTH.unpack(await reader.readexactly(LENGTH.size))[0]
+            payload = await reader.readexactly(size)
+            magic, version, n_cpus, mem_total, name_len = HELLO.unpack_from(payload)
+            if magic != MAGIC or version != VERSION:
+                return
+            name = payload[HELLO.size:HELLO.size + name_len].decode(errors="replace")
+            # A reconnecting agent replaces its previous state; its first frame is a key frame
+            state = self.hosts[name] = HostState(name, address, n_cpus, mem_total)
+            while True:
+                size = LENGTH.unpack(await reader.readexactly(LENGTH.size))[0]
+                state.apply(await reader.readexactly(size))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, IndexError, struct.error):
+            pass
+        finally:
+            if state is not None and self.hosts.get(state.name) is state:
+                state.connected = False
+            writer.close()
+
+    async def _serve(self):
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._serve())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Connection handlers are still parked in readexactly(); cancel them so sockets close cleanly
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="fleet-aggregator", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def snapshot(self):
+        # Safe to call from Tk: states are only mutated on the aggregator thread and copied here
+        return tuple(self.hosts[name].snapshot() for name in sorted(list(self.hosts)))
+
+
+class SamplerSource:
+    def __init__(self, sampler, temperature_source=None):
+        self.sampler = sampler
+        self.temperature_source = temperature_source
+        self.n_cpus = sampler.logical
+        latest = sampler.latest
+        self.mem_total = latest.memory.total if latest else 0
+
+    def __call__(self):
+        snapshot = self.sampler.latest
+        if snapshot is None:
+            return None
+        temperature = None
+        if self.temperature_source is not None:
+            try:
+                readings = self.temperature_source()
+                temperature = max(readings.values()) if readings else None
+            except Exception:
+                temperature = None
+        self.mem_total = snapshot.memory.total
+        return FleetSample(snapshot.per_thread, snapshot.total, snapshot.memory.used, snapshot.memory.total,
+                           temperature)
+
+
+class SyntheticSource:
+    # Random-walk load for exercising an aggregator with many agents on one box
+    def __init__(self, n_cpus=16, mem_total=32 << 30, seed=None):
+        self.random = random.Random(seed)
+        self.n_cpus = n_cpus
+        self.mem_total = mem_total
+        self.busy = self.random.random() * 0.5
+        self.per_thread = [self.random.random() * 30 for _ in range(n_cpus)]
+        self.mem_used = mem_total * (0.2 + self.random.random() * 0.5)
+        self.temperature = 40 + self.random.random() * 20
+
+    def __call__(self):
+        step = self.random.gauss
+        for cpu, value in enumerate(self.per_thread):
+            target = 90 if self.random.random() < self.busy else 10
+            self.per_thread[cpu] = min(100.0, max(0.0, value + (target - value) * 0.05 + step(0, 3)))
+        self.mem_used = min(self.mem_total, max(0.0, self.mem_used + step(0, self.mem_total * 0.002)))
+        total = sum(self.per_thread) / self.n_cpus
+        self.temperature = min(100.0, max(25.0, self.temperature + (35 + total * 0.5 - self.temperature) * 0.1))
+        return FleetSample(tuple(self.per_thread), total, int(self.mem_used), self.mem_total, self.temperature)
+
+
+async def run_agent(server, port, name, source, interval=1.0, deadband=3, stop=None):
+    # Streams frames until stop is set, reconnecting with backoff; a fresh connection starts with a key frame
+    stop = stop or asyncio.Event()
+    backoff = interval
+    while not stop.is_set():
+        try:
+            reader, writer = await asyncio.open_connection(server, port)
+        except OSError:
+            await asyncio.sleep(backoff)
+            backoff = min(30.0, backoff * 2)
+            continue
+        backoff = interval
+        encoder = FrameEncoder(source.n_cpus, deadband)
+        try:
+            writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            writer.write(hello(name, source.n_cpus, source.mem_total))
+            next_tick = time.monotonic()
+            while not stop.is_set():
+                sample = source()
+                if sample is not None:
+                    writer.write(encoder.encode(sample))
+                    await writer.drain()
+                next_tick += interval
+                await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+        except (ConnectionError, OSError):
+            await asyncio.sleep(backoff)
+        finally:
+            writer.close()
+
+
+async def run_agents(server, port, agents, interval=1.0, deadband=3, duration=None):
+    # agents: [(name, source)]; start times are staggered over one interval so ticks do not arrive in lockstep
+    stop = asyncio.Event()
+
+    async def staggered(name, source):
+        await asyncio.sleep(random.random() * interval)
+        await run_agent(server, port, name, source, interval, deadband, stop)
+
+    tasks = [asyncio.ensure_future(staggered(name, source)) for name, source in agents]
+    try:
+        if duration is None:
+            await asyncio.gather(*tasks)
+        else:
+            await asyncio.sleep(duration)
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,85 @@
+import tkinter as tk
+from tkinter import ttk
+from CoreHeatmap import BUCKET_COLORS, usage_bucket
+
+
+class FleetPanel:
+    # One canvas row per host, one cell per logical CPU; as in CoreHeatmap only changed buckets are redrawn
+    NAME_WIDTH = 150
+    ROW = 14
+    OFFLINE = "#9e9e9e"
+
+    def __init__(self, root, aggregator, interval=1.0, max_width=640):
+        self.root = root
+        self.aggregator = aggregator
+        self.interval = interval
+        self.max_width = max_width
+        self.after_id = None
+        self.rows = {}
+        self.frame = ttk.LabelFrame(root, text=f"🛰 Fleet Overview (port {aggregator.port})", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        self.canvas = tk.Canvas(self.frame, width=self.NAME_WIDTH + max_width + 160, height=self.ROW,
+                                bg="#fafafa", highlightthickness=0)
+        self.canvas.pack(anchor='w')
+        self.status_label = ttk.Label(self.frame, text="Waiting for agents...", font=("Segoe UI", 9),
+                                      foreground="gray")
+        self.status_label.pack(anchor='w', pady=(4, 0))
+        self._poll()
+
+    def _add_row(self, host):
+        y = len(self.rows) * self.ROW + 2
+        cell = max(2, min(10, self.max_width // max(1, host.n_cpus)))
+        name = self.canvas.create_text(2, y + self.ROW // 2 - 1, text=host.name[:22], anchor='w',
+                                       font=("Segoe UI", 8))
+        cells = [self.canvas.create_rectangle(self.NAME_WIDTH + i * cell, y, self.NAME_WIDTH + (i + 1) * cell - 1,
+                                              y + self.ROW - 3, fill=BUCKET_COLORS[0], width=0)
+                 for i in range(host.n_cpus)]
+        info = self.canvas.create_text(self.NAME_WIDTH + host.n_cpus * cell + 8, y + self.ROW // 2 - 1, text="",
+                                       anchor='w', font=("Segoe UI", 8))
+        row = {'name': name, 'cells': cells, 'buckets': [0] * host.n_cpus, 'info': info, 'connected': True,
+               'n_cpus': host.n_cpus}
+        self.rows[host.name] = row
+        self.canvas.config(height=len(self.rows) * self.ROW + 4)
+        return row
+
+    def _poll(self):
+        hosts = self.aggregator.snapshot()
+        online = cpus = 0
+        bandwidth = 0.0
+        for host in hosts:
+            row = self.rows.get(host.name)
+            if row is None or row['n_cpus'] != host.n_cpus:
+                if row is not None:
+                    self.canvas.delete(row['name'], row['info'], *row['cells'])
+                    del self.rows[host.name]
+                row = self._add_row(host)
+            self._update_row(row, host)
+            if host.connected:
+                online += 1
+                cpus += host.n_cpus
+                bandwidth += host.bytes_per_second
+        if hosts:
+            self.status_label.config(text=f"{online}/{len(hosts)} hosts online | {cpus} logical CPUs | "
+                                          f"{bandwidth / max(1, online):.0f} B/s per host")
+        self.after_id = self.root.after(int(self.interval * 1000), self._poll)
+
+    def _update_row(self, row, host):
+        if host.connected != row['connected']:
+            row['connected'] = host.connected
+            self.canvas.itemconfig(row['name'], fill="black" if host.connected else self.OFFLINE)
+            # Force a redraw so an offline host shows grey cells, and its real colours when it returns
+            row['buckets'] = [-1] * row['n_cpus']
+        for cpu, value in enumerate(host.per_cpu):
+            bucket = usage_bucket(value) if host.connected else -2
+            if bucket != row['buckets'][cpu]:
+                row['buckets'][cpu] = bucket
+                self.canvas.itemconfig(row['cells'][cpu], fill=BUCKET_COLORS[bucket] if bucket >= 0 else self.OFFLINE)
+        memory = f"{host.mem_used / host.mem_total * 100:.0f}% mem" if host.mem_total else "? mem"
+        temperature = f" | {host.temperature:.0f} °C" if host.temperature is not None else ""
+        self.canvas.itemconfig(row['info'], text=f"{host.total:.0f}% cpu | {memory}{temperature}")
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
@@ -0,0 +1,220 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cpu_monitor", "history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    hostname TEXT,
+    cpu TEXT,
+    physical_cores INTEGER,
+    logical_cpus INTEGER,
+    ram_modules TEXT,
+    board TEXT,
+    first_seen REAL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    host_id INTEGER NOT NULL REFERENCES hosts(id),
+    ts REAL NOT NULL,
+    mode TEXT,
+    workers INTEGER,
+    composite_single REAL,
+    composite_multi REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    host_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    workload TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    score REAL NOT NULL,
+    stdev REAL,
+    ci_low REAL,
+    ci_high REAL,
+    unstable INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_host_ts ON runs(host_id, ts);
+CREATE INDEX IF NOT EXISTS idx_results_host_workload_ts ON results(host_id, workload, kind, ts);
+CREATE INDEX IF NOT EXISTS idx_results_workload_ts ON results(workload, kind, ts);
+CREATE INDEX IF NOT EXISTS idx_results_host_workload_score ON results(host_id, workload, kind, score);
+"""
+
+
+class BenchmarkHistory:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # The GUI records from the benchmark thread, so the connection is shared under a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._host_ids = {}
+
+    def close(self):
+        self.conn.close()
+
+    def _host_id(self, host):
+        fingerprint = host.get('fingerprint') or host.get('hostname') or 'unknown'
+        if fingerprint in self._host_ids:
+            return self._host_ids[fingerprint]
+        row = self.conn.execute("SELECT id FROM hosts WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row:
+            host_id = row[0]
+        else:
+            host_id = self.conn.execute(
+                "INSERT INTO hosts (fingerprint, hostname, cpu, physical_cores, logical_cpus, ram_modules, board, "
+                "first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (fingerprint, host.get('hostname'), host.get('cpu'), host.get('physical_cores'),
+                 host.get('logical_cpus'), json.dumps(host.get('ram_modules', [])), host.get('board'),
+                 time.time())).lastrowid
+        self._host_ids[fingerprint] = host_id
+        return host_id
+
+    def _insert_report(self, report):
+        host_id = self._host_id(report.get('host', {}))
+        ts = report.get('epoch') or time.time()
+        config = report.get('config', {})
+        composite = report.get('composite', {})
+        run_id = self.conn.execute(
+            "INSERT INTO runs (host_id, ts, mode, workers, composite_single, composite_multi) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (host_id, ts, config.get('mode'), config.get('workers'),
+             composite.get('single'), composite.get('multi'))).lastrowid
+
+        rows = []
+        for workload, runs in report.get('workloads', {}).items():
+            for kind, r in runs.items():
+                ci = r.get('ci95') or (None, None)
+                rows.append((run_id, host_id, ts, workload, kind, r['score'], r.get('stdev'),
+                             ci[0], ci[1], int(bool(r.get('unstable')))))
+        for kind, score in composite.items():
+            rows.append((run_id, host_id, ts, 'composite', kind, score, None, None, None, 0))
+        self.conn.executemany(
+            "INSERT INTO results (run_id, host_id, ts, workload, kind, score, stdev, ci_low, ci_high, unstable) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return run_id
+
+    def record(self, report):
+        with self._lock, self.conn:
+            return self._insert_report(report)
+
+    def import_reports(self, reports, batch_size=1000):
+        # Fleet imports: one transaction per batch keeps inserts at tens of thousands of rows per second
+        count = 0
+        batch = []
+        for report in reports:
+            batch.append(report)
+            if len(batch) >= batch_size:
+                count += self._import_batch(batch)
+                batch = []
+        if batch:
+            count += self._import_batch(batch)
+        return count
+
+    def _import_batch(self, batch):
+        with self._lock, self.conn:
+            for report in batch:
+                self._insert_report(report)
+        return len(batch)
+
+    def hosts(self):
+        with self._lock:
+            return [dict(r) for r in self.conn.execute(
+                "SELECT id, fingerprint, hostname, cpu, physical_cores, logical_cpus, board FROM hosts ORDER BY id")]
+
+    def find_host(self, key):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id FROM hosts WHERE fingerprint = ? OR hostname = ? ORDER BY id DESC LIMIT 1",
+                (key, key)).fetchone()
+        return row[0] if row else None
+
+    def query(self, host_id=None, workload=None, kind=None, since=None, until=None, limit=None):
+        clauses, params = [], []
+        for column, value in (('host_id', host_id), ('workload', workload), ('kind', kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        sql = "SELECT host_id, ts, workload, kind, score, stdev, ci_low, ci_high, unstable FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY ts"
+        if limit:
+            sql = f"SELECT * FROM ({sql} DESC LIMIT {int(limit)}) ORDER BY ts"
+        with self._lock:
+            return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def latest_run(self, host_id):
+        with self._lock:
+            run = self.conn.execute(
+                "SELECT id, ts FROM runs WHERE host_id = ? ORDER BY ts DESC LIMIT 1", (host_id,)).fetchone()
+            if run is None:
+                return None
+            rows = self.conn.execute("SELECT workload, kind, score FROM results WHERE run_id = ?", (run['id'],))
+            return {'ts': run['ts'], 'scores': {f"{r['workload']}.{r['kind']}": r['score'] for r in rows}}
+
+    def summary(self, host_id, workload, kind, before=None):
+        # Best and median of previous runs, answered from the (host, workload, kind, score) index
+        where = "host_id = ? AND workload = ? AND kind = ?"
+        params = [host_id, workload, kind]
+        if before is not None:
+            where += " AND ts < ?"
+            params.append(before)
+        with self._lock:
+            count, best = self.conn.execute(
+                f"SELECT COUNT(*), MAX(score) FROM results WHERE {where}", params).fetchone()
+            if not count:
+                return {'count': 0, 'best': None, 'median': None}
+            median = self.conn.execute(
+                f"SELECT score FROM results WHERE {where} ORDER BY score LIMIT 1 OFFSET ?",
+                params + [(count - 1) // 2]).fetchone()[0]
+        return {'count': count, 'best': best, 'median': median}
+
+    def compare(self, host_id, workload, kind, score, before=None):
+        summary = self.summary(host_id, workload, kind, before)
+        for key in ('best', 'median'):
+            reference = summary[key]
+            summary[f'vs_{key}'] = round((score - reference) / reference, 4) if reference else None
+        summary['score'] = score
+        return summary
+
+    def compare_report(self, report):
+        host_id = self.find_host(report['host'].get('fingerprint'))
+        if host_id is None:
+            return {}
+        before = report.get('epoch')
+        comparisons = {}
+        for workload, runs in report.get('workloads', {}).items():
+            for kind, r in runs.items():
+                comparisons[f"{workload}.{kind}"] = self.compare(host_id, workload, kind, r['score'], before)
+        for kind, score in report.get('composite', {}).items():
+            comparisons[f"composite.{kind}"] = self.compare(host_id, 'composite', kind, score, before)
+        return comparisons
+
+
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values):
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return "".join(SPARK[int((v - low) / span * (len(SPARK) - 1))] for v in values)
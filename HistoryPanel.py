@@ -0,0 +1,102 @@
+import threading
+import time
+from datetime import datetime
+from tkinter import ttk
+from Report import host_info
+from Workloads import available_workloads
+from UiQueue import shared_ui_queue
+
+
+class HistoryPanel:
+    RANGES = {"All": None, "24 h": 86400, "7 days": 7 * 86400, "30 days": 30 * 86400}
+
+    def __init__(self, root, history):
+        self.root = root
+        self.ui = shared_ui_queue(root)
+        self.history = history
+        self.frame = ttk.LabelFrame(root, text="📈 Benchmark History", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill='x', pady=4)
+
+        self.workload_var = ttk.Combobox(controls, state="readonly", width=16,
+                                         values=["composite"] + [w.name for w in available_workloads()])
+        self.workload_var.set("composite")
+        self.workload_var.pack(side='left', padx=4)
+
+        self.kind_var = ttk.Combobox(controls, state="readonly", width=8, values=["single", "multi"])
+        self.kind_var.set("multi")
+        self.kind_var.pack(side='left', padx=4)
+
+        self.range_var = ttk.Combobox(controls, state="readonly", width=8, values=list(self.RANGES))
+        self.range_var.set("30 days")
+        self.range_var.pack(side='left', padx=4)
+
+        for combo in (self.workload_var, self.kind_var, self.range_var):
+            combo.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+
+        self.refresh_btn = ttk.Button(controls, text="🔄 Refresh", command=self.refresh)
+        self.refresh_btn.pack(side='left', padx=8)
+
+        # matplotlib is imported on first use so it stays off the startup path
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig, self.ax = plt.subplots(figsize=(6, 2.6))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
+        self.canvas.get_tk_widget().pack(pady=6)
+
+        self.summary_label = ttk.Label(self.frame, text="", font=("Segoe UI", 10))
+        self.summary_label.pack(pady=4)
+
+        self.refresh()
+
+    def refresh(self):
+        # Host fingerprinting and SQLite reads happen off the Tk thread
+        workload, kind = self.workload_var.get(), self.kind_var.get()
+        span = self.RANGES[self.range_var.get()]
+        self.summary_label.config(text="Loading...", foreground="gray")
+
+        def task():
+            try:
+                host_id = self.history.find_host(host_info()['fingerprint'])
+                rows, comparison = [], None
+                if host_id is not None:
+                    rows = self.history.query(host_id=host_id, workload=workload, kind=kind,
+                                              since=time.time() - span if span else None)
+                if rows:
+                    latest = rows[-1]
+                    comparison = self.history.compare(host_id, workload, kind, latest['score'], before=latest['ts'])
+                self.ui.call(self.show, workload, kind, rows, comparison, None)
+            except Exception as e:
+                self.ui.call(self.show, workload, kind, [], None, e)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def show(self, workload, kind, rows, comparison, error):
+        self.ax.clear()
+        if error:
+            self.summary_label.config(text=f"Error reading history: {error}", foreground="red")
+        elif not rows:
+            self.summary_label.config(text="No stored runs yet.", foreground="gray")
+        else:
+            times = [datetime.fromtimestamp(r['ts']) for r in rows]
+            scores = [r['score'] for r in rows]
+            self.ax.plot(times, scores, marker='o', color='#2196f3', label='Score')
+            latest = rows[-1]
+            if comparison['count']:
+                self.ax.axhline(comparison['best'], color='#4caf50', linestyle='--', label='Best')
+                self.ax.axhline(comparison['median'], color='#ff9800', linestyle=':', label='Median')
+                self.summary_label.config(
+                    text=f"Latest {latest['score']:.1f} | vs best {comparison['vs_best']:+.1%}"
+                         f" | vs median {comparison['vs_median']:+.1%}",
+                    foreground="#DC143C" if comparison['vs_median'] < 0 else "#228B22")
+            else:
+                self.summary_label.config(text=f"Latest {latest['score']:.1f} (first run)", foreground="black")
+            self.ax.legend(loc='lower left', fontsize=8)
+            self.fig.autofmt_xdate()
+        self.ax.set_title(f"{workload} ({kind})", fontsize=11, fontweight='bold')
+        self.ax.tick_params(axis='both', which='major', labelsize=8)
+        self.fig.tight_layout()
+        self.canvas.draw()
@@ -0,0 +1,306 @@
+import json
+import os
+import platform
+import struct
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SYS_DMI = "/sys/class/dmi/id"
+SYS_DMI_ENTRIES = "/sys/firmware/dmi/entries"
+SYS_BLOCK = "/sys/block"
+SYS_NVME = "/sys/class/nvme"
+
+
+def _read(path, default=None):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+class WmiBackend:
+    name = "wmi"
+
+    def _wmi(self):
+        # Each pool thread needs its own COM apartment before WMI can be used
+        import pythoncom
+        import wmi
+        pythoncom.CoInitialize()
+        return wmi.WMI()
+
+    def board(self):
+        boards = self._wmi().Win32_BaseBoard()
+        if not boards:
+            return None
+        board = boards[0]
+        return {
+            'manufacturer': board.Manufacturer,
+            'product': board.Product,
+            'version': board.Version,
+            'serial': board.SerialNumber,
+        }
+
+    def memory_modules(self):
+        modules = []
+        for mem in self._wmi().Win32_PhysicalMemory():
+            modules.append({
+                'manufacturer': mem.Manufacturer or "Unknown",
+                'speed': mem.Speed or "Unknown",
+                'capacity_gb': int(mem.Capacity) // (1024**3) if mem.Capacity else "Unknown",
+                'part_number': mem.PartNumber.strip() if mem.PartNumber else "Unknown",
+                'serial_number': mem.SerialNumber.strip() if mem.SerialNumber else "Unknown",
+                'locator': mem.DeviceLocator or "",
+                'bank_locator': mem.BankLabel or "",
+            })
+        return modules
+
+    def _disk_types(self):
+        disk_types = {}
+        try:
+            cmd = ['powershell', '-Command',
+                   "Get-PhysicalDisk | Select-Object FriendlyName, MediaType | ConvertTo-Json"]
+            output = subprocess.check_output(cmd, text=True)
+            disks = json.loads(output)
+            if isinstance(disks, dict):
+                disks = [disks]
+
+            for disk in disks:
+                name = disk.get("FriendlyName", "").strip()
+                media = disk.get("MediaType", "Unknown")
+                disk_types[name] = media
+        except Exception:
+            pass
+        return disk_types
+
+    def disks(self):
+        disk_types = self._disk_types()
+        result = []
+        for disk in self._wmi().Win32_DiskDrive():
+            model = disk.Model.strip() if disk.Model else 'N/A'
+            disk_type = "Unknown"
+            for friendly_name, media in disk_types.items():
+                if friendly_name.lower() in model.lower():
+                    disk_type = media
+                    break
+            result.append({
+                'name': disk.DeviceID,
+                'model': model,
+                'serial': disk.SerialNumber.strip() if disk.SerialNumber else 'N/A',
+                'interface': disk.InterfaceType if hasattr(disk, 'InterfaceType') else 'N/A',
+                'size_gb': int(disk.Size) // (1024**3) if disk.Size else "Unknown",
+                'media_type': disk.MediaType if hasattr(disk, 'MediaType') else 'N/A',
+                'disk_type': disk_type,
+            })
+        return result
+
+    def signature(self, provider):
+        return None
+
+
+def _smbios_strings(raw, length):
+    strings = raw[length:].split(b"\0")
+    return [s.decode("ascii", "replace").strip() for s in strings]
+
+
+def parse_smbios_memory_device(raw):
+    # SMBIOS type 17 (Memory Device); field offsets from the DMTF SMBIOS spec
+    length = raw[1]
+    strings = _smbios_strings(raw, length)
+
+    def string(offset):
+        if offset >= length or raw[offset] == 0 or raw[offset] > len(strings):
+            return ""
+        return strings[raw[offset] - 1]
+
+    def word(offset):
+        return struct.unpack_from("<H", raw, offset)[0] if offset + 2 <= length else 0
+
+    size = word(0x0C)
+    if size in (0, 0xFFFF):
+        return None
+    if size == 0x7FFF and length >= 0x20:
+        size_mb = struct.unpack_from("<I", raw, 0x1C)[0]
+    elif size & 0x8000:
+        size_mb = (size & 0x7FFF) / 1024
+    else:
+        size_mb = size
+    speed = word(0x15)
+    configured = word(0x20)
+    return {
+        'manufacturer': string(0x17) or "Unknown",
+        'speed': configured or speed or "Unknown",
+        'rated_speed': speed or "Unknown",
+        'capacity_gb': int(size_mb // 1024) if size_mb >= 1024 else round(size_mb / 1024, 2),
+        'part_number': string(0x1A) or "Unknown",
+        'serial_number': string(0x18) or "Unknown",
+        'locator': string(0x10),
+        'bank_locator': string(0x11),
+    }
+
+
+class LinuxBackend:
+    name = "linux"
+
+    def board(self):
+        fields = {'manufacturer': "board_vendor", 'product': "board_name",
+                  'version': "board_version", 'serial': "board_serial"}
+        board = {key: _read(os.path.join(SYS_DMI, name)) for key, name in fields.items()}
+        if not any(board.values()):
+            return None
+        # board_serial is root-only on most distributions
+        board['serial'] = board['serial'] or "N/A (requires root)"
+        return board
+
+    def memory_modules(self):
+        # SMBIOS type 17 entries are root-readable only; unprivileged runs get an empty list
+        modules = []
+        try:
+            entries = sorted(e for e in os.listdir(SYS_DMI_ENTRIES) if e.startswith("17-"))
+        except OSError:
+            return modules
+        for entry in entries:
+            try:
+                with open(os.path.join(SYS_DMI_ENTRIES, entry, "raw"), "rb") as f:
+                    module = parse_smbios_memory_device(f.read())
+            except (OSError, struct.error, IndexError):
+                continue
+            if module:
+                modules.append(module)
+        return modules
+
+    def _is_physical(self, name):
+        return not name.startswith(("loop", "ram", "zram", "dm-", "md", "sr", "fd")) and \
+            os.path.exists(os.path.join(SYS_BLOCK, name, "device"))
+
+    def disks(self):
+        result = []
+        for name in sorted(os.listdir(SYS_BLOCK)):
+            if not self._is_physical(name):
+                continue
+            base = os.path.join(SYS_BLOCK, name)
+            sectors = int(_read(os.path.join(base, "size"), "0") or 0)
+            rotational = _read(os.path.join(base, "queue", "rotational"))
+            serial = _read(os.path.join(base, "device", "serial"))
+            if name.startswith("nvme"):
+                interface = "NVMe"
+                # nvme0n1 -> controller nvme0
+                controller = "nvme" + name[4:].split("n")[0]
+                serial = serial or _read(os.path.join(SYS_NVME, controller, "serial"))
+            elif name.startswith("vd"):
+                interface = "virtio"
+            elif name.startswith("mmcblk"):
+                interface = "MMC"
+            else:
+                interface = "SCSI/SATA"
+            result.append({
+                'name': f"/dev/{name}",
+                'model': _read(os.path.join(base, "device", "model")) or 'N/A',
+                'serial': serial or 'N/A',
+                'interface': interface,
+                'size_gb': sectors * 512 // (1024**3),
+                'media_type': "Removable" if _read(os.path.join(base, "removable")) == "1" else "Fixed",
+                'disk_type': "HDD" if rotational == "1" else "SSD" if rotational == "0" else "Unknown",
+            })
+        return result
+
+    def signature(self, provider):
+        # Cheap change detection: re-query disks only when the set of block devices changes
+        if provider == "disks":
+            try:
+                return tuple(sorted(os.listdir(SYS_BLOCK)))
+            except OSError:
+                return None
+        return None
+
+
+def default_backend():
+    if platform.system() == "Windows":
+        return WmiBackend()
+    return LinuxBackend()
+
+
+class Inventory:
+    PROVIDERS = ("board", "memory_modules", "disks")
+
+    def __init__(self, backend=None, ttl=300.0, max_workers=4):
+        self.backend = backend or default_backend()
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inventory")
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._pending = {}
+
+    def _fresh(self, provider):
+        entry = self._cache.get(provider)
+        if entry is None:
+            return None
+        value, fetched_at, signature = entry
+        if time.monotonic() - fetched_at > self.ttl:
+            return None
+        if signature is not None and signature != self.backend.signature(provider):
+            return None
+        return entry
+
+    def get(self, provider, callback=None):
+        # Returns the Future; callback(value, error) runs on a pool thread once the value is known
+        with self._lock:
+            entry = self._fresh(provider)
+            if entry is None:
+                future = self._pending.get(provider)
+                if future is None:
+                    future = self._pool.submit(self._fetch, provider)
+                    self._pending[provider] = future
+            else:
+                future = self._pool.submit(lambda: entry[0])
+        if callback:
+            future.add_done_callback(lambda f: callback(*self._outcome(f)))
+        return future
+
+    @staticmethod
+    def _outcome(future):
+        error = future.exception()
+        return (None, error) if error else (future.result(), None)
+
+    def get_sync(self, provider, timeout=None):
+        return self.get(provider).result(timeout)
+
+    def _fetch(self, provider):
+        try:
+            value = getattr(self.backend, provider)()
+            with self._lock:
+                self._cache[provider] = (value, time.monotonic(), self.backend.signature(provider))
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(provider, None)
+
+    def invalidate(self, provider=None):
+        with self._lock:
+            if provider is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(provider, None)
+
+    def refresh(self, provider, callback=None):
+        self.invalidate(provider)
+        return self.get(provider, callback)
+
+    def prefetch(self):
+        # Queries every provider concurrently; panels that ask later get the cached answer
+        return [self.get(provider) for provider in self.PROVIDERS if hasattr(self.backend, provider)]
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_shared = None
+
+
+def shared_inventory():
+    global _shared
+    if _shared is None:
+        _shared = Inventory()
+    return _shared
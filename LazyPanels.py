@@ -0,0 +1,51 @@
+from tkinter import ttk
+
+
+class LazyPanels:
+    def __init__(self, canvas, container, margin=200):
+        # Panels below the fold are built only when their placeholder scrolls within `margin` px of view
+        self.canvas = canvas
+        self.container = container
+        self.margin = margin
+        self.pending = []
+        self.built = {}
+        self._scheduled = False
+        canvas.bind("<Configure>", lambda e: self.schedule(), add="+")
+
+    def add(self, name, factory, height=240):
+        placeholder = ttk.Frame(self.container, height=height)
+        placeholder.pack(fill='x')
+        placeholder.pack_propagate(False)
+        label = ttk.Label(placeholder, text="Loading...", font=("Segoe UI", 10, "italic"), foreground="gray")
+        label.pack(pady=20)
+        self.pending.append((name, placeholder, label, factory))
+        self.schedule()
+
+    def schedule(self):
+        if not self._scheduled and self.pending:
+            self._scheduled = True
+            self.canvas.after_idle(self.build_visible)
+
+    def build_visible(self):
+        self._scheduled = False
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height() + self.margin
+        for entry in list(self.pending):
+            name, placeholder, label, factory = entry
+            if placeholder.winfo_y() > bottom:
+                continue
+            self.pending.remove(entry)
+            label.destroy()
+            placeholder.pack_propagate(True)
+            placeholder.config(height=0)
+            self.built[name] = factory(placeholder)
+
+    def build_all(self):
+        for name, placeholder, label, factory in self.pending:
+            label.destroy()
+            placeholder.pack_propagate(True)
+            self.built[name] = factory(placeholder)
+        self.pending = []
+
+    def get(self, name):
+        return self.built.get(name)
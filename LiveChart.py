@@ -1,14 +1,27 @@
+import time
 import tkinter as tk
 from tkinter import ttk
-import psutil
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from ChartRenderers import MatplotlibRenderer, TkCanvasRenderer
+from TimeSeries import TimeSeriesStore
+from Sampler import shared_sampler
+from CoreHeatmap import CoreHeatmap
 
 class LiveChart:
-    def __init__(self, root):
+    RENDERERS = ("blit", "full", "tk")
+    # Zoom label -> (rollup resolution in seconds, points shown)
+    ZOOMS = {"1 min": (1, 60), "1 h": (10, 360), "24 h": (600, 144)}
+
+    def __init__(self, root, renderer="blit", debug=False, sampler=None, heatmap_threshold=32):
+        if renderer not in self.RENDERERS:
+            raise ValueError(f"Unknown chart renderer: {renderer}")
         self.root = root
         self.max_points = 60
-        self.cpu_data = [0] * self.max_points
+        self.zoom = "1 min"
+        self.debug = debug
+        self.render_times = []
+        self.sampler = sampler or shared_sampler()
+        self.last_seq = None
+        self.last_ts = None
 
         # Style
         style = ttk.Style()
@@ -16,19 +29,29 @@ class LiveChart:
         style.configure("green.Horizontal.TProgressbar", foreground='#4caf50', background='#4caf50', thickness=20)
         style.configure("CoreAvg.Horizontal.TProgressbar", foreground='#2196f3', background='#2196f3', thickness=22)
 
+        # Column 0 is total usage, columns 1.. are logical CPUs
+        self.series = TimeSeriesStore(1 + self.sampler.logical)
+
+        zoom_frame = ttk.Frame(root)
+        zoom_frame.pack(pady=(10, 0))
+        ttk.Label(zoom_frame, text="History:", font=("Segoe UI", 10)).pack(side='left', padx=4)
+        self.zoom_box = ttk.Combobox(zoom_frame, state="readonly", width=8, values=list(self.ZOOMS))
+        self.zoom_box.set(self.zoom)
+        self.zoom_box.bind("<<ComboboxSelected>>", lambda e: self.set_zoom(self.zoom_box.get()))
+        self.zoom_box.pack(side='left')
+
         # CPU usage graph
-        self.fig, self.ax = plt.subplots(figsize=(6, 3))
-        self.line1, = self.ax.plot(range(self.max_points), self.cpu_data, label='Total CPU Usage', color='#2196f3')
-        self.ax.set_ylim(0, 100)
-        self.ax.set_xlim(0, self.max_points - 1)
-        self.ax.set_title('CPU Usage Over Time', fontsize=14, fontweight='bold')
-        self.ax.set_ylabel('%', fontsize=12)
-        self.ax.tick_params(axis='both', which='major', labelsize=10)
-        self.ax.legend(loc='upper right', fontsize=10)
-        self.fig.tight_layout()
-
-        self.canvas = FigureCanvasTkAgg(self.fig, master=root)
-        self.canvas.get_tk_widget().pack(pady=10)
+        if renderer == "tk":
+            self.renderer = TkCanvasRenderer(root, self.max_points)
+        else:
+            self.renderer = MatplotlibRenderer(root, self.max_points, blit=(renderer == "blit"))
+        self.renderer.widget.pack(pady=10)
+
+        self.debug_label = None
+        if debug:
+            self.debug_label = tk.Label(self.renderer.widget, text="", bg="#212121", fg="#76ff03",
+                                        font=("Consolas", 9))
+            self.debug_label.place(relx=0.0, rely=0.0, x=4, y=4, anchor='nw')
 
         self.usage_label = ttk.Label(root, text="Total CPU Usage: 0.0 %", font=("Segoe UI", 12, "bold"), foreground='#2196f3')
         self.usage_label.pack(pady=5)
@@ -41,10 +64,21 @@ class LiveChart:
         self.thread_bars = []
         self.thread_labels = []
 
-        self.physical = psutil.cpu_count(logical=False)
-        self.logical = psutil.cpu_count(logical=True)
-        self.threads_per_core = self.logical // self.physical if self.physical else 1
+        self.core_groups = self.sampler.core_groups
+        self.physical = len(self.core_groups)
+        self.logical = self.sampler.logical
+
+        # Per-core bars do not scale past a few dozen threads; big machines get the one-canvas heatmap
+        self.heatmap = None
+        if self.logical > heatmap_threshold:
+            self.heatmap = CoreHeatmap(self.core_frame, self.core_groups)
+        else:
+            self._build_bars()
+
+        self.after_id = None
+        self.update_chart()
 
+    def _build_bars(self):
         core_colors = ['#bbdefb', '#c8e6c9']
 
         for core_idx in range(self.physical):
@@ -52,7 +86,7 @@ class LiveChart:
             frame_core = tk.Frame(self.core_frame, bg=bg_color, bd=2, relief='groove')
             frame_core.pack(fill='x', pady=6, padx=8)
 
-            label_core = tk.Label(frame_core, text=f"🖥️ Core {core_idx + 1}", bg=bg_color, font=("Segoe UI", 14, "bold"))
+            label_core = tk.Label(frame_core, text=f"🖥️ {self.sampler.topology.core_label(core_idx)}", bg=bg_color, font=("Segoe UI", 14, "bold"))
             label_core.pack(anchor='w', padx=8, pady=4)
 
             avg_frame = tk.Frame(frame_core, bg=bg_color)
@@ -72,7 +106,7 @@ class LiveChart:
 
             thread_bar_list = []
             thread_label_list = []
-            for thread_idx in range(self.threads_per_core):
+            for thread_idx in range(len(self.core_groups[core_idx])):
                 thread_frame = tk.Frame(frame_core, bg=bg_color)
                 thread_frame.pack(fill='x', pady=2, padx=24)
 
@@ -91,29 +125,45 @@ class LiveChart:
             self.thread_bars.append(thread_bar_list)
             self.thread_labels.append(thread_label_list)
 
-        psutil.cpu_percent(interval=None)  # initialize stats
-        self.after_id = None
-        self.update_chart()
-
     def update_chart(self):
-        total = psutil.cpu_percent(interval=None)
-        per_thread = psutil.cpu_percent(percpu=True)
-
-        self.cpu_data.append(total)
-        if len(self.cpu_data) > self.max_points:
-            self.cpu_data.pop(0)
-
-        self.line1.set_data(range(len(self.cpu_data)), self.cpu_data)
-        self.ax.set_xlim(0, self.max_points - 1)
-        self.canvas.draw()
+        # The sampler thread does the reading; the UI thread only picks up its newest snapshot
+        catch_up = getattr(self.sampler, "snapshots_since", None)
+        if catch_up is not None:
+            # Replay at speed: every recorded row goes into the series and rollups, only the newest is drawn
+            snaps = [snap for snap in catch_up(self.last_ts) if len(snap.per_thread) == self.logical]
+            for snap in snaps[:-1]:
+                self.append_snapshot(snap)
+            if snaps:
+                self.last_seq = snaps[-1].seq
+                self.show_snapshot(snaps[-1])
+        else:
+            snap = self.sampler.latest
+            if snap is not None and snap.seq != self.last_seq and len(snap.per_thread) == self.logical:
+                self.last_seq = snap.seq
+                self.show_snapshot(snap)
+        self.after_id = self.root.after(int(self.sampler.interval * 1000), self.update_chart)
+
+    def append_snapshot(self, snap):
+        if self.last_ts is not None and snap.ts < self.last_ts:
+            # Replay seeked backwards: rollups assume time only moves forward
+            self.series = TimeSeriesStore(1 + self.logical)
+        self.last_ts = snap.ts
+        self.series.append((snap.total,) + snap.per_thread, ts=snap.ts)
+
+    def show_snapshot(self, snap):
+        total, per_thread = snap.total, snap.per_thread
+        self.append_snapshot(snap)
+        self.redraw()
         self.usage_label.config(text=f"Total CPU Usage: {total:.1f} %")
 
-        for core_idx in range(self.physical):
-            start_idx = core_idx * self.threads_per_core
-            end_idx = start_idx + self.threads_per_core
-            thread_usages = per_thread[start_idx:end_idx]
+        if self.heatmap is not None:
+            self.heatmap.update(per_thread)
+            return
+
+        for core_idx, group in enumerate(self.core_groups):
+            thread_usages = [per_thread[i] for i in group]
 
-            avg_usage = sum(thread_usages) / len(thread_usages)
+            avg_usage = snap.per_core[core_idx]
             self.core_avg_bars[core_idx].config(value=avg_usage)
             self.core_avg_labels[core_idx].config(text=f"{avg_usage:.1f}%")
 
@@ -121,7 +171,34 @@ class LiveChart:
                 self.thread_bars[core_idx][thread_idx].config(value=usage)
                 self.thread_labels[core_idx][thread_idx].config(text=f"{usage:.1f}%")
 
-        self.after_id = self.root.after(1000, self.update_chart)
+    def set_zoom(self, zoom):
+        self.zoom = zoom
+        resolution, self.max_points = self.ZOOMS[zoom]
+        if resolution == 1:
+            xlabel = ""
+        elif resolution < 60:
+            xlabel = f"{resolution} s averages"
+        else:
+            xlabel = f"{resolution // 60} min averages"
+        self.renderer.set_view(self.max_points, xlabel)
+        self.redraw()
+
+    def redraw(self):
+        resolution, points = self.ZOOMS[self.zoom]
+        values = self.series.window(resolution, 0, points)
+        start = time.perf_counter()
+        self.renderer.update(values)
+        self._record_render_time(time.perf_counter() - start)
+
+    def _record_render_time(self, seconds):
+        if not self.debug:
+            return
+        self.render_times.append(seconds * 1000)
+        if len(self.render_times) > 30:
+            del self.render_times[0]
+        avg = sum(self.render_times) / len(self.render_times)
+        self.debug_label.config(text=f"render {self.render_times[-1]:.2f} ms | avg {avg:.2f} ms | "
+                                     f"max {max(self.render_times):.2f} ms")
 
     def stop(self):
         if self.after_id:
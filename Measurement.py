@@ -0,0 +1,122 @@
+import math
+import statistics
+import time
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+    10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110,
+    18: 2.101, 19: 2.093, 20: 2.086, 25: 2.060, 30: 2.042,
+}
+
+
+def t_critical(df):
+    if df <= 0:
+        return float('inf')
+    if df in _T95:
+        return _T95[df]
+    if df > 30:
+        return 1.960
+    return _T95[min(k for k in _T95 if k >= df)]
+
+
+def reject_outliers(samples, k=1.5):
+    # Tukey fences on the interquartile range; keep everything for tiny samples
+    if len(samples) < 4:
+        return list(samples), []
+    q1, _, q3 = statistics.quantiles(samples, n=4)
+    iqr = q3 - q1
+    low, high = q1 - k * iqr, q3 + k * iqr
+    kept = [s for s in samples if low <= s <= high]
+    rejected = [s for s in samples if s < low or s > high]
+    return kept, rejected
+
+
+def median_ci(samples, confidence=0.95):
+    # Distribution-free interval for the median from order statistics: drop the j lowest and highest samples
+    # while the binomial(n, 1/2) tail stays within (1 - confidence) / 2. Below six samples no pair of ranks
+    # reaches 95% and the full range is the best available
+    ordered = sorted(samples)
+    n = len(ordered)
+    alpha = (1 - confidence) / 2
+    j, tail = 0, 0.0
+    while tail + math.comb(n, j) / 2 ** n <= alpha:
+        tail += math.comb(n, j) / 2 ** n
+        j += 1
+    j = max(j, 1)
+    return ordered[j - 1], ordered[n - j]
+
+
+def summarize(samples, unstable_threshold=0.05, outlier_k=1.5):
+    if not samples:
+        raise ValueError("summarize needs at least one sample")
+    kept, rejected = reject_outliers(samples, outlier_k)
+    n = len(kept)
+    median = statistics.median(kept)
+    mean = statistics.fmean(kept)
+    stdev = statistics.stdev(kept) if n > 1 else 0.0
+    cv = stdev / mean if mean else 0.0
+    # The score is the median, so the interval is the median's too; t_critical is still used for the mean
+    low, high = median_ci(kept)
+    half_width = max(median - low, high - median)
+    mean_half_width = t_critical(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        'median': median,
+        'mean': mean,
+        'stdev': stdev,
+        'cv': cv,
+        'ci95': (low, high),
+        'ci95_pct': half_width / median * 100 if median else 0.0,
+        'mean_ci95': (mean - mean_half_width, mean + mean_half_width),
+        'samples': n,
+        'outliers': len(rejected),
+        'unstable': cv > unstable_threshold,
+    }
+
+
+class Harness:
+    def __init__(self, warmup=1, repetitions=5, target_time=0.25, unstable_threshold=0.05,
+                 outlier_k=1.5, max_calibration_rounds=20):
+        if repetitions < 1:
+            raise ValueError("Harness needs at least one repetition")
+        if warmup < 0:
+            raise ValueError("Warmup runs cannot be negative")
+        self.warmup = warmup
+        self.repetitions = repetitions
+        self.target_time = target_time
+        self.unstable_threshold = unstable_threshold
+        self.outlier_k = outlier_k
+        self.max_calibration_rounds = max_calibration_rounds
+
+    @staticmethod
+    def time_ns(fn, *args):
+        start = time.perf_counter_ns()
+        fn(*args)
+        return time.perf_counter_ns() - start
+
+    def calibrate(self, run, start_iterations=1):
+        # run(iterations) -> elapsed ns. Grow until a run takes a tenth of the target, then scale linearly.
+        iterations = max(1, start_iterations)
+        target_ns = self.target_time * 1e9
+        for _ in range(self.max_calibration_rounds):
+            elapsed = run(iterations)
+            if elapsed >= target_ns / 10:
+                return max(1, int(iterations * target_ns / elapsed))
+            iterations *= 10 if elapsed < target_ns / 1000 else 2
+        return iterations
+
+    def measure(self, run, iterations, warmup=None):
+        # run(iterations) -> (ops, elapsed ns); returns throughput stats over the repetitions.
+        # warmup overrides self.warmup, e.g. 0 when run() warms up inside each of its own workers
+        for _ in range(self.warmup if warmup is None else warmup):
+            run(iterations)
+        scores = []
+        durations = []
+        for _ in range(self.repetitions):
+            ops, elapsed = run(iterations)
+            durations.append(elapsed / 1e9)
+            scores.append(ops / (elapsed / 1e9))
+        stats = summarize(scores, self.unstable_threshold, self.outlier_k)
+        stats['iterations'] = iterations
+        stats['duration'] = statistics.median(durations)
+        return stats
@@ -0,0 +1,248 @@
+import multiprocessing
+import random
+import re
+import time
+from array import array
+from BenchmarkRunner import pin_to_cpu, available_cpus, gather
+from Topology import declared_caches
+from Workloads import HAVE_NUMPY
+
+MIB = 1024 * 1024
+# name -> arrays each kernel moves per element as run here. STREAM counts 3 for triad, but NumPy needs two
+# passes for it (c * s into a, then a + b into a), which read or write five arrays' worth
+STREAM_KERNELS = (("copy", 2), ("scale", 2), ("add", 3), ("triad", 5))
+LATENCY_SIZES = tuple(1 << s for s in range(14, 29, 2))  # 16 KiB .. 256 MiB
+CHANNEL_PATTERNS = (re.compile(r"CHANNEL\s*([A-Z0-9]+)", re.I), re.compile(r"DIMM[_\s-]?([A-Z])\d", re.I),
+                    re.compile(r"\b([A-H])\d\b"))
+SOCKET_PATTERN = re.compile(r"\b(?:CPU|PROC|NODE|SOCKET|P)[\s_-]*(\d+)", re.I)
+
+
+def available_memory():
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except Exception:
+        return 4 * 1024 * MIB
+
+
+def stream_elements(workers=1, caches=None):
+    # STREAM's rule: every array at least 4x the last-level cache, capped so all three arrays
+    # on every worker stay within a quarter of free memory
+    caches = declared_caches() if caches is None else caches
+    llc = max((c['size'] or 0 for c in caches), default=0) or 32 * MIB
+    per_array = max(4 * llc // workers, 64 * MIB)
+    limit = available_memory() // 4 // (3 * workers)
+    return max(MIB, min(per_array, limit)) // 8
+
+
+def _stream_arrays(elements):
+    import numpy as np
+    # np.full writes every page up front so first-touch faults stay out of the timings
+    return np.full(elements, 1.0), np.full(elements, 2.0), np.zeros(elements)
+
+
+def _stream_pass(np, a, b, c, scalar, kernel):
+    if kernel == "copy":
+        np.copyto(c, a)
+    elif kernel == "scale":
+        np.multiply(c, scalar, out=b)
+    elif kernel == "add":
+        np.add(a, b, out=c)
+    else:
+        # Two passes with no temporary: read c, write a; then read a and b, write a
+        np.multiply(c, scalar, out=a)
+        np.add(a, b, out=a)
+
+
+def _stream_times(a, b, c, repetitions, barrier=None):
+    import numpy as np
+    times = {name: [] for name, _ in STREAM_KERNELS}
+    for _ in range(repetitions):
+        for name, _ in STREAM_KERNELS:
+            if barrier is not None:
+                barrier.wait()
+            start = time.perf_counter_ns()
+            _stream_pass(np, a, b, c, 3.0, name)
+            times[name].append(time.perf_counter_ns() - start)
+    return times
+
+
+def _stream_worker(cpu, elements, repetitions, barrier, results):
+    pin_to_cpu(cpu)
+    a, b, c = _stream_arrays(elements)
+    results.put((cpu, _stream_times(a, b, c, repetitions, barrier)))
+
+
+def _bandwidth(elements, per_worker_times, repetitions):
+    # Per repetition the slowest worker bounds the aggregate; the best repetition wins, as in STREAM
+    result = {}
+    workers = len(per_worker_times)
+    for name, arrays in STREAM_KERNELS:
+        moved = arrays * 8 * elements * workers
+        best = min(max(times[name][rep] for times in per_worker_times) for rep in range(repetitions))
+        result[name] = round(moved / best, 2)
+    return result
+
+
+def run_stream(workers=1, repetitions=5, elements=None, logical_threads=None):
+    elements = elements or stream_elements(workers)
+    if workers == 1:
+        a, b, c = _stream_arrays(elements)
+        times = [_stream_times(a, b, c, repetitions)]
+    else:
+        cpus = available_cpus(logical_threads or multiprocessing.cpu_count())
+        ctx = multiprocessing.get_context()
+        barrier = ctx.Barrier(workers)
+        results = ctx.Queue()
+        procs = [ctx.Process(target=_stream_worker,
+                             args=(cpus[i % len(cpus)], elements, repetitions, barrier, results), daemon=True)
+                 for i in range(workers)]
+        for p in procs:
+            p.start()
+        times = [t for _, t in gather(results, procs)]
+        for p in procs:
+            p.join()
+    return {
+        'workers': workers,
+        'array_mb': round(elements * 8 / MIB, 1),
+        'gb_s': _bandwidth(elements, times, repetitions),
+    }
+
+
+def build_chain(working_set, line_size=64):
+    # One slot per cache line, linked in a single random cycle (Sattolo) so the prefetcher cannot follow
+    stride = line_size // 8
+    slots = max(2, working_set // line_size)
+    # Repeating a one-element array allocates the chain once, with no bytes() or tobytes() copy beside it
+    chain = array('q', [0]) * (slots * stride)
+    if HAVE_NUMPY:
+        import numpy as np
+        order = np.random.default_rng(1).permutation(slots).astype(np.int64)
+        view = np.frombuffer(chain, dtype=np.int64)
+        view[order * stride] = np.roll(order, -1) * stride
+        del view
+        return chain
+    order = list(range(slots))
+    random.Random(1).shuffle(order)
+    for k in range(slots):
+        chain[order[k] * stride] = order[(k + 1) % slots] * stride
+    return chain
+
+
+def chase(chain, steps):
+    i = 0
+    for _ in range(steps // 8):
+        i = chain[i]; i = chain[i]; i = chain[i]; i = chain[i]
+        i = chain[i]; i = chain[i]; i = chain[i]; i = chain[i]
+    return i
+
+
+def chase_ns(chain, steps=1 << 21, repetitions=3):
+    chase(chain, min(steps, len(chain)))
+    best = min(_timed_chase(chain, steps) for _ in range(repetitions))
+    return best / steps
+
+
+def _timed_chase(chain, steps):
+    start = time.perf_counter_ns()
+    chase(chain, steps)
+    return time.perf_counter_ns() - start
+
+
+def measure_latency(sizes=LATENCY_SIZES, line_size=64, progress=None):
+    # Every load also pays for the interpreter; that cost is measured on a chain that fits in L1 and subtracted
+    overhead = chase_ns(build_chain(4096, line_size))
+    limit = available_memory() // 4
+    rows = []
+    for size in sizes:
+        if size > limit:
+            break
+        if progress:
+            progress(f"latency {size // 1024} KiB")
+        raw = chase_ns(build_chain(size, line_size))
+        rows.append({'size_kb': size // 1024, 'ns_per_load': round(raw, 2),
+                     'latency_ns': round(max(0.0, raw - overhead), 2)})
+    return {'overhead_ns': round(overhead, 2), 'sizes': rows}
+
+
+def _int_speed(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def memory_channels(modules):
+    # Channel letters or numbers from the DIMM and bank locators ("ChannelA-DIMM0", "DIMM_B1", "A1",
+    # "P0 CHANNEL A"), counted per socket ("CPU1_DIMM_A1", "P1-DIMMA1") because boards restart the letters
+    # on every socket; without a recognisable locator assume one module per channel
+    channels = set()
+    for module in modules:
+        text = f"{module.get('locator') or ''} {module.get('bank_locator') or ''}"
+        socket = SOCKET_PATTERN.search(text)
+        for pattern in CHANNEL_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                channels.add((socket.group(1) if socket else None, match.group(1).upper()))
+                break
+    return len(channels) or len(modules)
+
+
+def theoretical_bandwidth(modules, channels=None):
+    # Each DDR channel moves 8 bytes per transfer; every module runs at the slowest configured speed
+    speeds = [s for s in (_int_speed(m.get('speed')) for m in modules) if s]
+    if not speeds:
+        return None
+    channels = channels or memory_channels(modules)
+    speed = min(speeds)
+    return {
+        'speed_mts': speed,
+        'channels': channels,
+        'gb_s': round(speed * 8 * channels / 1000, 2),
+    }
+
+
+def configuration_warnings(modules, theoretical):
+    warnings = []
+    if theoretical and theoretical['channels'] == 1:
+        warnings.append("Single-channel memory: bandwidth is limited to one 64-bit channel")
+    speeds = {_int_speed(m.get('speed')) for m in modules} - {None}
+    if len(speeds) > 1:
+        warnings.append(f"Mismatched module speeds {sorted(speeds)} MT/s; all run at {min(speeds)}")
+    capacities = {m.get('capacity_gb') for m in modules}
+    if len(capacities) > 1:
+        warnings.append(f"Mismatched module sizes {sorted(capacities, key=str)} GB; dual-channel may be partial")
+    rated = {_int_speed(m.get('rated_speed')) for m in modules} - {None}
+    if rated and speeds and max(rated) > max(speeds):
+        warnings.append(f"Modules run at {max(speeds)} MT/s but are rated for {max(rated)} (XMP/EXPO disabled?)")
+    return warnings
+
+
+def run_memory_benchmark(modules=None, workers=None, repetitions=5, logical_threads=None, progress=None):
+    def step(name):
+        if progress:
+            progress(name)
+
+    modules = modules or []
+    logical_threads = logical_threads or multiprocessing.cpu_count()
+    workers = workers or len(available_cpus(logical_threads))
+    result = {}
+    if HAVE_NUMPY:
+        step("STREAM single")
+        result['stream_single'] = run_stream(1, repetitions, logical_threads=logical_threads)
+        step(f"STREAM x{workers}")
+        result['stream_multi'] = run_stream(workers, repetitions, logical_threads=logical_threads)
+    else:
+        result['stream_error'] = "NumPy is required for the STREAM kernels"
+    result['latency'] = measure_latency(progress=step)
+
+    theoretical = theoretical_bandwidth(modules)
+    result['theoretical'] = theoretical
+    result['warnings'] = configuration_warnings(modules, theoretical)
+    if theoretical and 'stream_multi' in result:
+        best = max(result['stream_multi']['gb_s'].values())
+        result['efficiency'] = round(best / theoretical['gb_s'], 3)
+        if result['efficiency'] < 0.5:
+            result['warnings'].append(f"Measured {best} GB/s is {result['efficiency']:.0%} of the "
+                                      f"theoretical {theoretical['gb_s']} GB/s")
+    return result
@@ -0,0 +1,69 @@
+import os
+from collections import namedtuple
+
+PROC_PRESSURE_MEMORY = "/proc/pressure/memory"
+PROC_VMSTAT = "/proc/vmstat"
+VMSTAT_FIELDS = (b"pgfault", b"pgmajfault", b"pswpin", b"pswpout")
+
+# PSI averages are percentages of wall time stalled; vmstat fields are converted to events per second
+Pressure = namedtuple("Pressure", "some_avg10 some_avg60 full_avg10 full_avg60 "
+                                  "pgfault pgmajfault pswpin pswpout")
+
+
+def read_psi(path=PROC_PRESSURE_MEMORY):
+    # "some avg10=0.00 avg60=0.00 avg300=0.00 total=0" -> {'some': {'avg10': 0.0, ...}, 'full': {...}}
+    result = {}
+    with open(path) as f:
+        for line in f:
+            kind, *fields = line.split()
+            result[kind] = {k: float(v) for k, v in (field.split("=") for field in fields)}
+    return result
+
+
+def read_vmstat(fields=VMSTAT_FIELDS, path=PROC_VMSTAT):
+    wanted = set(fields)
+    values = {}
+    with open(path, "rb") as f:
+        for line in f:
+            name, _, value = line.partition(b" ")
+            if name in wanted:
+                values[name] = int(value)
+    return values
+
+
+class PressureMonitor:
+    def __init__(self):
+        # PSI needs Linux 4.20+ with CONFIG_PSI; vmstat exists on any Linux
+        self.has_psi = os.path.exists(PROC_PRESSURE_MEMORY)
+        self.has_vmstat = os.path.exists(PROC_VMSTAT)
+        self._previous = None
+
+    def sample(self, interval):
+        if not (self.has_psi or self.has_vmstat):
+            return None
+        psi = {}
+        if self.has_psi:
+            try:
+                psi = read_psi()
+            except OSError:
+                # Present but unreadable when PSI is compiled in and disabled with psi=0
+                self.has_psi = False
+        counters = read_vmstat() if self.has_vmstat else {}
+        previous, self._previous = self._previous, counters
+        rates = {}
+        if previous and interval > 0:
+            for name in VMSTAT_FIELDS:
+                if name in counters and name in previous:
+                    rates[name] = max(0, counters[name] - previous[name]) / interval
+        some = psi.get('some', {})
+        full = psi.get('full', {})
+        return Pressure(
+            some_avg10=some.get('avg10'),
+            some_avg60=some.get('avg60'),
+            full_avg10=full.get('avg10'),
+            full_avg60=full.get('avg60'),
+            pgfault=rates.get(b"pgfault"),
+            pgmajfault=rates.get(b"pgmajfault"),
+            pswpin=rates.get(b"pswpin"),
+            pswpout=rates.get(b"pswpout"),
+        )
@@ -0,0 +1,221 @@
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_PORT = 9101
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class _Family:
+    def __init__(self, lines, name, help_text, unit=None):
+        lines.append(f"# TYPE {name} gauge")
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+        lines.append(f"# HELP {name} {help_text}")
+        self.lines = lines
+        self.name = name
+
+    def add(self, value, **labels):
+        if value is not None:
+            text = str(value) if isinstance(value, int) else repr(float(value))
+            self.lines.append(f"{self.name}{_labels(labels)} {text}")
+
+
+def psutil_temperatures():
+    # {"coretemp/Core 0": 45.0, ...}; empty where psutil has no sensor support (Windows, macOS)
+    import psutil
+    if not hasattr(psutil, "sensors_temperatures"):
+        return {}
+    readings = {}
+    for chip, entries in psutil.sensors_temperatures().items():
+        for i, entry in enumerate(entries):
+            readings[f"{chip}/{entry.label or i}"] = entry.current
+    return readings
+
+
+def render(snapshot, topology=None, scores=None, scores_ts=None, temperatures=None):
+    lines = []
+    if snapshot is not None:
+        _Family(lines, "cpu_monitor_snapshot_timestamp_seconds", "Wall time of the sampler tick these values come from.",
+                "seconds").add(snapshot.ts)
+        _Family(lines, "cpu_monitor_cpu_total_usage_percent", "Busy time across all CPUs over the last interval.",
+                "percent").add(snapshot.total)
+        family = _Family(lines, "cpu_monitor_cpu_usage_percent", "Busy time of each logical CPU.", "percent")
+        for cpu, value in enumerate(snapshot.per_thread):
+            family.add(value, cpu=cpu)
+        family = _Family(lines, "cpu_monitor_core_usage_percent", "Average busy time of the SMT siblings of each core.",
+                         "percent")
+        for index, value in enumerate(snapshot.per_core):
+            family.add(value, core=topology.core_label(index) if topology else index)
+
+        mem = snapshot.memory
+        family = _Family(lines, "cpu_monitor_memory_bytes", "Physical memory by state.", "bytes")
+        for state in ("total", "available", "used", "cached"):
+            family.add(getattr(mem, state, None), state=state)
+        family = _Family(lines, "cpu_monitor_swap_bytes", "Swap space by state.", "bytes")
+        family.add(snapshot.swap.total, state="total")
+        family.add(snapshot.swap.used, state="used")
+
+        if snapshot.disks:
+            throughput = _Family(lines, "cpu_monitor_disk_throughput_bytes_per_second", "Block device throughput.")
+            iops = _Family(lines, "cpu_monitor_disk_iops", "Completed block device requests per second.")
+            await_ms = _Family(lines, "cpu_monitor_disk_await_milliseconds", "Average time per request.",
+                               "milliseconds")
+            util = _Family(lines, "cpu_monitor_disk_utilization_percent", "Time the device had requests in flight.",
+                           "percent")
+            for rate in snapshot.disks:
+                throughput.add(rate.read_mb_s * 1024 * 1024, device=rate.name, direction="read")
+                throughput.add(rate.write_mb_s * 1024 * 1024, device=rate.name, direction="write")
+                iops.add(rate.read_iops, device=rate.name, direction="read")
+                iops.add(rate.write_iops, device=rate.name, direction="write")
+                await_ms.add(rate.await_ms, device=rate.name)
+                util.add(rate.util, device=rate.name)
+
+        pressure = snapshot.pressure
+        if pressure is not None and pressure.some_avg10 is not None:
+            family = _Family(lines, "cpu_monitor_memory_pressure_percent", "Linux PSI memory stall averages.", "percent")
+            family.add(pressure.some_avg10, kind="some", window="10s")
+            family.add(pressure.some_avg60, kind="some", window="60s")
+            family.add(pressure.full_avg10, kind="full", window="10s")
+            family.add(pressure.full_avg60, kind="full", window="60s")
+
+    if temperatures:
+        family = _Family(lines, "cpu_monitor_temperature_celsius", "Hardware temperature sensors.", "celsius")
+        for sensor, value in sorted(temperatures.items()):
+            family.add(value, sensor=sensor)
+
+    if scores:
+        family = _Family(lines, "cpu_monitor_benchmark_score", "Score of the last benchmark run on this host.")
+        for key, value in sorted(scores.items()):
+            workload, kind = key.rsplit(".", 1)
+            family.add(value, workload=workload, kind=kind)
+        _Family(lines, "cpu_monitor_benchmark_timestamp_seconds", "When the last benchmark run finished.",
+                "seconds").add(scores_ts)
+
+    lines.append("# EOF")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    exporter = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] == "/metrics":
+            # Serve the bytes rendered on the last sampler tick; a scrape never calls psutil
+            body, content_type = self.exporter.payload, CONTENT_TYPE
+        elif self.path == "/":
+            body, content_type = b'<a href="/metrics">/metrics</a>\n', "text/html"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _MetricsServer(ThreadingHTTPServer):
+    # The stdlib backlog of 5 makes bursts of concurrent scrapers wait for SYN retransmits
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class MetricsExporter:
+    def __init__(self, sampler, host="0.0.0.0", port=DEFAULT_PORT, temperature_source=psutil_temperatures):
+        self.sampler = sampler
+        self.host = host
+        self.port = port
+        self.temperature_source = temperature_source
+        self.scores = {}
+        self.scores_ts = None
+        self.payload = render(None)
+        self._server = None
+        self._thread = None
+
+    def _on_snapshot(self, snapshot):
+        # Runs once per sampler tick on the sampler thread; swapping the reference is atomic for readers
+        temperatures = None
+        if self.temperature_source is not None:
+            try:
+                temperatures = self.temperature_source()
+            except Exception:
+                temperatures = None
+        self.payload = render(snapshot, self.sampler.topology, self.scores, self.scores_ts, temperatures)
+
+    def set_report(self, report):
+        from BenchmarkCli import iter_scores
+        self.scores = dict(iter_scores(report))
+        self.scores_ts = report.get('epoch', time.time())
+
+    def load_history(self, history, fingerprint):
+        host_id = history.find_host(fingerprint)
+        latest = history.latest_run(host_id) if host_id is not None else None
+        if latest:
+            self.scores = latest['scores']
+            self.scores_ts = latest['ts']
+
+    def start(self):
+        handler = type("MetricsHandler", (_MetricsHandler,), {'exporter': self})
+        self._server = _MetricsServer((self.host, self.port), handler)
+        self.port = self._server.server_address[1]
+        self.sampler.subscribe(self._on_snapshot)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.sampler.unsubscribe(self._on_snapshot)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def load_test(url, clients=50, requests_per_client=20, timeout=10):
+    # Many concurrent scrapers against one exporter; latency percentiles in milliseconds
+    def client(_):
+        latencies, errors = [], 0
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    response.read()
+                latencies.append((time.perf_counter() - start) * 1000)
+            except OSError:
+                errors += 1
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(client, range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(lat for lats, _ in results for lat in lats)
+    errors = sum(err for _, err in results)
+    if not latencies:
+        return {'clients': clients, 'requests': 0, 'errors': errors}
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2], 2),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+        'max_ms': round(latencies[-1], 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+    }
@@ -1,10 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
-import wmi
+from Inventory import shared_inventory
+from UiQueue import shared_ui_queue
 
 class MotherboardInfo:
-    def __init__(self, root):
+    def __init__(self, root, inventory=None):
         self.root = root
+        self.ui = shared_ui_queue(root)
+        self.inventory = inventory or shared_inventory()
         self.frame = ttk.LabelFrame(root, text="🖥️ Motherboard Information", padding=12)
         self.frame.pack(fill='x', padx=10, pady=10)
 
@@ -32,21 +35,29 @@ class MotherboardInfo:
             value_label.pack(side='left', padx=6)
             self.info_labels[field] = value_label
 
-        self.refresh_btn = ttk.Button(self.frame, text="🔄 Refresh", command=self.update_info)
+        self.refresh_btn = ttk.Button(self.frame, text="🔄 Refresh", command=self.refresh)
         self.refresh_btn.pack(pady=6)
 
-        self.update_info()
+        self.inventory.get("board", self._on_result)
 
-    def update_info(self):
+    def refresh(self):
+        for label in self.info_labels.values():
+            label.config(text="Loading...")
+        self.inventory.refresh("board", self._on_result)
+
+    def _on_result(self, board, error):
+        # Called on an inventory thread; hand the result to the Tk thread
+        self.ui.call(self.update_info, board, error)
+
+    def update_info(self, board, error=None):
         try:
-            c = wmi.WMI()
-            boards = c.Win32_BaseBoard()
-            if boards:
-                board = boards[0]
-                self.info_labels["Manufacturer"].config(text=board.Manufacturer or "N/A")
-                self.info_labels["Product Name"].config(text=board.Product or "N/A")
-                self.info_labels["Version"].config(text=board.Version or "N/A")
-                self.info_labels["Serial Number"].config(text=board.SerialNumber or "N/A")
+            if error:
+                raise error
+            if board:
+                self.info_labels["Manufacturer"].config(text=board['manufacturer'] or "N/A")
+                self.info_labels["Product Name"].config(text=board['product'] or "N/A")
+                self.info_labels["Version"].config(text=board['version'] or "N/A")
+                self.info_labels["Serial Number"].config(text=board['serial'] or "N/A")
             else:
                 for label in self.info_labels.values():
                     label.config(text="No motherboard info found", foreground="red")
@@ -0,0 +1,60 @@
+from tkinter import ttk
+from Topology import format_cpu_list
+
+
+class ProcessPanel:
+    COLUMNS = (("name", "Name", 180), ("cpu", "CPU %", 70), ("threads", "Threads", 70),
+               ("switches", "Ctx sw/s", 80), ("affinity", "Affinity", 110))
+
+    def __init__(self, root, sampler, scanner):
+        self.root = root
+        self.sampler = sampler
+        self.scanner = scanner
+        self.logical = sampler.logical
+        self.last_seq = None
+        self.after_id = None
+        self.frame = ttk.LabelFrame(root, text="🔥 Top Processes by CPU", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        self.tree = ttk.Treeview(self.frame, columns=[c[0] for c in self.COLUMNS], height=10)
+        self.tree.heading("#0", text="PID")
+        self.tree.column("#0", width=70, stretch=False)
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor='w' if key in ("name", "affinity") else 'e')
+        self.tree.tag_configure("hot", foreground="#DC143C")
+        self.tree.pack(fill='x', pady=4)
+
+        self.status_label = ttk.Label(self.frame, text="Waiting for first scan...", font=("Segoe UI", 9),
+                                      foreground="gray")
+        self.status_label.pack(anchor='w')
+        self._poll()
+
+    def _poll(self):
+        snap = self.scanner.latest
+        if snap is not None and snap.seq != self.last_seq:
+            self.last_seq = snap.seq
+            self.show(snap)
+        self.after_id = self.root.after(int(self.sampler.interval * 1000), self._poll)
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _affinity(self, cpus):
+        if cpus is None:
+            return "?"
+        if len(cpus) == self.logical:
+            return "all"
+        return format_cpu_list(cpus)
+
+    def show(self, snap):
+        self.tree.delete(*self.tree.get_children())
+        for row in snap.top_cpu:
+            # CPU % is per core, as in top: a process saturating two cores reads 200
+            self.tree.insert("", "end", text=str(row.pid), tags=("hot",) if row.cpu_percent >= 90 else (), values=(
+                row.name, f"{row.cpu_percent:.1f}", row.threads, f"{row.ctx_switches:,.0f}",
+                self._affinity(row.affinity)))
+        self.status_label.config(text=f"{snap.count} processes | {snap.scanned} refreshed this tick "
+                                      f"in {self.scanner.scan_ms:.1f} ms")
@@ -0,0 +1,258 @@
+import heapq
+import math
+import os
+import threading
+import time
+from collections import deque, namedtuple
+import psutil
+
+ProcessRow = namedtuple("ProcessRow", "pid name rss pss")
+CpuRow = namedtuple("CpuRow", "pid name cpu_percent threads ctx_switches affinity")
+ProcessSnapshot = namedtuple("ProcessSnapshot", "seq ts count scanned top_memory top_cpu")
+
+GONE = (psutil.NoSuchProcess, psutil.ZombieProcess)
+UNKNOWN = {'name': "?", 'rss': 0, 'threads': 0, 'switch_rate': 0.0}
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") and psutil.LINUX else None
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if CLOCK_TICKS else None
+
+
+def proc_stat(pid):
+    # -> (start time in clock ticks, utime + stime seconds, RSS bytes) straight from /proc/<pid>/stat: one small
+    # read with no file object or psutil overhead, about 7 µs a process. None once the process is gone
+    try:
+        fd = os.open(f"/proc/{pid}/stat", os.O_RDONLY)
+        try:
+            fields = os.read(fd, 1024).rpartition(b")")[2].split()
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+    return int(fields[19]), (int(fields[11]) + int(fields[12])) / CLOCK_TICKS, int(fields[21]) * PAGE_SIZE
+
+
+class ProcessScanner:
+    def __init__(self, top_n=10, batch=256, interval=1.0, sweep=10.0, candidates=30):
+        # Everything is keyed by (pid, start time), so a reused pid never inherits another process's CPU time
+        # or details. Each tick reads CPU time (and on Linux RSS, from the same read) for the rows on show, the
+        # `candidates` busiest processes and processes not yet rated; the rest are read in slices of at least
+        # `batch` that cover them all once per `sweep` seconds, so a process that turns busy shows up within a
+        # sweep. The dearer fields (name, threads, switches) are read for the rows on show
+        self.top_n = top_n
+        self.batch = batch
+        self.interval = interval
+        self.sweep = sweep
+        self.candidates = candidates
+        self.handles = {}
+        self.keys = {}
+        self.stats = {}
+        self.rss = {}
+        self.cpu = {}
+        self.cpu_percent = {}
+        self._unrated = set()
+        self._order = deque()
+        self._top = ()
+        self._busiest = ()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.scan_ms = 0.0
+        self.latest = None
+
+    def attach(self, sampler):
+        # Scans at the sampler's pace but on a thread of its own, so a slow scan never delays the snapshot
+        # every live panel shares
+        self.interval = sampler.interval
+        return self.start()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="process-scanner", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        self.scan()
+        while not self._stop.wait(self.interval):
+            self.scan()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * self.interval)
+            self._thread = None
+
+    def _sync_pids(self):
+        pids = set(psutil.pids())
+        for pid in set(self.keys) - pids:
+            self._forget(self.keys[pid])
+        fresh = []
+        for pid in pids - set(self.keys):
+            try:
+                proc = psutil.Process(pid)
+                if CLOCK_TICKS:
+                    stat = proc_stat(pid)
+                    if stat is None:
+                        continue
+                    key = (pid, stat[0])
+                else:
+                    key = (pid, proc.create_time())
+            except (psutil.AccessDenied,) + GONE:
+                continue
+            self.handles[key] = proc
+            self.keys[pid] = key
+            self._order.append(key)
+            fresh.append(key)
+        return fresh
+
+    def _forget(self, key):
+        # Stale entries in _order are skipped when they come round
+        self.handles.pop(key, None)
+        self.stats.pop(key, None)
+        self.rss.pop(key, None)
+        self.cpu.pop(key, None)
+        self.cpu_percent.pop(key, None)
+        self._unrated.discard(key)
+        if self.keys.get(key[0]) == key:
+            del self.keys[key[0]]
+
+    def _next_slice(self):
+        count = max(self.batch, math.ceil(len(self.handles) * self.interval / self.sweep))
+        batch = []
+        for _ in range(min(count, len(self._order))):
+            key = self._order.popleft()
+            if key in self.handles:
+                batch.append(key)
+                self._order.append(key)
+        return batch
+
+    def _read(self, key):
+        # -> (start, CPU seconds, RSS or None), or None when the process is gone or unreadable
+        if CLOCK_TICKS:
+            return proc_stat(key[0])
+        try:
+            times = self.handles[key].cpu_times()
+        except (psutil.AccessDenied,) + GONE:
+            return None
+        return key[1], times.user + times.system, None
+
+    def _sample(self, key, now):
+        # The rate covers the time since this process was last read: a tick for candidates, up to a sweep
+        # for the rest. A first read gives no rate yet, so the process is read again next tick
+        stat = self._read(key)
+        if stat is None and not CLOCK_TICKS:
+            # Access denied (or gone, which the next sync notices): rank it idle rather than re-read it every tick
+            self.cpu_percent.setdefault(key, 0.0)
+            return
+        if stat is None or stat[0] != key[1]:
+            # Gone, or its pid already belongs to a new process that the next sync picks up
+            self._forget(key)
+            return
+        _, seconds, rss = stat
+        if rss is not None:
+            self.rss[key] = rss
+        previous = self.cpu.get(key)
+        if previous and now > previous[0]:
+            self.cpu_percent[key] = max(0.0, (seconds - previous[1]) / (now - previous[0]) * 100)
+            self._unrated.discard(key)
+        else:
+            self._unrated.add(key)
+        self.cpu[key] = (now, seconds)
+
+    def _refresh(self, key, now):
+        # One oneshot() pass reads stat, statm and status once each; the switch rate is a delta against this
+        # process's previous refresh, which may be several ticks old for one that just reached the top-N
+        proc = self.handles[key]
+        try:
+            with proc.oneshot():
+                switches = proc.num_ctx_switches()
+                stat = {
+                    'name': proc.name(),
+                    'rss': proc.memory_info().rss,
+                    'threads': proc.num_threads(),
+                    'switches': switches.voluntary + switches.involuntary,
+                    'ts': now,
+                }
+        except GONE:
+            self._forget(key)
+            return
+        except psutil.AccessDenied:
+            self.stats.setdefault(key, UNKNOWN)
+            return
+        previous = self.stats.get(key)
+        if previous and 'ts' in previous and now > previous['ts']:
+            stat['switch_rate'] = max(0, stat['switches'] - previous['switches']) / (now - previous['ts'])
+        else:
+            stat['switch_rate'] = 0.0
+        self.stats[key] = stat
+        self.rss[key] = stat['rss']
+
+    def _affinity(self, key):
+        try:
+            return tuple(self.handles[key].cpu_affinity())
+        except (psutil.AccessDenied, AttributeError, KeyError) + GONE:
+            return None
+
+    def _pss(self, key):
+        # smaps_rollup is far dearer than statm, so PSS is read for the top-N only
+        try:
+            return self.handles[key].memory_full_info().pss
+        except (psutil.AccessDenied, AttributeError, KeyError):
+            return None
+        except GONE:
+            return None
+
+    def scan(self):
+        with self._lock:
+            start = time.perf_counter()
+            fresh = self._sync_pids()
+            now = time.monotonic()
+            sliced = self._next_slice()
+            for key in set(sliced).union(fresh, self._unrated, self._busiest, self._top):
+                if key in self.handles:
+                    self._sample(key, now)
+            if not CLOCK_TICKS:
+                # Without /proc/<pid>/stat, RSS for the memory ranking comes from the rotating psutil refresh
+                for key in sliced:
+                    if key in self.handles:
+                        self._refresh(key, now)
+
+            self._top = tuple(heapq.nlargest(self.top_n, self.rss, key=self.rss.get))
+            self._busiest = tuple(heapq.nlargest(max(self.candidates, self.top_n), self.cpu_percent,
+                                                 key=self.cpu_percent.get))
+            shown = set(self._top).union(self._busiest[:self.top_n])
+            for key in shown:
+                if key in self.handles:
+                    self._refresh(key, now)
+
+            rows = []
+            for key in self._top:
+                stat = self.stats.get(key, UNKNOWN)
+                rows.append(ProcessRow(key[0], stat['name'], self.rss.get(key, stat['rss']), self._pss(key)))
+            cpu_rows = []
+            for key in self._busiest[:self.top_n]:
+                stat = self.stats.get(key, UNKNOWN)
+                cpu_rows.append(CpuRow(key[0], stat['name'], self.cpu_percent.get(key, 0.0), stat['threads'],
+                                       stat['switch_rate'], self._affinity(key)))
+
+            self._seq += 1
+            self.latest = ProcessSnapshot(
+                seq=self._seq,
+                ts=time.time(),
+                count=len(self.handles),
+                scanned=len(sliced),
+                top_memory=tuple(rows),
+                top_cpu=tuple(cpu_rows),
+            )
+            self.scan_ms = (time.perf_counter() - start) * 1000
+            return self.latest
+
+
+_shared = None
+
+
+def shared_process_scanner(sampler):
+    global _shared
+    if _shared is None:
+        _shared = ProcessScanner().attach(sampler)
+    return _shared
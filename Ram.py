@@ -1,16 +1,27 @@
+import threading
 import tkinter as tk
+from collections import deque
 from tkinter import ttk
 import psutil
-import wmi
+from History import sparkline
 
 class RamInfo:
-    def __init__(self, root):
+    TREND_FIELDS = ("Available", "Used", "Cached", "Swap Used")
+
+    def __init__(self, root, sampler=None, scanner=None, history=60):
         self.root = root
+        self.sampler = sampler
+        self.scanner = scanner
+        self.last_seq = None
+        self.last_scan = None
+        self.after_id = None
         self.frame = ttk.LabelFrame(root, text="💾 RAM Information", padding=12)
         self.frame.pack(fill='x', padx=10, pady=10)
 
         self.info_labels = {}
-        self.fields = ["Total", "Available", "Used", "Usage Percentage"]
+        self.trend_labels = {}
+        self.trends = {field: deque(maxlen=history) for field in self.TREND_FIELDS}
+        self.fields = ["Total", "Available", "Used", "Cached", "Usage Percentage", "Swap Used"]
 
         self.label_font = ("Segoe UI", 10, "bold")
         self.value_font = ("Segoe UI", 10)
@@ -18,7 +29,9 @@ class RamInfo:
             "Total": "#4B0082",          # Indigo
             "Available": "#008080",      # Teal
             "Used": "#FF8C00",           # DarkOrange
-            "Usage Percentage": "#DC143C" # Crimson
+            "Cached": "#2980b9",
+            "Usage Percentage": "#DC143C", # Crimson
+            "Swap Used": "#8e44ad",
         }
 
         for field in self.fields:
@@ -31,11 +44,52 @@ class RamInfo:
             value_label = ttk.Label(container, text="Loading...", font=self.value_font, foreground=self.value_colors.get(field, "black"))
             value_label.pack(side='left', padx=6)
             self.info_labels[field] = value_label
+            if field in self.trends:
+                trend_label = ttk.Label(container, text="", font=("Consolas", 10), foreground="gray")
+                trend_label.pack(side='right', padx=6)
+                self.trend_labels[field] = trend_label
+
+        # Linux only: PSI stall percentages and vmstat fault/swap rates from the sampler
+        self.pressure_label = ttk.Label(self.frame, text="", font=self.value_font)
+        self.pressure_label.pack(anchor='w', pady=2)
+        self.vmstat_label = ttk.Label(self.frame, text="", font=self.value_font)
+        self.vmstat_label.pack(anchor='w', pady=2)
+
+        self.top_tree = None
+        if self.scanner is not None:
+            ttk.Label(self.frame, text="Top processes by memory:", font=self.label_font).pack(anchor='w', pady=(6, 0))
+            self.top_tree = ttk.Treeview(self.frame, columns=("name", "rss", "pss"), height=8)
+            self.top_tree.heading("#0", text="PID")
+            self.top_tree.column("#0", width=70, stretch=False)
+            for key, title, width in (("name", "Name", 200), ("rss", "RSS", 100), ("pss", "PSS", 100)):
+                self.top_tree.heading(key, text=title)
+                self.top_tree.column(key, width=width, anchor='w' if key == "name" else 'e')
+            self.top_tree.pack(fill='x', pady=4)
 
         self.refresh_btn = ttk.Button(self.frame, text="🔄 Refresh", command=self.update_info)
         self.refresh_btn.pack(pady=6)
 
         self.update_info()
+        if self.sampler is not None:
+            self._poll()
+
+    def _poll(self):
+        snap = self.sampler.latest
+        if snap is not None and snap.seq != self.last_seq:
+            self.last_seq = snap.seq
+            self.update_info(snap.memory, snap.swap)
+            self.update_pressure(snap.pressure)
+        if self.scanner is not None:
+            processes = self.scanner.latest
+            if processes is not None and processes.seq != self.last_scan:
+                self.last_scan = processes.seq
+                self.update_top(processes)
+        self.after_id = self.root.after(int(self.sampler.interval * 1000), self._poll)
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
 
     def _format_bytes(self, size):
         # Human readable memory size
@@ -45,25 +99,60 @@ class RamInfo:
             size /= 1024
         return f"{size:.2f} PB"
 
-    def update_info(self):
+    def update_info(self, mem=None, swap=None):
         try:
-            mem = psutil.virtual_memory()
+            mem = mem or psutil.virtual_memory()
+            swap = swap or psutil.swap_memory()
+            cached = getattr(mem, 'cached', None)
             self.info_labels["Total"].config(text=self._format_bytes(mem.total))
             self.info_labels["Available"].config(text=self._format_bytes(mem.available))
             self.info_labels["Used"].config(text=self._format_bytes(mem.used))
+            self.info_labels["Cached"].config(text=self._format_bytes(cached) if cached is not None else "N/A")
             self.info_labels["Usage Percentage"].config(text=f"{mem.percent} %")
+            self.info_labels["Swap Used"].config(text=f"{self._format_bytes(swap.used)} ({swap.percent} %)")
+
+            for field, value in (("Available", mem.available), ("Used", mem.used),
+                                 ("Cached", cached or 0), ("Swap Used", swap.used)):
+                self.trends[field].append(value)
+                self.trend_labels[field].config(text=sparkline(list(self.trends[field])))
         except Exception as e:
             err_msg = f"Error fetching RAM info: {e}"
             for label in self.info_labels.values():
                 label.config(text=err_msg, foreground="red")
 
+    def update_pressure(self, pressure):
+        if pressure is None:
+            return
+        if pressure.some_avg10 is not None:
+            stalled = pressure.some_avg10 > 10 or (pressure.full_avg10 or 0) > 1
+            self.pressure_label.config(
+                text=f"PSI some {pressure.some_avg10:.2f}% / {pressure.some_avg60:.2f}%  "
+                     f"full {pressure.full_avg10:.2f}% / {pressure.full_avg60:.2f}%  (avg10 / avg60)",
+                foreground="#DC143C" if stalled else "#228B22")
+        if pressure.pgfault is not None:
+            self.vmstat_label.config(
+                text=f"Page faults {pressure.pgfault:,.0f}/s (major {pressure.pgmajfault:,.0f}/s) | "
+                     f"swap in {pressure.pswpin:,.0f}/s out {pressure.pswpout:,.0f}/s")
+
+    def update_top(self, processes):
+        tree = self.top_tree
+        tree.delete(*tree.get_children())
+        for row in processes.top_memory:
+            tree.insert("", "end", text=str(row.pid), values=(
+                row.name, self._format_bytes(row.rss),
+                self._format_bytes(row.pss) if row.pss is not None else "-"))
+
 import tkinter as tk
 from tkinter import ttk
-import wmi
+from Inventory import shared_inventory
+from UiQueue import shared_ui_queue
+
 
 class RamDetailedInfo:
-    def __init__(self, root):
+    def __init__(self, root, inventory=None):
         self.root = root
+        self.ui = shared_ui_queue(root)
+        self.inventory = inventory or shared_inventory()
         self.frame = ttk.LabelFrame(root, text="💾 RAM Detailed Information", padding=12)
         self.frame.pack(fill='x', padx=10, pady=10)
 
@@ -71,27 +160,108 @@ class RamDetailedInfo:
         self.text.pack(fill='both', padx=5, pady=5)
         self.text.config(state=tk.DISABLED)
 
-        self.refresh_btn = ttk.Button(self.frame, text="🔄 Refresh", command=self.update_info)
-        self.refresh_btn.pack(pady=6)
+        controls = ttk.Frame(self.frame)
+        controls.pack(pady=6)
+        self.refresh_btn = ttk.Button(controls, text="🔄 Refresh", command=self.refresh)
+        self.refresh_btn.pack(side='left', padx=4)
+        self.bench_btn = ttk.Button(controls, text="⏱ Benchmark memory", command=self.start_benchmark)
+        self.bench_btn.pack(side='left', padx=4)
+        self.status_label = ttk.Label(self.frame, text="", font=("Segoe UI", 10, "italic"), foreground="blue")
+        self.status_label.pack()
 
-        self.update_info()
+        self.bench_text = tk.Text(self.frame, height=12, font=("Consolas", 9), bg="#f9f9f9", bd=0)
+        self.bench_text.config(state=tk.DISABLED)
+
+        self.modules = []
+        self._show_placeholder()
+        self.inventory.get("memory_modules", self._on_result)
+
+    def _show_placeholder(self):
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "Loading...")
+        self.text.config(state=tk.DISABLED)
+
+    def refresh(self):
+        self._show_placeholder()
+        self.inventory.refresh("memory_modules", self._on_result)
+
+    def _on_result(self, modules, error):
+        self.ui.call(self.update_info, modules, error)
+
+    def start_benchmark(self):
+        self.bench_btn.config(state='disabled')
+        modules = self.modules
+
+        def progress(step):
+            self.ui.call(lambda: self.status_label.config(text=f"Running {step}...", foreground="blue"))
+
+        def task():
+            try:
+                from MemoryBenchmark import run_memory_benchmark
+                result = run_memory_benchmark(modules, progress=progress)
+                self.ui.call(self.show_benchmark, result)
+            except Exception as e:
+                message = f"Error: {e}"
+                self.ui.call(lambda: self.status_label.config(text=message, foreground="red"))
+            finally:
+                self.ui.call(lambda: self.bench_btn.config(state='normal'))
+
+        threading.Thread(target=task, daemon=True).start()
+
+    @staticmethod
+    def _size_label(kb):
+        return f"{kb // 1024}M" if kb >= 1024 else f"{kb}K"
+
+    def show_benchmark(self, result):
+        self.status_label.config(text="✅ Memory benchmark complete!", foreground="blue")
+        text = self.bench_text
+        text.config(state=tk.NORMAL)
+        text.delete("1.0", tk.END)
+        theoretical = result['theoretical']
+        if 'stream_single' in result:
+            single, multi = result['stream_single'], result['stream_multi']
+            workers = f"{multi['workers']} workers"
+            text.insert(tk.END, f"{'GB/s':<8}{'1 worker':>12}{workers:>14}\n", "label")
+            for name in single['gb_s']:
+                text.insert(tk.END, f"{name:<8}{single['gb_s'][name]:>12.2f}{multi['gb_s'][name]:>14.2f}\n")
+        else:
+            text.insert(tk.END, f"{result['stream_error']}\n", "error")
+        if theoretical:
+            line = (f"Theoretical {theoretical['gb_s']} GB/s "
+                    f"({theoretical['speed_mts']} MT/s x {theoretical['channels']} channel(s))")
+            if 'efficiency' in result:
+                line += f" | measured {result['efficiency']:.0%}"
+            text.insert(tk.END, line + "\n", "label")
+        latency = result['latency']
+        text.insert(tk.END, "Latency: " + "  ".join(
+            f"{self._size_label(row['size_kb'])} {row['latency_ns']:.0f}ns" for row in latency['sizes']) + "\n")
+        for warning in result['warnings']:
+            text.insert(tk.END, f"⚠ {warning}\n", "warning")
+        text.tag_config("label", font=("Consolas", 9, "bold"))
+        text.tag_config("warning", foreground="#FF8C00")
+        text.tag_config("error", foreground="red")
+        text.config(state=tk.DISABLED)
+        text.pack(fill='both', padx=5, pady=5)
 
-    def update_info(self):
+    def update_info(self, mem_modules, error=None):
         try:
+            if error:
+                raise error
+            self.modules = mem_modules or []
             self.text.config(state=tk.NORMAL)
             self.text.delete("1.0", tk.END)
-            c = wmi.WMI()
-            mem_modules = c.Win32_PhysicalMemory()
             if not mem_modules:
-                self.text.insert(tk.END, "No RAM info found.", ("error",))
+                self.text.insert(tk.END, "No RAM module info found (on Linux DMI tables need root).", ("error",))
+                self.text.tag_config("error", foreground="red")
                 self.text.config(state=tk.DISABLED)
                 return
             for i, mem in enumerate(mem_modules, 1):
-                manufacturer = mem.Manufacturer or "Unknown"
-                speed = mem.Speed or "Unknown"
-                capacity_gb = int(mem.Capacity) // (1024**3) if mem.Capacity else "Unknown"
-                part_number = mem.PartNumber.strip() if mem.PartNumber else "Unknown"
-                serial_number = mem.SerialNumber.strip() if mem.SerialNumber else "Unknown"
+                manufacturer = mem['manufacturer']
+                speed = mem['speed']
+                capacity_gb = mem['capacity_gb']
+                part_number = mem['part_number']
+                serial_number = mem['serial_number']
                 latency = "N/A"  # Latency not available via WMI
                 
                 self.text.insert(tk.END, f"Module {i}:\n", "module_title")
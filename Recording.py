@@ -0,0 +1,471 @@
+import bisect
+import json
+import math
+import mmap
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from DiskIO import DiskRate
+from MemoryPressure import Pressure
+from Sampler import Snapshot
+from SharedSnapshot import MemoryInfo, SwapInfo
+
+# File: MAGIC, u32 header length, JSON header, then chunks appended back to back.
+# Chunk: CHUNK header, JSON meta (disk names), zlib-compressed columns. Each column holds all rows of
+# one value (per CPU, per disk field ...), which is what makes the uint8 usage series compress well.
+MAGIC = b"CPMREC\x00\x01"
+HEADER_LENGTH = struct.Struct("<I")
+CHUNK = struct.Struct("<4sIddIIH")          # magic rows t_first t_last raw_len comp_len meta_len
+CHUNK_MAGIC = b"CHNK"
+# Sidecar <file>.idx: one fixed record per chunk, so seeking is a bisect over t_first
+INDEX = struct.Struct("<QddI")              # offset t_first t_last rows
+MIB = 1024 * 1024
+DEFAULT_CHUNK_ROWS = 300
+
+
+def _u8(percent):
+    return min(255, max(0, round(percent * 2.55)))
+
+
+def _mib(value):
+    return min(0xFFFFFFFF, int(value) // MIB)
+
+
+def _nan(value):
+    return math.nan if value is None else value
+
+
+def _none(value):
+    return None if math.isnan(value) else value
+
+
+def _pack(code, values):
+    # array has no float16; struct does
+    if code == 'e':
+        return struct.pack(f"<{len(values)}e", *values)
+    return array(code, values).tobytes()
+
+
+def _unpack(code, raw, pos, count):
+    size = struct.calcsize(code)
+    end = pos + size * count
+    if code == 'e':
+        return struct.unpack_from(f"<{count}e", raw, pos), end
+    values = array(code)
+    values.frombytes(raw[pos:end])
+    return values, end
+
+
+class MetricRecorder:
+    # Subscribes to a sampler; rows are quantized as they arrive and compressed one chunk at a time, so a
+    # crash loses at most the rows of the open chunk (chunk_rows * interval seconds)
+    def __init__(self, path, sampler, chunk_rows=DEFAULT_CHUNK_ROWS, level=6):
+        self.path = path
+        self.sampler = sampler
+        self.chunk_rows = chunk_rows
+        self.level = level
+        self.n_cpus = sampler.logical
+        self.n_cores = len(sampler.core_groups)
+        self.rows = []
+        self.chunks = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        if exists:
+            header = read_header(self.path)[0]
+            if header['n_cpus'] != self.n_cpus or header['n_cores'] != self.n_cores:
+                raise ValueError(f"{self.path} was recorded with {header['n_cpus']} CPUs; cannot append")
+        self.file = open(self.path, "ab")
+        if not exists:
+            header = json.dumps({
+                'version': 1,
+                'hostname': socket.gethostname(),
+                'created': time.time(),
+                'interval': self.sampler.interval,
+                'n_cpus': self.n_cpus,
+                'n_cores': self.n_cores,
+                'core_groups': [list(g) for g in self.sampler.core_groups],
+            }).encode()
+            self.file.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+            self.file.flush()
+        self.index = open(index_path(self.path), "ab")
+
+    def start(self):
+        self.sampler.subscribe(self._on_snapshot)
+        return self
+
+    def _on_snapshot(self, snapshot):
+        mem, swap = snapshot.memory, snapshot.swap
+        row = (
+            snapshot.ts,
+            snapshot.interval,
+            _u8(snapshot.total),
+            bytes(_u8(v) for v in snapshot.per_thread[:self.n_cpus]).ljust(self.n_cpus, b"\0"),
+            bytes(_u8(v) for v in snapshot.per_core[:self.n_cores]).ljust(self.n_cores, b"\0"),
+            (_mib(mem.total), _mib(mem.available), _mib(mem.used), _mib(getattr(mem, 'cached', 0))),
+            mem.percent,
+            (_mib(swap.total), _mib(swap.used)),
+            swap.percent,
+            tuple(_nan(v) for v in snapshot.pressure) if snapshot.pressure else (math.nan,) * len(Pressure._fields),
+            {rate.name: rate[1:] for rate in snapshot.disks},
+        )
+        with self._lock:
+            self.rows.append(row)
+            if len(self.rows) >= self.chunk_rows:
+                self._write_chunk()
+
+    def _encode(self, rows):
+        n = len(rows)
+        t_first = rows[0][0]
+        disks = sorted({name for row in rows for name in row[10]})
+        parts = [
+            _pack('I', [round((r[0] - t_first) * 1000) for r in rows]),
+            _pack('H', [min(0xFFFF, round(r[1] * 1000)) for r in rows]),
+            bytes(r[2] for r in rows),
+        ]
+        # Column-major: all rows of CPU 0, then CPU 1 ... so each CPU's series is contiguous
+        for cpu in range(self.n_cpus):
+            parts.append(bytes(r[3][cpu] for r in rows))
+        for core in range(self.n_cores):
+            parts.append(bytes(r[4][core] for r in rows))
+        for field in range(4):
+            parts.append(_pack('I', [r[5][field] for r in rows]))
+        parts.append(_pack('e', [r[6] for r in rows]))
+        for field in range(2):
+            parts.append(_pack('I', [r[7][field] for r in rows]))
+        parts.append(_pack('e', [r[8] for r in rows]))
+        # PSI averages fit float16; vmstat event rates can exceed its 65504 range
+        for field in range(len(Pressure._fields)):
+            parts.append(_pack('e' if field < 4 else 'f', [r[9][field] for r in rows]))
+        nan_rate = (math.nan,) * (len(DiskRate._fields) - 1)
+        for name in disks:
+            for field in range(len(DiskRate._fields) - 1):
+                parts.append(_pack('f', [r[10].get(name, nan_rate)[field] for r in rows]))
+        raw = b"".join(parts)
+        meta = json.dumps({'disks': disks}).encode()
+        compressed = zlib.compress(raw, self.level)
+        header = CHUNK.pack(CHUNK_MAGIC, n, t_first, rows[-1][0], len(raw), len(compressed), len(meta))
+        return header + meta + compressed
+
+    def _write_chunk(self):
+        rows, self.rows = self.rows, []
+        if not rows:
+            return
+        data = self._encode(rows)
+        offset = self.file.tell()
+        self.file.write(data)
+        self.file.flush()
+        # The index record goes last: a chunk it points at is always complete
+        self.index.write(INDEX.pack(offset, rows[0][0], rows[-1][0], len(rows)))
+        self.index.flush()
+        self.chunks += 1
+        self.bytes_written += len(data)
+
+    def flush(self):
+        with self._lock:
+            self._write_chunk()
+
+    def stop(self):
+        self.sampler.unsubscribe(self._on_snapshot)
+        self.flush()
+        self.file.close()
+        self.index.close()
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a metric recording")
+        length = HEADER_LENGTH.unpack(f.read(HEADER_LENGTH.size))[0]
+        header = json.loads(f.read(length))
+    return header, len(MAGIC) + HEADER_LENGTH.size + length
+
+
+class Chunk:
+    def __init__(self, raw, meta, rows, t_first, n_cpus, n_cores):
+        self.rows = rows
+        self.raw = raw
+        self.n_cpus = n_cpus
+        self.n_cores = n_cores
+        offsets, pos = _unpack('I', raw, 0, rows)
+        self.ts = [t_first + ms / 1000 for ms in offsets]
+        self.interval, pos = _unpack('H', raw, pos, rows)
+        self.total_pos = pos
+        self.cpu_pos = pos + rows
+        self.core_pos = self.cpu_pos + rows * n_cpus
+        pos = self.core_pos + rows * n_cores
+        self.memory = []
+        for _ in range(4):
+            column, pos = _unpack('I', raw, pos, rows)
+            self.memory.append(column)
+        self.mem_percent, pos = _unpack('e', raw, pos, rows)
+        self.swap = []
+        for _ in range(2):
+            column, pos = _unpack('I', raw, pos, rows)
+            self.swap.append(column)
+        self.swap_percent, pos = _unpack('e', raw, pos, rows)
+        self.pressure = []
+        for field in range(len(Pressure._fields)):
+            column, pos = _unpack('e' if field < 4 else 'f', raw, pos, rows)
+            self.pressure.append(column)
+        self.disks = []
+        for name in meta['disks']:
+            fields = []
+            for _ in range(len(DiskRate._fields) - 1):
+                column, pos = _unpack('f', raw, pos, rows)
+                fields.append(column)
+            self.disks.append((name, fields))
+
+    def row_at(self, ts):
+        return max(0, bisect.bisect_right(self.ts, ts) - 1)
+
+    def snapshot(self, row, seq):
+        raw, rows = self.raw, self.rows
+        per_thread = tuple(raw[self.cpu_pos + cpu * rows + row] / 2.55 for cpu in range(self.n_cpus))
+        per_core = tuple(raw[self.core_pos + core * rows + row] / 2.55 for core in range(self.n_cores))
+        total, available, used, cached = (column[row] * MIB for column in self.memory)
+        pressure = Pressure(*(_none(column[row]) for column in self.pressure))
+        disks = tuple(DiskRate(name, *(column[row] for column in fields)) for name, fields in self.disks
+                      if not math.isnan(fields[0][row]))
+        return Snapshot(
+            seq=seq,
+            ts=self.ts[row],
+            interval=self.interval[row] / 1000,
+            total=raw[self.total_pos + row] / 2.55,
+            per_thread=per_thread,
+            per_core=per_core,
+            memory=MemoryInfo(total, available, used, cached, round(self.mem_percent[row], 1)),
+            swap=SwapInfo(self.swap[0][row] * MIB, self.swap[1][row] * MIB, round(self.swap_percent[row], 1)),
+            disks=disks,
+            pressure=pressure if any(v is not None for v in pressure) else None,
+        )
+
+
+class Recording:
+    def __init__(self, path):
+        self.path = path
+        self.header, self.data_start = read_header(path)
+        self.n_cpus = self.header['n_cpus']
+        self.n_cores = self.header['n_cores']
+        self.interval = self.header['interval']
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = self._load_index()
+        self.t_first = [entry[1] for entry in self.index]
+        self.base_rows = []
+        total = 0
+        for entry in self.index:
+            self.base_rows.append(total)
+            total += entry[3]
+        self.rows = total
+        # Replay's poll thread and the Tk thread both read chunks
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    def _load_index(self):
+        entries = []
+        try:
+            with open(index_path(self.path), "rb") as f:
+                data = f.read()
+            entries = [INDEX.unpack_from(data, pos) for pos in range(0, len(data) - INDEX.size + 1, INDEX.size)]
+        except OSError:
+            pass
+        # A sidecar recreated by a later append covers only the new chunks: it must start at the first chunk
+        # and only move forward. Chunks written after the last indexed one are picked up by scanning on
+        offsets = [entry[0] for entry in entries]
+        if (entries and offsets[0] == self.data_start and all(a < b for a, b in zip(offsets, offsets[1:]))
+                and offsets[-1] + CHUNK.size <= len(self.map)
+                and all(self.map[offset:offset + len(CHUNK_MAGIC)] == CHUNK_MAGIC for offset in offsets)):
+            _, _, _, _, _, comp_len, meta_len = CHUNK.unpack_from(self.map, offsets[-1])
+            end = offsets[-1] + CHUNK.size + meta_len + comp_len
+            if end <= len(self.map):
+                return entries + self._scan(end)
+        return self._scan(self.data_start)
+
+    def _scan(self, pos):
+        # Missing or damaged index: walk the chunk headers, skipping over the payloads
+        entries = []
+        while pos + CHUNK.size <= len(self.map):
+            magic, rows, t_first, t_last, _, comp_len, meta_len = CHUNK.unpack_from(self.map, pos)
+            end = pos + CHUNK.size + meta_len + comp_len
+            if magic != CHUNK_MAGIC or end > len(self.map):
+                break
+            entries.append((pos, t_first, t_last, rows))
+            pos = end
+        return entries
+
+    @property
+    def start(self):
+        return self.index[0][1] if self.index else None
+
+    @property
+    def end(self):
+        return self.index[-1][2] if self.index else None
+
+    def chunk(self, i):
+        with self._cache_lock:
+            return self._chunk(i)
+
+    def _chunk(self, i):
+        chunk = self._cache.get(i)
+        if chunk is None:
+            offset = self.index[i][0]
+            _, rows, t_first, _, raw_len, comp_len, meta_len = CHUNK.unpack_from(self.map, offset)
+            pos = offset + CHUNK.size
+            meta = json.loads(self.map[pos:pos + meta_len])
+            raw = zlib.decompress(self.map[pos + meta_len:pos + meta_len + comp_len])
+            chunk = Chunk(raw, meta, rows, t_first, self.n_cpus, self.n_cores)
+            # Replay moves forward through the file; keep the current and the previous chunk
+            if len(self._cache) >= 2:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[i] = chunk
+        return chunk
+
+    def locate(self, ts):
+        # -> (chunk index, row) of the newest row at or before ts, through the index without decompressing
+        i = max(0, bisect.bisect_right(self.t_first, ts) - 1)
+        return i, self.chunk(i).row_at(ts)
+
+    def snapshot_at(self, ts):
+        if not self.index:
+            return None
+        i, row = self.locate(ts)
+        return self.chunk(i).snapshot(row, self.base_rows[i] + row + 1)
+
+    def snapshots_between(self, a, b):
+        # Every recorded snapshot with a < ts <= b, oldest first
+        if not self.index or b <= a:
+            return
+        i = max(0, bisect.bisect_right(self.t_first, a) - 1)
+        while i < len(self.index) and self.index[i][1] <= b:
+            chunk = self.chunk(i)
+            for row in range(bisect.bisect_right(chunk.ts, a), bisect.bisect_right(chunk.ts, b)):
+                yield chunk.snapshot(row, self.base_rows[i] + row + 1)
+            i += 1
+
+    def close(self):
+        with self._cache_lock:
+            self._cache.clear()
+        self.map.close()
+        self.file.close()
+
+
+class RecordedTopology:
+    # Generic labels for a recording made on a machine whose topology is not this one
+    def __init__(self, core_groups):
+        self.groups = core_groups
+
+    def core_groups(self):
+        return self.groups
+
+    def core_label(self, index):
+        return f"Core {index}"
+
+
+class ReplaySampler:
+    # Stands in for Sampler in the GUI: `latest` is the recorded snapshot at the replay clock
+    # Recorded intervals a consumer may have to catch up on at once; more than that is a seek
+    CATCH_UP = 1000
+
+    def __init__(self, recording, speed=1.0, start=None):
+        from Topology import detect_topology
+        self.recording = recording
+        self.interval = recording.interval
+        self.logical = recording.n_cpus
+        self.core_groups = tuple(tuple(g) for g in recording.header['core_groups'])
+        # Labels come from this machine's topology only when the recording was made here
+        topology = detect_topology(self.logical)
+        self.topology = topology if topology.core_groups() == self.core_groups else RecordedTopology(self.core_groups)
+        self.disk_io = None
+        self.speed = speed
+        self.paused = False
+        self._anchor = (time.monotonic(), recording.start if start is None else start)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def position(self):
+        wall, ts = self._anchor
+        if not self.paused:
+            ts += (time.monotonic() - wall) * self.speed
+        return min(ts, self.recording.end)
+
+    def _reanchor(self, ts):
+        self._anchor = (time.monotonic(), ts)
+
+    def set_speed(self, speed):
+        self._reanchor(self.position)
+        self.speed = speed
+
+    def pause(self):
+        self._reanchor(self.position)
+        self.paused = True
+
+    def resume(self):
+        self._reanchor(self.position)
+        self.paused = False
+
+    def seek(self, ts):
+        self._reanchor(max(self.recording.start, min(ts, self.recording.end)))
+
+    @property
+    def latest(self):
+        return self.recording.snapshot_at(self.position)
+
+    def snapshots_since(self, ts):
+        # Every row after ts up to the replay clock: polling once per interval at 10x or 100x would otherwise
+        # see one row in ten or a hundred. After a seek (or on the first call) the last CATCH_UP intervals
+        position = self.position
+        floor = position - self.CATCH_UP * self.interval
+        if ts is None or ts > position or ts < floor:
+            ts = floor
+        return list(self.recording.snapshots_between(ts, position))
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="replay", daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _run(self):
+        last = None
+        while not self._stop.wait(self.interval):
+            snapshots = self.snapshots_since(last)
+            if not snapshots:
+                continue
+            last = snapshots[-1].ts
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for snapshot in snapshots:
+                for callback in subscribers:
+                    try:
+                        callback(snapshot)
+                    except Exception as e:
+                        print(f"Sampler subscriber error: {e}", file=sys.stderr)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        self.recording.close()
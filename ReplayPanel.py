@@ -0,0 +1,81 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+
+class ReplayPanel:
+    SPEEDS = (1, 10, 100)
+
+    def __init__(self, root, sampler):
+        self.root = root
+        self.sampler = sampler
+        self.recording = sampler.recording
+        self.after_id = None
+        self.dragging = False
+        self.frame = ttk.LabelFrame(root, text=f"⏯ Replay — {self.recording.header.get('hostname', '?')}", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill='x', pady=4)
+        self.play_btn = ttk.Button(controls, text="⏸ Pause", command=self.toggle)
+        self.play_btn.pack(side='left', padx=4)
+        self.speed_var = tk.IntVar(value=int(sampler.speed) if sampler.speed in self.SPEEDS else 1)
+        for speed in self.SPEEDS:
+            ttk.Radiobutton(controls, text=f"{speed}×", value=speed, variable=self.speed_var,
+                            command=lambda: self.sampler.set_speed(self.speed_var.get())).pack(side='left', padx=2)
+        ttk.Label(controls, text="Go to:", font=("Segoe UI", 10)).pack(side='left', padx=(12, 2))
+        self.goto_entry = ttk.Entry(controls, width=20)
+        self.goto_entry.insert(0, datetime.fromtimestamp(self.recording.start).isoformat(sep=" ", timespec="seconds"))
+        self.goto_entry.bind("<Return>", lambda e: self.goto())
+        self.goto_entry.pack(side='left')
+        ttk.Button(controls, text="Seek", command=self.goto).pack(side='left', padx=4)
+
+        # The slider maps straight onto the recording's time range; seeking goes through the chunk index
+        self.position_var = tk.DoubleVar(value=self.recording.start)
+        self.scale = ttk.Scale(self.frame, from_=self.recording.start, to=self.recording.end,
+                               variable=self.position_var, orient='horizontal', length=560)
+        self.scale.pack(fill='x', pady=4)
+        self.scale.bind("<ButtonPress-1>", lambda e: setattr(self, 'dragging', True))
+        self.scale.bind("<ButtonRelease-1>", self._on_release)
+
+        self.status_label = ttk.Label(self.frame, text="", font=("Segoe UI", 10))
+        self.status_label.pack(anchor='w')
+        self._poll()
+
+    def toggle(self):
+        if self.sampler.paused:
+            self.sampler.resume()
+            self.play_btn.config(text="⏸ Pause")
+        else:
+            self.sampler.pause()
+            self.play_btn.config(text="▶ Play")
+
+    def goto(self):
+        from BenchmarkCli import parse_time
+        try:
+            ts = parse_time(self.goto_entry.get().strip())
+        except ValueError:
+            self.status_label.config(text="Use an ISO time such as 2024-05-01 03:15 or epoch seconds",
+                                     foreground="red")
+            return
+        self.sampler.seek(ts)
+
+    def _on_release(self, event):
+        self.dragging = False
+        self.sampler.seek(self.position_var.get())
+
+    def _poll(self):
+        position = self.sampler.position
+        if not self.dragging:
+            self.position_var.set(position)
+        elapsed = position - self.recording.start
+        self.status_label.config(
+            text=f"{datetime.fromtimestamp(position):%Y-%m-%d %H:%M:%S} | {elapsed / 3600:.2f} h of "
+                 f"{(self.recording.end - self.recording.start) / 3600:.2f} h | {self.sampler.speed:g}×"
+                 f"{' | paused' if self.sampler.paused else ''}", foreground="black")
+        self.after_id = self.root.after(250, self._poll)
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import platform
+import time
+
+
+_host_cache = None
+
+
+def host_info():
+    # WMI and CPUID probing are slow, and the answer does not change within a process
+    global _host_cache
+    if _host_cache is None:
+        _host_cache = _collect_host_info()
+    return dict(_host_cache)
+
+
+def _collect_host_info():
+    info = {
+        'hostname': platform.node(),
+        'system': platform.system(),
+        'release': platform.release(),
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'logical_cpus': os.cpu_count() or 1,
+    }
+    try:
+        from CpuInfoCache import get_cpu_info
+        info['cpu'] = get_cpu_info().get('brand_raw', 'Unknown CPU')
+    except Exception:
+        info['cpu'] = platform.processor() or 'Unknown CPU'
+    try:
+        import psutil
+        info['physical_cores'] = psutil.cpu_count(logical=False)
+        info['memory_total'] = psutil.virtual_memory().total
+    except Exception:
+        pass
+    try:
+        from Inventory import shared_inventory
+        inventory = shared_inventory()
+        info['ram_modules'] = [f"{m['manufacturer']} {m['part_number']} {m['capacity_gb']}GB@{m['speed']}"
+                               for m in inventory.get_sync("memory_modules", timeout=30)]
+        board = inventory.get_sync("board", timeout=30)
+        if board:
+            info['board'] = f"{board['manufacturer']} {board['product']} {board['version']}"
+    except Exception:
+        pass
+    info['fingerprint'] = host_fingerprint(info)
+    return info
+
+
+def host_fingerprint(info):
+    keys = ('hostname', 'cpu', 'physical_cores', 'logical_cpus', 'ram_modules', 'board')
+    stable = json.dumps({k: info.get(k) for k in keys}, sort_keys=True)
+    return hashlib.sha1(stable.encode("utf-8")).hexdigest()[:16]
+
+
+def _summarize_run(result):
+    summary = {
+        'score': result['score'],
+        'workers': result['workers'],
+        'mode': result['mode'],
+        'duration': round(result['duration'], 6),
+        'per_worker': result['per_worker'],
+    }
+    stats = result.get('stats')
+    if stats:
+        summary.update({
+            'median': round(stats['median'], 3),
+            'stdev': round(stats['stdev'], 3),
+            'cv': round(stats['cv'], 5),
+            'ci95': [round(v, 3) for v in stats['ci95']],
+            'samples': stats['samples'],
+            'outliers': stats['outliers'],
+            'iterations': stats['iterations'],
+            'unstable': stats['unstable'],
+        })
+    for key in ('speedup', 'efficiency', 'telemetry'):
+        if key in result:
+            summary[key] = result[key]
+    return summary
+
+
+def build_report(results, runner):
+    report = {
+        'version': 1,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'epoch': time.time(),
+        'host': host_info(),
+        'config': {
+            'mode': runner.mode,
+            'workers': runner.logical_threads,
+            'repetitions': runner.harness.repetitions,
+            'warmup': runner.harness.warmup,
+            'target_time': runner.harness.target_time,
+        },
+        'workloads': {
+            name: {'single': _summarize_run(r['single']), 'multi': _summarize_run(r['multi'])}
+            for name, r in results['workloads'].items()
+        },
+        'composite': results['composite'],
+    }
+    if 'telemetry' in results:
+        report['telemetry'] = results['telemetry']
+    from Workloads import skipped_workloads
+    skipped = skipped_workloads()
+    if skipped:
+        report['skipped'] = skipped
+    return report
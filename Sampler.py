@@ -0,0 +1,168 @@
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+import psutil
+from Topology import detect_topology
+from DiskIO import DiskIoMonitor
+from MemoryPressure import PressureMonitor
+
+PROC_STAT = "/proc/stat"
+
+# Published to subscribers; tuples all the way down so a snapshot can be shared between threads as-is
+Snapshot = namedtuple("Snapshot", "seq ts interval total per_thread per_core memory swap disks pressure")
+
+
+def read_proc_stat(path=PROC_STAT):
+    # -> (aggregate (busy, total), [(busy, total) per logical CPU]) in clock ticks
+    aggregate = None
+    per_cpu = []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.startswith(b"cpu"):
+                break
+            fields = line.split()
+            # user nice system idle iowait irq softirq steal; guest time is already counted in user/nice
+            values = [int(v) for v in fields[1:9]]
+            total = sum(values)
+            idle = values[3] + (values[4] if len(values) > 4 else 0)
+            if fields[0] == b"cpu":
+                aggregate = (total - idle, total)
+            else:
+                per_cpu.append((total - idle, total))
+    return aggregate, per_cpu
+
+
+def read_psutil_times():
+    per_cpu = []
+    for t in psutil.cpu_times(percpu=True):
+        fields = t._asdict()
+        fields.pop('guest', None)
+        fields.pop('guest_nice', None)
+        total = sum(fields.values())
+        idle = fields.get('idle', 0.0) + fields.get('iowait', 0.0)
+        per_cpu.append((total - idle, total))
+    aggregate = (sum(b for b, _ in per_cpu), sum(t for _, t in per_cpu))
+    return aggregate, per_cpu
+
+
+def _percent(now, before):
+    busy = now[0] - before[0]
+    total = now[1] - before[1]
+    if total <= 0:
+        return 0.0
+    return max(0.0, min(100.0, busy * 100.0 / total))
+
+
+class Sampler:
+    def __init__(self, interval=1.0, topology=None):
+        self.interval = interval
+        self.logical = psutil.cpu_count(logical=True) or 1
+        self.physical = psutil.cpu_count(logical=False) or 1
+        self.topology = topology or detect_topology(self.logical, self.physical)
+        self.core_groups = self.topology.core_groups()
+        self.read_times = read_proc_stat if os.path.exists(PROC_STAT) else read_psutil_times
+        self.disk_io = DiskIoMonitor()
+        self.pressure = PressureMonitor()
+        self.latest = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._previous = None
+        self._seq = 0
+
+    def subscribe(self, callback):
+        # Callbacks run on the sampler thread and must not touch Tk; UI panels poll `latest` instead
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def start(self):
+        if self._thread is None:
+            self._previous = (time.time(), self.read_times())
+            self.disk_io.sample(0)
+            self.pressure.sample(0)
+            self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * self.interval)
+            self._thread = None
+
+    def _run(self):
+        next_tick = time.monotonic() + self.interval
+        while not self._stop.wait(max(0.0, next_tick - time.monotonic())):
+            next_tick += self.interval
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Sampler error: {e}", file=sys.stderr)
+
+    def _sample_disks(self, interval):
+        try:
+            return self.disk_io.sample(interval)
+        except OSError as e:
+            print(f"Disk I/O sampling error: {e}", file=sys.stderr)
+            return ()
+
+    def _sample_pressure(self, interval):
+        try:
+            return self.pressure.sample(interval)
+        except OSError as e:
+            print(f"Memory pressure sampling error: {e}", file=sys.stderr)
+            return None
+
+    def sample(self):
+        now = time.time()
+        aggregate, per_cpu = self.read_times()
+        prev_ts, (prev_aggregate, prev_per_cpu) = self._previous
+        self._previous = (now, (aggregate, per_cpu))
+
+        if len(prev_per_cpu) != len(per_cpu):
+            # CPU hot-plug: restart deltas from this tick rather than misattribute counters
+            return None
+        per_thread = tuple(_percent(n, b) for n, b in zip(per_cpu, prev_per_cpu))
+        per_core = tuple(sum(per_thread[i] for i in group) / len(group)
+                         for group in self.core_groups if all(i < len(per_thread) for i in group))
+
+        self._seq += 1
+        snapshot = Snapshot(
+            seq=self._seq,
+            ts=now,
+            interval=now - prev_ts,
+            total=_percent(aggregate, prev_aggregate),
+            per_thread=per_thread,
+            per_core=per_core,
+            memory=psutil.virtual_memory(),
+            swap=psutil.swap_memory(),
+            disks=self._sample_disks(now - prev_ts),
+            pressure=self._sample_pressure(now - prev_ts),
+        )
+        self.latest = snapshot
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Sampler subscriber error: {e}", file=sys.stderr)
+        return snapshot
+
+
+_shared = None
+
+
+def shared_sampler():
+    global _shared
+    if _shared is None:
+        _shared = Sampler().start()
+    return _shared
@@ -0,0 +1,98 @@
+import math
+
+
+def worker_steps(max_workers, extra=()):
+    # 1, 2, 4, ... up to max_workers, plus any topology boundaries (physical core count) worth sampling
+    steps = set()
+    n = 1
+    while n < max_workers:
+        steps.add(n)
+        n *= 2
+    steps.add(max_workers)
+    steps.update(e for e in extra if e and 1 <= e <= max_workers)
+    return sorted(steps)
+
+
+def fit_amdahl(points):
+    # points: [(workers, speedup)]. 1/S - 1/n = s * (1 - 1/n): least squares through the origin
+    sxx = sxy = 0.0
+    for n, speedup in points:
+        if n <= 1 or speedup <= 0:
+            continue
+        x = 1 - 1 / n
+        y = 1 / speedup - 1 / n
+        sxx += x * x
+        sxy += x * y
+    serial = min(1.0, max(0.0, sxy / sxx)) if sxx else 0.0
+    return {'serial_fraction': round(serial, 4),
+            'max_speedup': round(1 / serial, 2) if serial else None}
+
+
+def amdahl_speedup(n, serial):
+    return 1 / (serial + (1 - serial) / n)
+
+
+def fit_usl(points):
+    # Universal Scalability Law C(n) = n / (1 + a(n-1) + b n(n-1)); linearised as n/C - 1 = a(n-1) + b n(n-1)
+    s11 = s12 = s22 = s1y = s2y = 0.0
+    for n, speedup in points:
+        if n <= 1 or speedup <= 0:
+            continue
+        x1 = n - 1
+        x2 = n * (n - 1)
+        y = n / speedup - 1
+        s11 += x1 * x1
+        s12 += x1 * x2
+        s22 += x2 * x2
+        s1y += x1 * y
+        s2y += x2 * y
+    det = s11 * s22 - s12 * s12
+    if abs(det) < 1e-12:
+        alpha = s1y / s11 if s11 else 0.0
+        beta = 0.0
+    else:
+        alpha = (s1y * s22 - s2y * s12) / det
+        beta = (s11 * s2y - s12 * s1y) / det
+    if beta < 0:
+        # Negative coherency is unphysical; refit contention alone
+        beta = 0.0
+        alpha = s1y / s11 if s11 else 0.0
+    alpha = min(1.0, max(0.0, alpha))
+    peak = math.sqrt((1 - alpha) / beta) if beta > 0 else None
+    return {'alpha': round(alpha, 5), 'beta': round(beta, 6),
+            'peak_workers': round(peak, 1) if peak else None}
+
+
+def usl_speedup(n, alpha, beta):
+    return n / (1 + alpha * (n - 1) + beta * n * (n - 1))
+
+
+def analyse(steps):
+    # steps: [{'workers': n, 'score': throughput}, ...] with a 1-worker entry
+    base = next((s['score'] for s in steps if s['workers'] == 1), None)
+    if not base:
+        raise ValueError("Scaling analysis needs a single-worker measurement")
+    points = []
+    for s in steps:
+        s['speedup'] = round(s['score'] / base, 3)
+        s['efficiency'] = round(s['speedup'] / s['workers'], 3)
+        points.append((s['workers'], s['speedup']))
+
+    amdahl = fit_amdahl(points)
+    usl = fit_usl(points)
+    max_workers = max(s['workers'] for s in steps)
+    measured_best = max(steps, key=lambda s: s['score'])['workers']
+    if usl['peak_workers']:
+        recommended = int(min(max_workers, max(1, round(usl['peak_workers']))))
+    else:
+        recommended = max_workers
+    # Do not recommend adding workers that buy less than half a core's worth of throughput each
+    efficient = [s['workers'] for s in steps if s['efficiency'] >= 0.5]
+    return {
+        'steps': steps,
+        'amdahl': amdahl,
+        'usl': usl,
+        'best_measured_workers': measured_best,
+        'recommended_workers': recommended,
+        'max_efficient_workers': max(efficient) if efficient else 1,
+    }
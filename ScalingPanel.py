@@ -0,0 +1,88 @@
+import threading
+from tkinter import ttk
+from Scaling import usl_speedup
+from Workloads import available_workloads
+from UiQueue import shared_ui_queue
+
+
+class ScalingPanel:
+    def __init__(self, root, runner):
+        self.root = root
+        self.ui = shared_ui_queue(root)
+        self.runner = runner
+        self.frame = ttk.LabelFrame(root, text="📊 Thread Scaling", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill='x', pady=4)
+        self.workload_box = ttk.Combobox(controls, state="readonly", width=16,
+                                         values=[w.name for w in available_workloads()])
+        self.workload_box.set("hash")
+        self.workload_box.pack(side='left', padx=4)
+        self.run_btn = ttk.Button(controls, text="▶ Run scaling curve", command=self.start)
+        self.run_btn.pack(side='left', padx=8)
+        self.status_label = ttk.Label(controls, text="", font=("Segoe UI", 10, "italic"), foreground="blue")
+        self.status_label.pack(side='left', padx=4)
+
+        # matplotlib is imported on first use so it stays off the startup path
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig, self.ax = plt.subplots(figsize=(6, 2.8))
+        self.ax_eff = self.ax.twinx()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
+        self.canvas.get_tk_widget().pack(pady=6)
+
+        self.summary_label = ttk.Label(self.frame, text="Not run", font=("Segoe UI", 10))
+        self.summary_label.pack(pady=4)
+
+    def start(self):
+        workload = self.workload_box.get()
+        self.run_btn.config(state='disabled')
+
+        def progress(step):
+            self.ui.call(lambda: self.status_label.config(text=f"Running {step}..."))
+
+        def task():
+            try:
+                result = self.runner.run_scaling(workload, progress=progress)
+                self.ui.call(lambda: self.show(result))
+            except Exception as e:
+                message = f"Error: {e}"
+                self.ui.call(lambda: self.status_label.config(text=message, foreground="red"))
+            finally:
+                self.ui.call(lambda: self.run_btn.config(state='normal'))
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def show(self, result):
+        steps = result['steps']
+        workers = [s['workers'] for s in steps]
+        scores = [s['score'] for s in steps]
+        base = scores[0]
+        usl = result['usl']
+
+        self.ax.clear()
+        self.ax_eff.clear()
+        self.ax.plot(workers, scores, marker='o', color='#2196f3', label='Throughput')
+        fitted = [base * usl_speedup(n, usl['alpha'], usl['beta']) for n in range(1, max(workers) + 1)]
+        self.ax.plot(range(1, max(workers) + 1), fitted, linestyle='--', color='#9e9e9e', label='USL fit')
+        self.ax.axvline(result['physical_cores'], color='#ff9800', linestyle=':', label='Physical cores')
+        self.ax_eff.plot(workers, [s['efficiency'] * 100 for s in steps], marker='s', color='#4caf50',
+                         label='Efficiency %')
+        self.ax_eff.set_ylim(0, 110)
+        self.ax.set_xlabel('Workers', fontsize=9)
+        self.ax.set_ylabel('ops/sec', fontsize=9)
+        self.ax_eff.set_ylabel('%', fontsize=9)
+        self.ax.set_title(f"{result['workload']} scaling", fontsize=11, fontweight='bold')
+        self.ax.legend(loc='upper left', fontsize=8)
+        self.ax_eff.legend(loc='lower right', fontsize=8)
+        self.fig.tight_layout()
+        self.canvas.draw()
+
+        self.status_label.config(text="✅ Scaling run complete!", foreground="blue")
+        self.summary_label.config(
+            text=f"Serial fraction (Amdahl): {result['amdahl']['serial_fraction']:.1%} | "
+                 f"USL α={usl['alpha']:.4f} β={usl['beta']:.5f} | "
+                 f"Recommended workers: {result['recommended_workers']} "
+                 f"(≥50% efficient up to {result['max_efficient_workers']})")
@@ -0,0 +1,327 @@
+import bisect
+import glob
+import os
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+
+SYS_ROOT = "/sys"
+
+# temperatures {sensor: °C}, frequencies (MHz or None per logical CPU), throttle {counter: events since boot}
+SensorSample = namedtuple("SensorSample", "ts temperatures frequencies throttle")
+
+
+def _read_text(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _cpu_index(path):
+    match = re.search(r"/cpu(\d+)/", path)
+    return int(match.group(1)) if match else None
+
+
+class LinuxSensors:
+    # Every sysfs attribute is opened once; a sample is one pread() per file with no path lookups
+    name = "sysfs"
+
+    def __init__(self, root=SYS_ROOT, logical=None):
+        self.temperatures = []
+        self.frequencies = []
+        self.throttle = []
+        self.max_frequencies = ()
+        self._discover(root, logical)
+
+    def _open(self, path):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            os.pread(fd, 32, 0)
+        except OSError:
+            # Some drivers expose inputs that fail on read (sensor asleep, missing firmware)
+            os.close(fd)
+            return None
+        return fd
+
+    def _discover(self, root, logical):
+        seen = set()
+        for hwmon in sorted(glob.glob(os.path.join(root, "class/hwmon/hwmon*"))):
+            chip = _read_text(os.path.join(hwmon, "name")) or os.path.basename(hwmon)
+            for path in sorted(glob.glob(os.path.join(hwmon, "temp*_input"))):
+                label = _read_text(path[:-len("input")] + "label") or os.path.basename(path)[:-len("_input")]
+                key = f"{chip}/{label}"
+                fd = self._open(path)
+                if fd is not None and key not in seen:
+                    seen.add(key)
+                    self.temperatures.append((key, fd))
+        for zone in sorted(glob.glob(os.path.join(root, "class/thermal/thermal_zone*"))):
+            key = f"thermal/{_read_text(os.path.join(zone, 'type')) or os.path.basename(zone)}"
+            fd = self._open(os.path.join(zone, "temp"))
+            if fd is not None and key not in seen:
+                seen.add(key)
+                self.temperatures.append((key, fd))
+
+        cpu_dir = os.path.join(root, "devices/system/cpu")
+        paths = sorted(glob.glob(os.path.join(cpu_dir, "cpu[0-9]*/cpufreq/scaling_cur_freq")), key=_cpu_index)
+        count = max([_cpu_index(p) + 1 for p in paths] + [logical or 0])
+        self.frequencies = [None] * count
+        maxima = [None] * count
+        for path in paths:
+            cpu = _cpu_index(path)
+            self.frequencies[cpu] = self._open(path)
+            limit = _read_text(os.path.join(os.path.dirname(path), "cpuinfo_max_freq"))
+            maxima[cpu] = int(limit) / 1000 if limit and limit.isdigit() else None
+        self.max_frequencies = tuple(maxima)
+
+        # The kernel counts thermal throttling per core and per package (x86 therm_throt)
+        packages = set()
+        for path in sorted(glob.glob(os.path.join(cpu_dir, "cpu[0-9]*/thermal_throttle/*_throttle_count")),
+                           key=_cpu_index):
+            cpu = _cpu_index(path)
+            kind = os.path.basename(path).split("_")[0]
+            if kind == "package":
+                package = _read_text(os.path.join(cpu_dir, f"cpu{cpu}/topology/physical_package_id"))
+                if package in packages:
+                    continue
+                packages.add(package)
+                key = f"package{package}"
+            else:
+                key = f"cpu{cpu}"
+            fd = self._open(path)
+            if fd is not None:
+                self.throttle.append((key, fd))
+
+    @property
+    def available(self):
+        return bool(self.temperatures or any(fd is not None for fd in self.frequencies) or self.throttle)
+
+    @staticmethod
+    def _value(fd):
+        try:
+            return int(os.pread(fd, 32, 0))
+        except (OSError, ValueError):
+            return None
+
+    def read(self):
+        value = self._value
+        temperatures = {}
+        for key, fd in self.temperatures:
+            raw = value(fd)
+            if raw is not None:
+                temperatures[key] = raw / 1000
+        frequencies = tuple(None if fd is None else value(fd) for fd in self.frequencies)
+        frequencies = tuple(None if khz is None else khz / 1000 for khz in frequencies)
+        throttle = {key: value(fd) for key, fd in self.throttle}
+        return SensorSample(time.perf_counter(), temperatures, frequencies, throttle)
+
+    def close(self):
+        for fd in [fd for _, fd in self.temperatures + self.throttle] + self.frequencies:
+            if fd is not None:
+                os.close(fd)
+        self.temperatures, self.frequencies, self.throttle = [], [], []
+
+
+class PsutilSensors:
+    name = "psutil"
+
+    def __init__(self):
+        import psutil
+        self.psutil = psutil
+        limits = psutil.cpu_freq(percpu=True) or []
+        self.max_frequencies = tuple(f.max or None for f in limits)
+
+    @property
+    def available(self):
+        from MetricsExporter import psutil_temperatures
+        return bool(self.max_frequencies) or bool(psutil_temperatures())
+
+    def read(self):
+        from MetricsExporter import psutil_temperatures
+        frequencies = tuple(f.current for f in self.psutil.cpu_freq(percpu=True) or [])
+        return SensorSample(time.perf_counter(), psutil_temperatures(), frequencies, {})
+
+    def close(self):
+        pass
+
+
+class OpenHardwareMonitorSensors:
+    # Windows: the OpenHardwareMonitor DLL through pythonnet, loaded only when sensors are first opened
+    name = "openhardwaremonitor"
+
+    def __init__(self):
+        import temperature
+        self.temperature = temperature
+        self.temperature.computer()
+        self.max_frequencies = ()
+
+    available = True
+
+    def read(self):
+        temperatures, clocks = self.temperature.read_cpu_sensors()
+        return SensorSample(time.perf_counter(), temperatures, tuple(clocks), {})
+
+    def close(self):
+        pass
+
+
+def open_sensors(root=SYS_ROOT, logical=None):
+    # -> the best backend for this machine, or None when nothing can be read
+    if os.path.isdir(os.path.join(root, "devices/system/cpu")):
+        sensors = LinuxSensors(root, logical)
+        if sensors.available:
+            return sensors
+        sensors.close()
+    if os.name == "nt":
+        try:
+            return OpenHardwareMonitorSensors()
+        except Exception:
+            pass
+    try:
+        sensors = PsutilSensors()
+    except Exception:
+        return None
+    return sensors if sensors.available else None
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+class SensorTrace:
+    # Samples sensors on a background thread while a benchmark runs; results ask for the slice that
+    # overlaps their own perf_counter window so every score carries the clocks it ran at
+    def __init__(self, sensors, interval=0.25):
+        self.sensors = sensors
+        self.interval = interval
+        # Kept in time order with a parallel timestamp column, so each window bisects to its own samples
+        # instead of scanning the whole run; mark() and the trace thread both add under the lock
+        self.samples = []
+        self.times = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _add(self, sample):
+        with self._lock:
+            index = bisect.bisect_right(self.times, sample.ts)
+            self.times.insert(index, sample.ts)
+            self.samples.insert(index, sample)
+        return sample
+
+    def start(self):
+        self._add(self.sensors.read())
+        self._thread = threading.Thread(target=self._run, name="sensor-trace", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._add(self.sensors.read())
+            except Exception as e:
+                print(f"Sensor read error: {e}", file=sys.stderr)
+
+    def mark(self):
+        # An extra reading taken now, for callers that need a sample exactly at a boundary
+        return self._add(self.sensors.read())
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * self.interval)
+            self._thread = None
+        self._add(self.sensors.read())
+        return self
+
+    def _slice(self, start, end):
+        with self._lock:
+            first = bisect.bisect_left(self.times, start)
+            last = bisect.bisect_right(self.times, end)
+            if first < last:
+                return self.samples[first:last]
+            if not self.samples:
+                return []
+            # Shorter than one interval: the sample closest to the middle stands in
+            middle = (start + end) / 2
+            candidates = self.samples[max(0, first - 1):first + 1]
+            return [min(candidates, key=lambda s: abs(s.ts - middle))]
+
+    def _throttle_events(self, start, end):
+        # Counter deltas across the window, from the last sample at or before it to the first at or after it
+        with self._lock:
+            before = bisect.bisect_right(self.times, start) - 1
+            after = bisect.bisect_left(self.times, end)
+            if before < 0 or after >= len(self.samples):
+                return None
+            first, last = self.samples[before].throttle, self.samples[after].throttle
+        deltas = {k: last[k] - first[k] for k in first if first[k] is not None and last.get(k) is not None}
+        return sum(max(0, d) for d in deltas.values()) if deltas else None
+
+    def window(self, start, end, cpus=None, busiest=None):
+        # cpus: the CPUs the run was pinned to. Unpinned runs pass busiest=N instead, and each sample uses
+        # its N fastest clocks: an idle core parked at its lowest P-state says nothing about the run
+        samples = self._slice(start, end)
+        if not samples:
+            return {}
+        clocks = []
+        for s in samples:
+            if cpus:
+                chosen = [s.frequencies[c] for c in cpus if c < len(s.frequencies)]
+            elif busiest:
+                chosen = sorted((f for f in s.frequencies if f is not None), reverse=True)[:busiest]
+            else:
+                chosen = s.frequencies
+            clocks.append(_mean(chosen))
+        peak_temps = [max(s.temperatures.values()) for s in samples if s.temperatures]
+        summary = {'samples': len(samples)}
+        known = [c for c in clocks if c is not None]
+        if known:
+            summary['freq_mhz'] = round(_mean(known), 1)
+            summary['freq_min_mhz'] = round(min(known), 1)
+            summary['freq_max_mhz'] = round(max(known), 1)
+            limits = self.sensors.max_frequencies
+            limit = _mean([limits[c] for c in cpus if c < len(limits)] if cpus else limits)
+            if limit:
+                summary['freq_ratio'] = round(summary['freq_mhz'] / limit, 3)
+            if len(known) >= 3:
+                # Relative to the run's own opening clock: all-core turbo or powersave below the advertised
+                # maximum is normal, a clock that sags while the run goes on is not
+                third = len(known) // 3
+                opening, closing = _mean(known[:third]), _mean(known[-third:])
+                summary['freq_drop'] = round(1 - closing / opening, 3) if opening else 0.0
+        if peak_temps:
+            summary['temp_max_c'] = round(max(peak_temps), 1)
+            summary['temp_mean_c'] = round(_mean(peak_temps), 1)
+        events = self._throttle_events(start, end)
+        if events is not None:
+            summary['throttle_events'] = events
+        summary['throttled'] = bool(events) or summary.get('freq_drop', 0.0) > 0.10
+        return summary
+
+    def trace(self):
+        # Compact time series for the report: offset, mean clock, hottest sensor
+        if not self.samples:
+            return {}
+        origin = self.samples[0].ts
+        points = []
+        for s in self.samples:
+            clock = _mean(s.frequencies)
+            points.append([round(s.ts - origin, 3),
+                           round(clock, 1) if clock is not None else None,
+                           round(max(s.temperatures.values()), 1) if s.temperatures else None])
+        summary = self.window(self.samples[0].ts, self.samples[-1].ts)
+        return {
+            'backend': self.sensors.name,
+            'interval': self.interval,
+            'columns': ['t', 'freq_mhz', 'temp_max_c'],
+            'points': points,
+            'summary': summary,
+        }
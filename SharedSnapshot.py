@@ -0,0 +1,331 @@
+import math
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+import psutil
+from DiskIO import DiskRate
+from MemoryPressure import Pressure
+from Sampler import Sampler, Snapshot
+from Topology import detect_topology
+
+DEFAULT_NAME = "cpu_monitor"
+MAGIC = b"CPUM"
+VERSION = 1
+
+# magic version slots slot_size n_cpus n_cores max_disks writer_pid interval head_seq
+HEADER = struct.Struct("<4sIIIIIIIdQ")
+HEAD_OFFSET = HEADER.size - 8
+# seq ts interval total | mem total available used cached percent | swap total used percent | 8 PSI/vmstat | n_disks
+SLOT_PREFIX = struct.Struct("<Qddf4Qd2Qd8fI")
+DISK_NAME = 32
+DISK = struct.Struct(f"<{DISK_NAME}s7f")
+SEQ = struct.Struct("<Q")
+
+# Readers get these instead of psutil's svmem/sswap; the fields the panels use are the same
+MemoryInfo = namedtuple("MemoryInfo", "total available used cached percent")
+SwapInfo = namedtuple("SwapInfo", "total used percent")
+
+
+def _nan(value):
+    return math.nan if value is None else value
+
+
+def _none(value):
+    return None if math.isnan(value) else value
+
+
+def _disk_name(name):
+    # Cut on a character boundary: a UTF-8 sequence split at byte DISK_NAME decodes as garbage
+    return name.encode()[:DISK_NAME].decode(errors="ignore").encode()
+
+
+def lock_path(name=DEFAULT_NAME):
+    # Next to the segment on Linux (/dev/shm) so both go away with the tmpfs
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"{name}.lock")
+
+
+def acquire_lock(path):
+    # -> open fd holding an exclusive lock, or None when another collector already owns it
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    os.ftruncate(fd, 0)
+    os.write(fd, str(os.getpid()).encode())
+    return fd
+
+
+def _attach(name):
+    # Readers must not let the resource tracker unlink the collector's segment when they exit
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name != "nt":
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class Layout:
+    def __init__(self, slots, n_cpus, n_cores, max_disks):
+        self.slots = slots
+        self.n_cpus = n_cpus
+        self.n_cores = n_cores
+        self.max_disks = max_disks
+        self.per_thread = struct.Struct(f"<{n_cpus}f")
+        self.per_core = struct.Struct(f"<{n_cores}f")
+        self.slot_size = SLOT_PREFIX.size + self.per_thread.size + self.per_core.size + DISK.size * max_disks
+        self.size = HEADER.size + self.slot_size * slots
+
+    def slot_offset(self, seq):
+        return HEADER.size + (seq % self.slots) * self.slot_size
+
+
+class SnapshotWriter:
+    def __init__(self, name, n_cpus, n_cores, interval, slots=64, max_disks=64):
+        self.layout = Layout(slots, n_cpus, n_cores, max_disks)
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.layout.size)
+        except FileExistsError:
+            # Left behind by a collector that died; the caller holds the lock, so nobody else writes it
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.layout.size)
+        self.buf = self.shm.buf
+        self.seq = 0
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, self.layout.slot_size, n_cpus, n_cores, max_disks,
+                         os.getpid(), interval, 0)
+
+    def write(self, snapshot):
+        # Seqlock per slot: odd while the slot is being written, 2*seq once complete
+        layout, buf = self.layout, self.buf
+        self.seq += 1
+        offset = layout.slot_offset(self.seq)
+        SEQ.pack_into(buf, offset, 2 * self.seq - 1)
+
+        mem, swap, pressure = snapshot.memory, snapshot.swap, snapshot.pressure
+        disks = snapshot.disks[:layout.max_disks]
+        SLOT_PREFIX.pack_into(
+            buf, offset, 2 * self.seq - 1, snapshot.ts, snapshot.interval, snapshot.total,
+            mem.total, mem.available, mem.used, getattr(mem, 'cached', 0), mem.percent,
+            swap.total, swap.used, swap.percent,
+            *(_nan(v) for v in (pressure or (None,) * len(Pressure._fields))),
+            len(disks))
+        pos = offset + SLOT_PREFIX.size
+        per_thread = (tuple(snapshot.per_thread) + (0.0,) * layout.n_cpus)[:layout.n_cpus]
+        layout.per_thread.pack_into(buf, pos, *per_thread)
+        pos += layout.per_thread.size
+        per_core = (tuple(snapshot.per_core) + (0.0,) * layout.n_cores)[:layout.n_cores]
+        layout.per_core.pack_into(buf, pos, *per_core)
+        pos += layout.per_core.size
+        for rate in disks:
+            DISK.pack_into(buf, pos, _disk_name(rate.name), *rate[1:])
+            pos += DISK.size
+
+        SEQ.pack_into(buf, offset, 2 * self.seq)
+        SEQ.pack_into(buf, HEAD_OFFSET, self.seq)
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SnapshotReader:
+    def __init__(self, name=DEFAULT_NAME):
+        self.shm = _attach(name)
+        self.buf = self.shm.buf
+        magic, version, slots, slot_size, n_cpus, n_cores, max_disks, self.writer_pid, self.interval, _ = \
+            HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Shared segment {name!r} is not a version {VERSION} snapshot ring")
+        self.layout = Layout(slots, n_cpus, n_cores, max_disks)
+
+    def head(self):
+        return SEQ.unpack_from(self.buf, HEAD_OFFSET)[0]
+
+    def read(self, retries=5):
+        # Decodes straight out of the shared buffer; a slot overwritten mid-read is retried
+        layout, buf = self.layout, self.buf
+        for _ in range(retries):
+            seq = self.head()
+            if seq == 0:
+                return None
+            offset = layout.slot_offset(seq)
+            version = SEQ.unpack_from(buf, offset)[0]
+            if version != 2 * seq:
+                continue
+            fields = SLOT_PREFIX.unpack_from(buf, offset)
+            pos = offset + SLOT_PREFIX.size
+            per_thread = layout.per_thread.unpack_from(buf, pos)
+            pos += layout.per_thread.size
+            per_core = layout.per_core.unpack_from(buf, pos)
+            pos += layout.per_core.size
+            disks = []
+            for _ in range(fields[-1]):
+                name, *rates = DISK.unpack_from(buf, pos)
+                disks.append(DiskRate(name.rstrip(b"\0").decode(), *rates))
+                pos += DISK.size
+            if SEQ.unpack_from(buf, offset)[0] != version:
+                continue
+            pressure = Pressure(*(_none(v) for v in fields[12:20]))
+            return Snapshot(
+                seq=seq,
+                ts=fields[1],
+                interval=fields[2],
+                total=fields[3],
+                per_thread=per_thread,
+                per_core=per_core,
+                memory=MemoryInfo(*fields[4:9]),
+                swap=SwapInfo(*fields[9:12]),
+                disks=tuple(disks),
+                pressure=pressure if any(v is not None for v in pressure) else None,
+            )
+        return None
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+
+class SharedSampler:
+    # Drop-in for Sampler in the GUI: panels poll `latest`, subscribers are fed from a light poll thread.
+    # If the collector dies or hangs, this switches to sampling locally instead of serving its last snapshot
+    def __init__(self, reader, max_age=5.0):
+        self.reader = reader
+        self.interval = reader.interval
+        self.max_age = max(max_age, 5 * reader.interval)
+        self.logical = reader.layout.n_cpus
+        self.topology = detect_topology(self.logical)
+        self.core_groups = self.topology.core_groups()
+        # Device filtering happens in the collector; readers see what it publishes
+        self.disk_io = None
+        self.fallback = None
+        self._cached = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def latest(self):
+        if self.fallback is not None:
+            return self.fallback.latest
+        cached = self._cached
+        if cached is None or cached.seq != self.reader.head():
+            snapshot = self.reader.read()
+            if snapshot is not None:
+                self._cached = cached = snapshot
+        if cached is not None and self._collector_gone(cached):
+            return self._fall_back()
+        return cached
+
+    @property
+    def stale(self):
+        return self.fallback is not None
+
+    def _collector_gone(self, snapshot):
+        # A killed collector leaves its last snapshot in the ring. Only a missed tick costs a pid check;
+        # a snapshot older than max_age means a hung collector even while its process exists
+        age = time.time() - snapshot.ts
+        if age <= 2 * self.interval:
+            return False
+        return age > self.max_age or not psutil.pid_exists(self.reader.writer_pid)
+
+    def _fall_back(self):
+        with self._lock:
+            if self.fallback is None:
+                print(f"Collector (pid {self.reader.writer_pid}) stopped publishing; sampling locally",
+                      file=sys.stderr)
+                self.fallback = Sampler(interval=self.interval, topology=self.topology).start()
+                self.disk_io = self.fallback.disk_io
+        return self.fallback.latest
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="shared-sampler", daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _run(self):
+        last = None
+        while not self._stop.wait(self.interval / 4):
+            snapshot = self.latest
+            # Identity, not seq: a local fallback sampler numbers its snapshots from 1 again
+            if snapshot is None or snapshot is last:
+                continue
+            last = snapshot
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for callback in subscribers:
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    print(f"Sampler subscriber error: {e}", file=sys.stderr)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        if self.fallback is not None:
+            self.fallback.stop()
+        self.reader.close()
+
+
+def attach_collector(name=DEFAULT_NAME, max_age=5.0):
+    # -> SharedSampler when a collector is publishing fresh snapshots, else None
+    try:
+        reader = SnapshotReader(name)
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+    snapshot = reader.read()
+    if snapshot is None or time.time() - snapshot.ts > max(max_age, 5 * reader.interval):
+        reader.close()
+        return None
+    return SharedSampler(reader, max_age=max_age)
+
+
+class Collector:
+    def __init__(self, name=DEFAULT_NAME, interval=1.0, slots=64, max_disks=64):
+        self.name = name
+        self.lock_fd = acquire_lock(lock_path(name))
+        if self.lock_fd is None:
+            raise RuntimeError(f"Another collector is already publishing {name!r}")
+        self.sampler = Sampler(interval=interval)
+        self.writer = SnapshotWriter(name, self.sampler.logical, len(self.sampler.core_groups), interval,
+                                     slots=slots, max_disks=max_disks)
+        self.sampler.subscribe(self.writer.write)
+
+    def start(self):
+        self.sampler.start()
+        return self
+
+    def stop(self):
+        self.sampler.stop()
+        self.writer.close()
+        # The lock file stays: unlinking it would let a new collector lock a fresh inode while another
+        # still holds the old one
+        os.close(self.lock_fd)
@@ -0,0 +1,33 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.start, time.perf_counter() - start))
+
+    def mark(self, name):
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - self.start, 0.0))
+
+    def report(self, out=sys.stderr):
+        if not self.enabled:
+            return
+        print(f"{'phase':<36}{'start ms':>10}{'took ms':>10}", file=out)
+        for name, offset, took in self.phases:
+            print(f"{name:<36}{offset * 1000:>10.1f}{took * 1000:>10.1f}", file=out)
+        print(f"{'total':<36}{(time.perf_counter() - self.start) * 1000:>10.1f}", file=out)
@@ -0,0 +1,64 @@
+import statistics
+
+
+def _rolling_median(values, width=3):
+    half = width // 2
+    return [statistics.median(values[max(0, i - half):i + half + 1]) for i in range(len(values))]
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def time_to_throttle(intervals, peak, drop=0.10, hold=3):
+    # First interval that starts a run of `hold` intervals all more than `drop` below the peak
+    limit = peak * (1 - drop)
+    run = 0
+    for i, interval in enumerate(intervals):
+        run = run + 1 if interval['ops_per_sec'] < limit else 0
+        if run == hold:
+            return intervals[i - hold + 1]['t']
+    return None
+
+
+def analyse_stress(intervals, drop=0.10, hold=3):
+    # intervals: [{'t': seconds since start, 'ops_per_sec': x, optional freq_mhz/temp_max_c/throttle_events}]
+    if not intervals:
+        raise ValueError("Stress analysis needs at least one interval")
+    rates = [i['ops_per_sec'] for i in intervals]
+    # A single lucky interval is not the peak; the best rolling median of three is
+    peak = max(_rolling_median(rates))
+    quarter = max(1, len(rates) // 4)
+    sustained = sum(rates[-quarter:]) / quarter
+    mean = sum(rates) / len(rates)
+    stdev = statistics.pstdev(rates)
+    steps = [b - a for a, b in zip(rates, rates[1:])]
+    jitter = (sum(d * d for d in steps) / len(steps)) ** 0.5 if steps else 0.0
+
+    result = {
+        'intervals': intervals,
+        'peak_ops_per_sec': round(peak, 2),
+        'sustained_ops_per_sec': round(sustained, 2),
+        'peak_to_sustained': round(peak / sustained, 3) if sustained else None,
+        'degradation_pct': round((1 - sustained / peak) * 100, 1) if peak else 0.0,
+        'time_to_throttle_s': time_to_throttle(intervals, peak, drop, hold),
+        'cv': round(stdev / mean, 4) if mean else 0.0,
+        # RMS of interval-to-interval change, relative to the mean: noise rather than the slow drift
+        'interval_jitter': round(jitter / mean, 4) if mean else 0.0,
+    }
+    first_event = next((i['t'] for i in intervals if i.get('throttle_events')), None)
+    if first_event is not None:
+        result['first_throttle_event_s'] = first_event
+        result['throttle_events'] = sum(i.get('throttle_events', 0) for i in intervals)
+    start_freq = _mean([i.get('freq_mhz') for i in intervals[:quarter]])
+    end_freq = _mean([i.get('freq_mhz') for i in intervals[-quarter:]])
+    if start_freq and end_freq:
+        result['freq_start_mhz'] = round(start_freq, 1)
+        result['freq_end_mhz'] = round(end_freq, 1)
+    temps = [i['temp_max_c'] for i in intervals if i.get('temp_max_c') is not None]
+    if temps:
+        result['temp_max_c'] = max(temps)
+        result['temp_end_c'] = round(_mean(temps[-quarter:]), 1)
+    result['throttled'] = result['time_to_throttle_s'] is not None or first_event is not None
+    return result
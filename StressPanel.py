@@ -0,0 +1,122 @@
+import threading
+from tkinter import ttk
+from Workloads import available_workloads
+from UiQueue import shared_ui_queue
+
+
+class StressPanel:
+    def __init__(self, root, runner):
+        self.root = root
+        self.ui = shared_ui_queue(root)
+        self.runner = runner
+        self.stop_event = None
+        self.intervals = []
+        self.frame = ttk.LabelFrame(root, text="🌡 Sustained Load", padding=12)
+        self.frame.pack(fill='x', padx=10, pady=10)
+
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill='x', pady=4)
+        self.workload_box = ttk.Combobox(controls, state="readonly", width=16,
+                                         values=[w.name for w in available_workloads()])
+        self.workload_box.set("hash")
+        self.workload_box.pack(side='left', padx=4)
+        ttk.Label(controls, text="Minutes:", font=("Segoe UI", 10)).pack(side='left', padx=(8, 2))
+        self.minutes = ttk.Spinbox(controls, from_=1, to=120, width=5)
+        self.minutes.set(5)
+        self.minutes.pack(side='left')
+        self.run_btn = ttk.Button(controls, text="▶ Start stress", command=self.start)
+        self.run_btn.pack(side='left', padx=8)
+        self.stop_btn = ttk.Button(controls, text="■ Stop", command=self.stop, state='disabled')
+        self.stop_btn.pack(side='left')
+        self.status_label = ttk.Label(controls, text="", font=("Segoe UI", 10, "italic"), foreground="blue")
+        self.status_label.pack(side='left', padx=8)
+
+        # matplotlib is imported on first use so it stays off the startup path
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig, self.ax = plt.subplots(figsize=(6, 2.8))
+        self.ax_freq = self.ax.twinx()
+        self.rate_line, = self.ax.plot([], [], color='#e53935', label='ops/sec')
+        self.freq_line, = self.ax_freq.plot([], [], color='#1e88e5', linestyle='--', label='MHz')
+        self.ax.set_xlabel('Seconds', fontsize=9)
+        self.ax.set_ylabel('ops/sec', fontsize=9)
+        self.ax_freq.set_ylabel('MHz', fontsize=9)
+        self.ax.legend(loc='lower left', fontsize=8)
+        self.ax_freq.legend(loc='lower right', fontsize=8)
+        self.fig.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
+        self.canvas.get_tk_widget().pack(pady=6)
+
+        self.summary_label = ttk.Label(self.frame, text="Not run", font=("Segoe UI", 10))
+        self.summary_label.pack(pady=4)
+
+    def start(self):
+        try:
+            duration = float(self.minutes.get()) * 60
+            if not duration > 0:
+                raise ValueError(duration)
+        except ValueError:
+            self.status_label.config(text="Invalid duration", foreground="red")
+            return
+        workload = self.workload_box.get()
+        self.intervals = []
+        self.stop_event = threading.Event()
+        self.run_btn.config(state='disabled')
+        self.stop_btn.config(state='normal')
+        self.status_label.config(text="Calibrating...", foreground="blue")
+
+        def on_interval(record):
+            self.ui.call(lambda: self.add_interval(record))
+
+        def task():
+            try:
+                result = self.runner.run_stress(workload, duration=duration, on_interval=on_interval,
+                                                stop=self.stop_event)
+                self.ui.call(lambda: self.show(result))
+            except Exception as e:
+                message = f"Error: {e}"
+                self.ui.call(lambda: self.status_label.config(text=message, foreground="red"))
+            finally:
+                self.ui.call(self._finished)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def _finished(self):
+        self.run_btn.config(state='normal')
+        self.stop_btn.config(state='disabled')
+
+    def stop(self):
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    def add_interval(self, record):
+        # Lines are updated in place; draw_idle coalesces redraws if Tk falls behind
+        self.intervals.append(record)
+        times = [r['t'] for r in self.intervals]
+        self.rate_line.set_data(times, [r['ops_per_sec'] for r in self.intervals])
+        clocks = [(r['t'], r['freq_mhz']) for r in self.intervals if 'freq_mhz' in r]
+        if clocks:
+            self.freq_line.set_data(*zip(*clocks))
+            self.ax_freq.relim()
+            self.ax_freq.autoscale_view()
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_ylim(bottom=0)
+        self.canvas.draw_idle()
+        temp = f" | {record['temp_max_c']:.0f} °C" if 'temp_max_c' in record else ""
+        self.status_label.config(text=f"{record['t']:.0f} s: {record['ops_per_sec']:,.0f} ops/s{temp}",
+                                 foreground="blue")
+
+    def show(self, result):
+        ttt = result['time_to_throttle_s']
+        throttle = f"dropped >10% after {ttt:.0f} s" if ttt is not None else "no sustained drop"
+        clocks = ""
+        if 'freq_start_mhz' in result:
+            clocks = f" | clock {result['freq_start_mhz']:.0f} → {result['freq_end_mhz']:.0f} MHz"
+        temp = f" | peak {result['temp_max_c']:.0f} °C" if 'temp_max_c' in result else ""
+        self.status_label.config(text="✅ Stress run complete!", foreground="blue")
+        self.summary_label.config(
+            text=f"Peak {result['peak_ops_per_sec']:,.0f} | sustained {result['sustained_ops_per_sec']:,.0f} ops/s "
+                 f"(peak/sustained {result['peak_to_sustained']}) | {throttle} | "
+                 f"jitter {result['interval_jitter']:.1%}{clocks}{temp}")
@@ -0,0 +1,119 @@
+import time
+from array import array
+
+# (resolution in seconds, capacity in buckets): 1 h of raw samples, 1 h at 10 s, 24 h at 1 min, 7 days at 10 min
+DEFAULT_TIERS = ((1, 3600), (10, 360), (60, 1440), (600, 1008))
+STATS = ("min", "avg", "max")
+
+
+class RingBuffer:
+    def __init__(self, capacity, width, typecode='f'):
+        self.capacity = capacity
+        self.width = width
+        self.data = array(typecode, [0]) * (capacity * width)
+        self.times = array('d', [0.0]) * capacity
+        self.head = 0
+        self.count = 0
+
+    def append(self, ts, row):
+        if len(row) != self.width:
+            raise ValueError(f"Expected {self.width} values, got {len(row)}")
+        base = self.head * self.width
+        self.data[base:base + self.width] = array(self.data.typecode, row)
+        self.times[self.head] = ts
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _ordered(self, values, n):
+        # values holds one entry per slot; return the newest n in chronological order
+        n = min(n, self.count)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return values[start:start + n]
+        return values[start:] + values[:self.head]
+
+    def column(self, col, n):
+        return self._ordered(self.data[col::self.width], n).tolist()
+
+    def timestamps(self, n):
+        return self._ordered(self.times, n).tolist()
+
+    def latest(self):
+        if not self.count:
+            return None
+        base = ((self.head - 1) % self.capacity) * self.width
+        return self.data[base:base + self.width].tolist()
+
+
+class RollupTier:
+    def __init__(self, resolution, capacity, width):
+        self.resolution = resolution
+        self.width = width
+        # One row per bucket laid out as [min * width, avg * width, max * width]
+        self.buffer = RingBuffer(capacity, width * 3)
+        self.bucket = None
+        self.n = 0
+        self.sums = [0.0] * width
+        self.mins = [0.0] * width
+        self.maxs = [0.0] * width
+
+    def add(self, ts, row):
+        bucket = int(ts // self.resolution)
+        if self.bucket is not None and bucket != self.bucket:
+            self.flush()
+        self.bucket = bucket
+        if self.n == 0:
+            self.sums = list(row)
+            self.mins = list(row)
+            self.maxs = list(row)
+        else:
+            sums, mins, maxs = self.sums, self.mins, self.maxs
+            for i, v in enumerate(row):
+                sums[i] += v
+                if v < mins[i]:
+                    mins[i] = v
+                elif v > maxs[i]:
+                    maxs[i] = v
+        self.n += 1
+
+    def flush(self):
+        if not self.n:
+            return
+        avgs = [s / self.n for s in self.sums]
+        self.buffer.append(self.bucket * self.resolution, self.mins + avgs + self.maxs)
+        self.n = 0
+
+    def column(self, col, n, stat="avg"):
+        return self.buffer.column(STATS.index(stat) * self.width + col, n)
+
+
+class TimeSeriesStore:
+    def __init__(self, width, tiers=DEFAULT_TIERS):
+        self.width = width
+        self.raw_resolution, raw_capacity = tiers[0]
+        self.raw = RingBuffer(raw_capacity, width)
+        self.tiers = {res: RollupTier(res, cap, width) for res, cap in tiers[1:]}
+
+    def append(self, row, ts=None):
+        ts = time.time() if ts is None else ts
+        self.raw.append(ts, row)
+        for tier in self.tiers.values():
+            tier.add(ts, row)
+
+    def window(self, resolution, col, n, stat="avg", pad=0.0):
+        # Newest n points of one column from the matching tier, left-padded to n for fixed-width charts
+        if resolution == self.raw_resolution:
+            values = self.raw.column(col, n)
+        else:
+            values = self.tiers[resolution].column(col, n, stat)
+        if len(values) < n:
+            values = [pad] * (n - len(values)) + values
+        return values
+
+    def memory_bytes(self):
+        total = self.raw.data.itemsize * len(self.raw.data) + 8 * self.raw.capacity
+        for tier in self.tiers.values():
+            buf = tier.buffer
+            total += buf.data.itemsize * len(buf.data) + 8 * buf.capacity
+        return total
@@ -0,0 +1,243 @@
+import os
+from collections import namedtuple
+
+SYS_CPU = "/sys/devices/system/cpu"
+
+LogicalCpu = namedtuple("LogicalCpu", "cpu package die core siblings core_type l2 l3")
+
+
+def parse_cpu_list(text):
+    # "0-3,8,10-11" -> [0, 1, 2, 3, 8, 10, 11]
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            low, high = part.split("-")
+            cpus.extend(range(int(low), int(high) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def format_cpu_list(cpus):
+    # [0, 1, 2, 3, 8, 10, 11] -> "0-3,8,10-11"
+    parts = []
+    for cpu in sorted(cpus):
+        if parts and cpu == parts[-1][1] + 1:
+            parts[-1][1] = cpu
+        else:
+            parts.append([cpu, cpu])
+    return ",".join(f"{low}-{high}" if high > low else str(low) for low, high in parts)
+
+
+def _read(path, default=None):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def _read_int(path, default=-1):
+    value = _read(path)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class CpuTopology:
+    def __init__(self, cpus):
+        self.cpus = {c.cpu: c for c in cpus}
+        groups = {}
+        for c in sorted(cpus, key=lambda c: (c.package, c.die, c.core, c.cpu)):
+            groups.setdefault((c.package, c.die, c.core), []).append(c.cpu)
+        self.cores = [(key, tuple(members)) for key, members in groups.items()]
+        # Per-CPU sample arrays (psutil, /proc/stat) are indexed by position among online CPUs, not by CPU id
+        self.positions = {cpu: i for i, cpu in enumerate(sorted(self.cpus))}
+        self.cpus_by_position = sorted(self.cpus)
+
+    @property
+    def packages(self):
+        return sorted({c.package for c in self.cpus.values()})
+
+    def core_groups(self):
+        return tuple(tuple(self.positions[cpu] for cpu in members) for _, members in self.cores)
+
+    def spread_order(self):
+        # Positions ordered so the first N cover N distinct physical cores before any SMT sibling is reused
+        groups = self.core_groups()
+        order = []
+        for rank in range(max((len(g) for g in groups), default=0)):
+            order.extend(g[rank] for g in groups if rank < len(g))
+        return order
+
+    def core_label(self, index):
+        (package, die, core), members = self.cores[index]
+        core_type = self.cpus[members[0]].core_type
+        prefix = f"{core_type}-core" if core_type else "Core"
+        socket = f"S{package} " if len(self.packages) > 1 else ""
+        return f"{socket}{prefix} {core}"
+
+    def cache_groups(self, level):
+        groups = {}
+        for c in self.cpus.values():
+            key = getattr(c, f"l{level}")
+            if key is not None:
+                groups.setdefault(key, []).append(c.cpu)
+        return [tuple(sorted(v)) for v in groups.values()]
+
+    def summary(self):
+        types = {}
+        for c in self.cpus.values():
+            if c.core_type:
+                types[c.core_type] = types.get(c.core_type, 0) + 1
+        return {
+            'packages': len(self.packages),
+            'physical_cores': len(self.cores),
+            'logical_cpus': len(self.cpus),
+            'smt': max((len(m) for _, m in self.cores), default=1),
+            'core_types': types,
+            'l2_groups': len(self.cache_groups(2)),
+            'l3_groups': len(self.cache_groups(3)),
+        }
+
+
+def _hybrid_types(devices="/sys/devices"):
+    # Intel hybrid parts expose the P- and E-core sets as separate PMU devices
+    types = {}
+    for name, label in (("cpu_core", "P"), ("cpu_atom", "E")):
+        text = _read(os.path.join(devices, name, "cpus"))
+        if text:
+            for cpu in parse_cpu_list(text):
+                types[cpu] = label
+    return types
+
+
+def _cache_ids(cpu_dir):
+    ids = {}
+    cache_dir = os.path.join(cpu_dir, "cache")
+    try:
+        entries = sorted(os.listdir(cache_dir))
+    except OSError:
+        return ids
+    for entry in entries:
+        if not entry.startswith("index"):
+            continue
+        path = os.path.join(cache_dir, entry)
+        if _read(os.path.join(path, "type")) == "Instruction":
+            continue
+        level = _read_int(os.path.join(path, "level"))
+        shared = _read(os.path.join(path, "shared_cpu_list"))
+        if level in (2, 3) and shared:
+            ids[level] = shared
+    return ids
+
+
+def parse_size(text):
+    # sysfs and cpuinfo cache sizes: "48K", "2048K", "30 MiB", "512 KB" or a plain byte count
+    if text is None:
+        return None
+    if isinstance(text, int):
+        return text
+    text = str(text).strip().upper().replace("IB", "").replace("B", "").replace(" ", "")
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    try:
+        if text[-1:] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        return None
+
+
+def read_cache_levels(cpu=0, root=SYS_CPU):
+    # Data/unified caches as the kernel declares them for one CPU, smallest level first
+    levels = []
+    cache_dir = os.path.join(root, f"cpu{cpu}", "cache")
+    try:
+        entries = sorted(os.listdir(cache_dir))
+    except OSError:
+        return levels
+    for entry in entries:
+        if not entry.startswith("index"):
+            continue
+        path = os.path.join(cache_dir, entry)
+        kind = _read(os.path.join(path, "type"))
+        if kind == "Instruction":
+            continue
+        shared = _read(os.path.join(path, "shared_cpu_list"))
+        levels.append({
+            'level': _read_int(os.path.join(path, "level")),
+            'type': kind,
+            'size': parse_size(_read(os.path.join(path, "size"))),
+            'line_size': _read_int(os.path.join(path, "coherency_line_size"), 64),
+            'shared_cpus': len(parse_cpu_list(shared)) if shared else 1,
+        })
+    levels.sort(key=lambda c: c['level'])
+    return levels
+
+
+def declared_caches(cpu_info=None):
+    # sysfs first; py-cpuinfo's l1/l2/l3 fields where there is no sysfs (Windows, macOS)
+    levels = read_cache_levels()
+    if levels or cpu_info is None:
+        return levels
+    for level, key in ((1, 'l1_data_cache_size'), (2, 'l2_cache_size'), (3, 'l3_cache_size')):
+        size = parse_size(cpu_info.get(key))
+        if size:
+            levels.append({'level': level, 'type': "Data" if level == 1 else "Unified", 'size': size,
+                           'line_size': cpu_info.get('l2_cache_line_size') or 64, 'shared_cpus': None})
+    return levels
+
+
+def read_sysfs_topology(root=SYS_CPU):
+    online = _read(os.path.join(root, "online"))
+    if online is None:
+        return None
+    hybrid = _hybrid_types()
+    cpus = []
+    for cpu in parse_cpu_list(online):
+        cpu_dir = os.path.join(root, f"cpu{cpu}")
+        topo = os.path.join(cpu_dir, "topology")
+        siblings = _read(os.path.join(topo, "thread_siblings_list")) or _read(os.path.join(topo, "core_cpus_list"))
+        caches = _cache_ids(cpu_dir)
+        cpus.append(LogicalCpu(
+            cpu=cpu,
+            package=max(0, _read_int(os.path.join(topo, "physical_package_id"), 0)),
+            die=max(0, _read_int(os.path.join(topo, "die_id"), 0)),
+            core=_read_int(os.path.join(topo, "core_id"), cpu),
+            siblings=tuple(parse_cpu_list(siblings)) if siblings else (cpu,),
+            core_type=hybrid.get(cpu),
+            l2=caches.get(2),
+            l3=caches.get(3),
+        ))
+    return CpuTopology(cpus) if cpus else None
+
+
+def contiguous_topology(logical, physical):
+    # Fallback for platforms without sysfs: assume siblings are numbered next to each other
+    physical = physical or 1
+    threads_per_core = max(1, logical // physical)
+    cpus = []
+    for cpu in range(logical):
+        core = cpu // threads_per_core
+        siblings = tuple(range(core * threads_per_core, (core + 1) * threads_per_core))
+        cpus.append(LogicalCpu(cpu, 0, 0, core, siblings, None, None, None))
+    return CpuTopology(cpus)
+
+
+def detect_topology(logical=None, physical=None):
+    topology = None
+    if os.path.isdir(SYS_CPU):
+        try:
+            topology = read_sysfs_topology()
+        except Exception:
+            topology = None
+    if topology is None:
+        if logical is None:
+            import psutil
+            logical = psutil.cpu_count(logical=True) or 1
+            physical = psutil.cpu_count(logical=False) or 1
+        topology = contiguous_topology(logical, physical)
+    return topology
@@ -0,0 +1,45 @@
+import queue
+import sys
+
+
+class UiQueue:
+    # Tk is not thread-safe, and root.after() from a worker thread fails outright before mainloop starts.
+    # Worker threads only put callables on a queue.Queue; the Tk thread drains it on its own timer
+    def __init__(self, root, interval_ms=50):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue = queue.Queue()
+        self.after_id = self.root.after(self.interval_ms, self._drain)
+
+    def call(self, fn, *args):
+        # Safe from any thread; fn(*args) runs on the Tk thread within interval_ms
+        self._queue.put((fn, args))
+
+    def _drain(self):
+        while True:
+            try:
+                fn, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                # One failing update must not stop the drain loop for every other panel
+                print(f"UI update error: {e}", file=sys.stderr)
+        self.after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+
+_shared = None
+
+
+def shared_ui_queue(widget):
+    # Create from the Tk thread (a panel's __init__); the queue then serves every panel of that window
+    global _shared
+    if _shared is None:
+        _shared = UiQueue(widget.winfo_toplevel())
+    return _shared
@@ -0,0 +1,201 @@
+import hashlib
+import importlib.util
+import json
+import lzma
+import math
+import os
+import random
+import re
+import zlib
+
+# NumPy is optional and slow to import, so it is only loaded when a NumPy workload is prepared
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# Scores are per worker: a multithreaded BLAS would turn the single-core matmul into a multi-core one and
+# oversubscribe the CPUs N workers x N threads. The pools size themselves when numpy is first imported,
+# so this has to run before that, in this process and (inherited) in every benchmark worker
+NATIVE_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS",
+                      "NUMEXPR_NUM_THREADS")
+for _var in NATIVE_THREAD_VARS:
+    os.environ[_var] = "1"
+
+
+def _numpy():
+    import numpy
+    return numpy
+
+
+class Workload:
+    def __init__(self, name, title, run, setup=None, iterations=1000, weight=1.0,
+                 reference=1.0, unit="ops/sec", requires_numpy=False):
+        self.name = name
+        self.title = title
+        self.run = run
+        self.setup = setup
+        self.iterations = iterations
+        self.weight = weight
+        # Single-core score of the reference machine, used to normalise the composite
+        self.reference = reference
+        self.unit = unit
+        self.requires_numpy = requires_numpy
+        self._state = None
+
+    def available(self):
+        return HAVE_NUMPY or not self.requires_numpy
+
+    def prepare(self):
+        if self._state is None and self.setup:
+            self._state = self.setup()
+        return self._state
+
+    def execute(self, iterations=None):
+        self.run(self.prepare(), iterations or self.iterations)
+
+
+WORKLOADS = {}
+
+
+def register(workload):
+    WORKLOADS[workload.name] = workload
+    return workload
+
+
+def get_workload(name):
+    try:
+        return WORKLOADS[name]
+    except KeyError:
+        raise ValueError(f"Unknown workload: {name}") from None
+
+
+def available_workloads():
+    return [w for w in WORKLOADS.values() if w.available()]
+
+
+def skipped_workloads():
+    # -> {name: reason} for workloads this interpreter cannot run; composites without them are not comparable
+    return {w.name: "numpy is not installed" for w in WORKLOADS.values() if not w.available()}
+
+
+def composite_score(scores):
+    # Weighted geometric mean of score/reference ratios, scaled so the reference machine scores 1000
+    total_weight = 0.0
+    log_sum = 0.0
+    for name, score in scores.items():
+        workload = WORKLOADS.get(name)
+        if workload is None or not score or score <= 0:
+            continue
+        log_sum += workload.weight * math.log(score / workload.reference)
+        total_weight += workload.weight
+    if not total_weight:
+        return 0.0
+    return round(1000 * math.exp(log_sum / total_weight), 1)
+
+
+# --- Workload implementations ---
+
+def _run_hash(state, iterations):
+    for _ in range(iterations):
+        hashlib.sha256(b"benchmark").hexdigest()
+
+
+def _run_integer(state, iterations):
+    # Collatz walks: integer arithmetic with unpredictable branches
+    total = 0
+    for seed in range(1, iterations + 1):
+        n = seed
+        while n != 1:
+            n = n // 2 if n % 2 == 0 else 3 * n + 1
+            total += 1
+    return total
+
+
+def _setup_matmul():
+    rng = _numpy().random.default_rng(42)
+    return rng.random((256, 256)), rng.random((256, 256))
+
+
+def _run_matmul(state, iterations):
+    a, b = state
+    for _ in range(iterations):
+        a @ b
+
+
+def _setup_fft():
+    np = _numpy()
+    return np.fft.rfft, np.random.default_rng(42).random(1 << 16)
+
+
+def _run_fft(state, iterations):
+    rfft, signal = state
+    for _ in range(iterations):
+        rfft(signal)
+
+
+def _setup_compress():
+    rng = random.Random(42)
+    words = [b"cpu", b"monitor", b"benchmark", b"thread", b"core", b"cache", b"memory", b"disk"]
+    return b" ".join(rng.choice(words) for _ in range(64 * 1024))
+
+
+def _run_zlib(state, iterations):
+    for _ in range(iterations):
+        zlib.decompress(zlib.compress(state, 6))
+
+
+def _run_lzma(state, iterations):
+    for _ in range(iterations):
+        lzma.decompress(lzma.compress(state, preset=1))
+
+
+def _setup_json():
+    rng = random.Random(42)
+    return [{"id": i, "name": f"host-{i}", "load": rng.random(), "tags": ["a", "b", "c"],
+             "cores": [rng.randint(0, 100) for _ in range(8)]} for i in range(500)]
+
+
+def _run_json(state, iterations):
+    for _ in range(iterations):
+        json.loads(json.dumps(state))
+
+
+def _setup_regex():
+    rng = random.Random(42)
+    lines = [f"2024-01-{rng.randint(1, 28):02d} host-{rng.randint(1, 999)} cpu={rng.random() * 100:.1f}% "
+             f"user=u{rng.randint(1, 50)}@example.com" for _ in range(2000)]
+    return re.compile(r"host-(\d+) cpu=([\d.]+)% user=(\w+)@([\w.]+)"), "\n".join(lines)
+
+
+def _run_regex(state, iterations):
+    pattern, text = state
+    for _ in range(iterations):
+        pattern.findall(text)
+
+
+def _setup_sort():
+    rng = random.Random(42)
+    return [rng.random() for _ in range(200000)]
+
+
+def _run_sort(state, iterations):
+    for _ in range(iterations):
+        sorted(state)
+
+
+register(Workload("hash", "SHA-256", _run_hash, iterations=1000000, weight=1.0,
+                  reference=1200000, unit="hashes/sec"))
+register(Workload("integer", "Integer/branchy", _run_integer, iterations=40000, weight=1.5,
+                  reference=80000))
+register(Workload("matmul", "NumPy matmul", _run_matmul, setup=_setup_matmul, iterations=200,
+                  weight=1.0, reference=600, requires_numpy=True))
+register(Workload("fft", "NumPy FFT", _run_fft, setup=_setup_fft, iterations=500, weight=1.0,
+                  reference=1000, requires_numpy=True))
+register(Workload("zlib", "zlib", _run_zlib, setup=_setup_compress, iterations=40, weight=1.0,
+                  reference=60))
+register(Workload("lzma", "LZMA", _run_lzma, setup=_setup_compress, iterations=20, weight=0.5,
+                  reference=40))
+register(Workload("json", "JSON", _run_json, setup=_setup_json, iterations=200, weight=1.0,
+                  reference=250))
+register(Workload("regex", "Regex", _run_regex, setup=_setup_regex, iterations=400, weight=1.0,
+                  reference=600))
+register(Workload("sort", "Sort", _run_sort, setup=_setup_sort, iterations=20, weight=1.0,
+                  reference=20))
@@ -1,20 +1,15 @@
 import sys
 import platform
-import threading
-import tkinter as tk
-from tkinter import ttk, messagebox
-import cpuinfo
-import psutil
-from BenchmarkRunner import BenchmarkRunner
-from LiveChart import LiveChart
-from Motherboard import MotherboardInfo
 import ctypes
-from ctypes import wintypes
-from Ram import RamInfo, RamDetailedInfo
-from Disk import DiskInfo
+import threading
+from BenchmarkCli import (build_parser, run_bench, run_history, run_export, run_collect, run_snapshot,
+                          run_agent, run_aggregate, run_record, run_replay)
+from StartupProfile import StartupProfiler
 
 
 def check_single_instance():
+    from ctypes import wintypes
+
     mutex_name = "cpu_benchmark_unique_mutex_12345"
     kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
 
@@ -33,12 +28,47 @@ def check_single_instance():
     return True
 
 
-def run_gui():
-    if not check_single_instance():
+def run_gui(chart_renderer="blit", debug_render=False, heatmap_threshold=32, profile_startup=False,
+            metrics_port=None, fleet_port=None, record=None, replay=None, speed=1.0):
+    profiler = StartupProfiler(profile_startup)
+
+    # GUI-only dependencies are imported here so the headless bench command runs without Tk or WMI.
+    # Panel modules are imported by their factories below, when the panel is first scrolled into view.
+    with profiler.phase("import tkinter"):
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+    with profiler.phase("import psutil"):
+        import psutil
+    with profiler.phase("import benchmark/history"):
+        from BenchmarkRunner import BenchmarkRunner
+        from Workloads import available_workloads
+        from History import BenchmarkHistory
+        from LazyPanels import LazyPanels
+        from CpuInfoCache import load_cached, get_cpu_info
+        from Topology import declared_caches
+        from CacheProbe import format_size
+    with profiler.phase("import sampler/inventory"):
+        from Sampler import shared_sampler
+        from SharedSnapshot import attach_collector
+        from Inventory import shared_inventory
+        from UiQueue import shared_ui_queue
+
+    # With a collector running, any number of windows read its shared memory ring; without one this
+    # window samples for itself and stays the only instance
+    with profiler.phase("attach collector"):
+        collector = attach_collector() if replay is None else None
+    if collector is None and replay is None and platform.system() == "Windows" and not check_single_instance():
         messagebox.showwarning("Already Running", "Another instance of this app is already running.")
         sys.exit(0)
 
-    root = tk.Tk()
+    # Hardware inventory is queried concurrently in the background while the window is built
+    with profiler.phase("inventory prefetch"):
+        inventory = shared_inventory()
+        inventory.prefetch()
+
+    with profiler.phase("create Tk root"):
+        root = tk.Tk()
+    ui = shared_ui_queue(root)
     root.title("Universal CPU Benchmark & Monitor")
     root.geometry("640x720")
     root.configure(bg="#f9f9f9")
@@ -50,7 +80,13 @@ def run_gui():
 
     scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
     canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
+
+    def on_scroll(first, last):
+        scrollbar.set(first, last)
+        lazy.schedule()
+
+    canvas.configure(yscrollcommand=on_scroll)
+    lazy = LazyPanels(canvas, scrollable_frame)
 
     canvas.pack(side="left", fill="both", expand=True)
     scrollbar.pack(side="right", fill="y")
@@ -63,18 +99,32 @@ def run_gui():
     style.configure('TLabelframe', background="#f9f9f9", borderwidth=2, relief="ridge")
     style.configure('TLabelframe.Label', background="#f9f9f9", font=("Segoe UI", 12, "bold"))
 
-    cpu_name = cpuinfo.get_cpu_info().get('brand_raw', 'Unknown CPU')
     physical = psutil.cpu_count(logical=False) or 1
     logical = psutil.cpu_count(logical=True) or 1
 
-    ttk.Label(scrollable_frame, text=f"🧠 CPU: {cpu_name}", font=("Segoe UI", 13, "bold")).pack(pady=8)
+    # CPUID probing takes about a second; use the on-disk cache or fill the name in once probing finishes
+    with profiler.phase("cpuinfo cache"):
+        cached = load_cached()
+    cpu_text = f"🧠 CPU: {cached.get('brand_raw', 'Unknown CPU')}" if cached else "🧠 CPU: Detecting..."
+    cpu_label = ttk.Label(scrollable_frame, text=cpu_text, font=("Segoe UI", 13, "bold"))
+    cpu_label.pack(pady=8)
+    if cached is None:
+        def detect_cpu():
+            name = get_cpu_info().get('brand_raw', 'Unknown CPU')
+            ui.call(lambda: cpu_label.config(text=f"🧠 CPU: {name}"))
+        threading.Thread(target=detect_cpu, daemon=True).start()
     ttk.Label(scrollable_frame, text=f"🧩 Physical Cores: {physical} | Threads: {logical}",
               font=("Segoe UI", 11)).pack()
+    caches = declared_caches(cached)
+    if caches:
+        names = [f"L{c['level']}{'d' if c['type'] == 'Data' else ''} {format_size(c['size'])}" for c in caches]
+        ttk.Label(scrollable_frame, text="🗄 Caches: " + " | ".join(names), font=("Segoe UI", 10)).pack()
     ttk.Label(scrollable_frame, text="").pack()
 
     # Benchmark section
     result_labels = {}
-    benchmark_runner = BenchmarkRunner(result_labels, logical)
+    history = BenchmarkHistory()
+    benchmark_runner = BenchmarkRunner(result_labels, logical, history=history)
 
     btn = ttk.Button(scrollable_frame, text="▶ Run CPU Benchmark")
     btn.pack(pady=12)
@@ -87,10 +137,18 @@ def run_gui():
         status_label.config(text="Running benchmark... Please wait.")
 
         def finished():
-            status_label.config(text="✅ Benchmark complete!")
+            if benchmark_runner.last_error:
+                status_label.config(text=f"Benchmark failed: {benchmark_runner.last_error}", foreground="red")
+                btn.config(state='normal')
+                return
+            status_label.config(text="✅ Benchmark complete!", foreground="blue")
+            if lazy.get("history"):
+                lazy.get("history").refresh()
+            if exporter is not None and benchmark_runner.last_report:
+                exporter.set_report(benchmark_runner.last_report)
             btn.config(state='normal')
 
-        benchmark_runner.start_benchmark(callback=finished)
+        benchmark_runner.start_benchmark(callback=finished, dispatch=ui.call)
 
     btn.config(command=on_benchmark_start)
 
@@ -117,37 +175,227 @@ def run_gui():
     result_labels['multi_score'] = ttk.Label(results_frame, text="Not run", font=label_font, foreground="#8BC34A")
     result_labels['multi_score'].grid(row=2, column=2, padx=10, pady=6)
 
-    # Motherboard info (now styled)
-    mb_info = MotherboardInfo(scrollable_frame)
-    
-    # Add below motherboard info in your GUI setup
-    ram_info = RamInfo(scrollable_frame)
-    
-    # inside your GUI code, add
-    ram_details = RamDetailedInfo(scrollable_frame)
-    
-    #Disk Information
-    disk_info = DiskInfo(scrollable_frame)
-    
-
-    
-    # Live chart for CPU usage
-    chart = LiveChart(scrollable_frame)
-
-    
-    
+    ttk.Label(results_frame, text="Speedup (efficiency):", font=label_font).grid(row=3, column=0, sticky='w', padx=10, pady=6)
+    result_labels['speedup'] = ttk.Label(results_frame, text="Not run", font=label_font, foreground="#9C27B0")
+    result_labels['speedup'].grid(row=3, column=2, padx=10, pady=6)
+
+    ttk.Label(results_frame, text="Per-worker (hashes/sec):", font=label_font).grid(row=4, column=0, sticky='w', padx=10, pady=6)
+    result_labels['per_worker'] = ttk.Label(results_frame, text="Not run", font=label_font, foreground="#607D8B")
+    result_labels['per_worker'].grid(row=4, column=2, padx=10, pady=6)
+
+    ttk.Label(results_frame, text="Clock / peak temp:", font=label_font).grid(row=5, column=0, sticky='w', padx=10, pady=6)
+    result_labels['clock_single'] = ttk.Label(results_frame, text="Not run", font=label_font, foreground="#795548")
+    result_labels['clock_single'].grid(row=5, column=1, padx=10, pady=6)
+    result_labels['clock_multi'] = ttk.Label(results_frame, text="Not run", font=label_font, foreground="#795548")
+    result_labels['clock_multi'].grid(row=5, column=2, padx=10, pady=6)
+
+    ttk.Separator(results_frame, orient='horizontal').grid(row=6, column=0, columnspan=3, sticky='ew', pady=6)
+    ttk.Label(results_frame, text="Workload (ops/sec)", font=header_font).grid(row=7, column=0, sticky='w', padx=10, pady=6)
+
+    row = 8
+    for workload in available_workloads():
+        if workload.name == "hash":
+            continue
+        ttk.Label(results_frame, text=f"{workload.title}:", font=label_font).grid(row=row, column=0, sticky='w', padx=10, pady=4)
+        result_labels[f"{workload.name}_single"] = ttk.Label(results_frame, text="Not run", font=label_font, foreground="#03A9F4")
+        result_labels[f"{workload.name}_single"].grid(row=row, column=1, padx=10, pady=4)
+        result_labels[f"{workload.name}_multi"] = ttk.Label(results_frame, text="Not run", font=label_font, foreground="#8BC34A")
+        result_labels[f"{workload.name}_multi"].grid(row=row, column=2, padx=10, pady=4)
+        row += 1
+
+    ttk.Label(results_frame, text="Composite score:", font=header_font).grid(row=row, column=0, sticky='w', padx=10, pady=8)
+    result_labels['composite_single'] = ttk.Label(results_frame, text="Not run", font=header_font, foreground="#E91E63")
+    result_labels['composite_single'].grid(row=row, column=1, padx=10, pady=8)
+    result_labels['composite_multi'] = ttk.Label(results_frame, text="Not run", font=header_font, foreground="#E91E63")
+    result_labels['composite_multi'].grid(row=row, column=2, padx=10, pady=8)
+
+    # One background sampler feeds every live panel; a replay stands in for it with recorded snapshots
+    if replay is not None:
+        from Recording import Recording, ReplaySampler
+        try:
+            recording = Recording(replay)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Replay", f"Cannot open recording {replay}: {e}")
+            sys.exit(1)
+        if not recording.index:
+            messagebox.showerror("Replay", f"{replay} has no complete chunks yet")
+            sys.exit(1)
+        sampler = ReplaySampler(recording, speed=speed)
+    else:
+        sampler = collector or shared_sampler()
+
+    recorder = None
+    if record is not None and replay is None:
+        from Recording import MetricRecorder
+        try:
+            recorder = MetricRecorder(record, sampler).start()
+        except (OSError, ValueError) as e:
+            messagebox.showwarning("Recording", f"Cannot record to {record}: {e}")
+
+    exporter = None
+    if metrics_port is not None:
+        from MetricsExporter import MetricsExporter
+        exporter = MetricsExporter(sampler, port=metrics_port)
+        try:
+            exporter.start()
+        except OSError as e:
+            messagebox.showwarning("Metrics exporter", f"Cannot listen on port {metrics_port}: {e}")
+            exporter = None
+
+    if exporter is not None:
+        # Serve the last stored scores until a benchmark runs; host_info() may wait on the inventory
+        def load_scores():
+            try:
+                from Report import host_info
+                fingerprint = host_info()['fingerprint']
+                if exporter.scores_ts is None:
+                    exporter.load_history(history, fingerprint)
+            except Exception as e:
+                print(f"Could not read benchmark scores from history: {e}", file=sys.stderr)
+
+        threading.Thread(target=load_scores, name="metrics-history", daemon=True).start()
+
+    aggregator = None
+    if fleet_port is not None:
+        from Fleet import FleetAggregator
+        try:
+            aggregator = FleetAggregator(port=fleet_port).start()
+        except OSError as e:
+            messagebox.showwarning("Fleet overview", f"Cannot listen on port {fleet_port}: {e}")
+
+    # Panels below the results grid are built lazily as they scroll into view
+    def scaling_panel(parent):
+        from ScalingPanel import ScalingPanel
+        return ScalingPanel(parent, benchmark_runner)
+
+    def stress_panel(parent):
+        from StressPanel import StressPanel
+        return StressPanel(parent, benchmark_runner)
+
+    def cache_panel(parent):
+        from CachePanel import CachePanel
+        return CachePanel(parent, cpu_info=cached)
+
+    def history_panel(parent):
+        from HistoryPanel import HistoryPanel
+        return HistoryPanel(parent, history)
+
+    def motherboard_panel(parent):
+        from Motherboard import MotherboardInfo
+        return MotherboardInfo(parent, inventory=inventory)
+
+    def ram_panel(parent):
+        from Ram import RamInfo
+        from ProcessScanner import shared_process_scanner
+        # Recordings hold no process rows; live ones would not belong to the replayed time
+        scanner = shared_process_scanner(sampler) if replay is None else None
+        return RamInfo(parent, sampler=sampler, scanner=scanner)
+
+    def ram_details_panel(parent):
+        from Ram import RamDetailedInfo
+        return RamDetailedInfo(parent, inventory=inventory)
+
+    def disk_panel(parent):
+        from Disk import DiskInfo
+        return DiskInfo(parent, inventory=inventory)
+
+    def disk_io_panel(parent):
+        from DiskIoPanel import DiskIoPanel
+        return DiskIoPanel(parent, sampler)
+
+    def process_panel(parent):
+        from ProcessPanel import ProcessPanel
+        from ProcessScanner import shared_process_scanner
+        return ProcessPanel(parent, sampler, shared_process_scanner(sampler))
+
+    def chart_panel(parent):
+        from LiveChart import LiveChart
+        return LiveChart(parent, renderer=chart_renderer, debug=debug_render, sampler=sampler,
+                         heatmap_threshold=heatmap_threshold)
+
+    def fleet_panel(parent):
+        from FleetPanel import FleetPanel
+        return FleetPanel(parent, aggregator)
+
+    def replay_panel(parent):
+        from ReplayPanel import ReplayPanel
+        return ReplayPanel(parent, sampler)
+
+    if replay is not None:
+        lazy.add("replay", replay_panel, height=160)
+    if aggregator is not None:
+        lazy.add("fleet", fleet_panel, height=400)
+    lazy.add("scaling", scaling_panel, height=380)
+    lazy.add("stress", stress_panel, height=400)
+    lazy.add("caches", cache_panel, height=400)
+    lazy.add("history", history_panel, height=360)
+    lazy.add("motherboard", motherboard_panel, height=200)
+    lazy.add("ram", ram_panel, height=480)
+    lazy.add("ram_details", ram_details_panel, height=260)
+    lazy.add("disk", disk_panel, height=320)
+    lazy.add("disk_io", disk_io_panel, height=260)
+    lazy.add("chart", chart_panel, height=600)
+    if replay is None:
+        lazy.add("processes", process_panel, height=320)
+
     def on_close():
-        chart.stop()
+        for name in ("chart", "ram", "disk_io", "processes", "fleet", "stress", "replay"):
+            if lazy.get(name):
+                lazy.get(name).stop()
+        if exporter is not None:
+            exporter.stop()
+        if aggregator is not None:
+            aggregator.stop()
+        if recorder is not None:
+            recorder.stop()
+        sampler.stop()
+        inventory.shutdown()
+        history.close()
+        ui.stop()
 
         root.destroy()
         sys.exit(0)
 
+    def window_shown():
+        profiler.mark("window shown")
+        profiler.report()
+
     root.protocol("WM_DELETE_WINDOW", on_close)
+    root.after_idle(window_shown)
     root.mainloop()
 
 
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "bench":
+        return run_bench(args)
+    if args.command == "history":
+        return run_history(args)
+    if args.command == "export":
+        return run_export(args)
+    if args.command == "collect":
+        return run_collect(args)
+    if args.command == "snapshot":
+        return run_snapshot(args)
+    if args.command == "record":
+        return run_record(args)
+    if args.command == "replay":
+        return run_replay(args)
+    if args.command == "agent":
+        return run_agent(args)
+    if args.command == "aggregate":
+        return run_aggregate(args)
+    run_gui(chart_renderer=getattr(args, "chart_renderer", "blit"),
+            debug_render=getattr(args, "debug_render", False),
+            heatmap_threshold=getattr(args, "heatmap_threshold", 32),
+            profile_startup=getattr(args, "profile_startup", False),
+            metrics_port=getattr(args, "metrics_port", None),
+            fleet_port=getattr(args, "fleet_port", None),
+            record=getattr(args, "record", None),
+            replay=getattr(args, "replay", None),
+            speed=getattr(args, "speed", 1.0))
+    return 0
+
+
 if __name__ == "__main__":
-    if platform.system() != "Windows":
-        print("This app is for Windows only.")
-    else:
-        run_gui()
+    sys.exit(main())
@@ -1,4 +1,3 @@
-import clr
 import os
 import sys
 
@@ -6,24 +5,49 @@ import sys
 script_dir = os.path.dirname(os.path.abspath(__file__))
 dll_path = os.path.join(script_dir, "OpenHardwareMonitorLib.dll")
 
-sys.path.append(script_dir)
-clr.AddReference("OpenHardwareMonitorLib")
+_computer = None
+_hardware = None
 
-from OpenHardwareMonitor import Hardware
 
-# Initialize OpenHardwareMonitor Computer instance
-computer = Hardware.Computer()
-computer.CPUEnabled = True
-computer.Open()
+def computer():
+    # pythonnet and the DLL are loaded on first use, not at import
+    global _computer, _hardware
+    if _computer is None:
+        import clr
+        sys.path.append(script_dir)
+        clr.AddReference("OpenHardwareMonitorLib")
+        from OpenHardwareMonitor import Hardware
+
+        # Initialize OpenHardwareMonitor Computer instance
+        instance = Hardware.Computer()
+        instance.CPUEnabled = True
+        instance.Open()
+        _hardware, _computer = Hardware, instance
+    return _computer
+
+
+def read_cpu_sensors():
+    # -> ({sensor name: °C}, [core clock MHz]) for every CPU temperature and clock sensor in one update
+    temperatures, clocks = {}, []
+    for hw in computer().Hardware:
+        if hw.HardwareType == _hardware.HardwareType.CPU:
+            hw.Update()
+            for sensor in hw.Sensors:
+                if sensor.Value is None:
+                    continue
+                if sensor.SensorType == _hardware.SensorType.Temperature:
+                    temperatures[f"{hw.Name}/{sensor.Name}"] = float(sensor.Value)
+                elif sensor.SensorType == _hardware.SensorType.Clock and "Core #" in sensor.Name:
+                    clocks.append(float(sensor.Value))
+    return temperatures, clocks
+
 
 def get_temperature():
     try:
-        for hw in computer.Hardware:
-            if hw.HardwareType == Hardware.HardwareType.CPU:
-                hw.Update()
-                for sensor in hw.Sensors:
-                    if sensor.SensorType == Hardware.SensorType.Temperature and "Core #0" in sensor.Name:
-                        return f"{sensor.Value:.1f}°C"
+        temperatures, _ = read_cpu_sensors()
+        for name, value in temperatures.items():
+            if "Core #0" in name:
+                return f"{value:.1f}°C"
         return "Unavailable"
     except Exception as e:
         return f"Error: {e}"